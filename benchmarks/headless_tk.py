@@ -0,0 +1,206 @@
+# headless_tk.py
+"""Stand-in tkinter modules so widget code can be benchmarked without a display.
+
+install() registers fake tkinter, tkinter.ttk, tkinter.font, tkinter.messagebox
+and tkinter.simpledialog modules. Widgets accept any option, record what is
+inserted into them and otherwise do nothing, so the cost measured is the
+application's own Python work plus one call per Tk operation.
+"""
+import sys
+import time
+import types
+
+CONSTANTS = {
+    'END': 'end', 'LEFT': 'left', 'RIGHT': 'right', 'TOP': 'top', 'BOTTOM': 'bottom',
+    'BOTH': 'both', 'X': 'x', 'Y': 'y', 'BROWSE': 'browse', 'SINGLE': 'single',
+    'MULTIPLE': 'multiple', 'EXTENDED': 'extended', 'HORIZONTAL': 'horizontal',
+    'VERTICAL': 'vertical', 'W': 'w', 'E': 'e', 'N': 'n', 'S': 's',
+}
+
+
+class Widget:
+    """Widget accepting every geometry, binding and configuration call"""
+
+    def __init__(self, master=None, *args, **options):
+        self.master = master
+        self.options = options
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def __getitem__(self, key):
+        return self.options.get(key)
+
+    def cget(self, key):
+        """Return a configured option"""
+        return self.options.get(key)
+
+
+class Listbox(Widget):
+    """Listbox storing its rows and selection in plain lists"""
+
+    def __init__(self, master=None, *args, **options):
+        super().__init__(master, *args, **options)
+        self.rows = []
+        self.selection = set()
+
+    def insert(self, index, *items):
+        """Append or insert rows"""
+        if index == 'end':
+            self.rows.extend(items)
+        else:
+            self.rows[index:index] = items
+
+    def delete(self, first, last=None):
+        """Delete a row or a range of rows"""
+        stop = len(self.rows) if last == 'end' else (first + 1 if last is None else last + 1)
+        del self.rows[first:stop]
+        self.selection.clear()
+
+    def size(self):
+        """Return the number of rows"""
+        return len(self.rows)
+
+    def selection_set(self, first, last=None):
+        """Select rows"""
+        self.selection.update(range(first, (first if last is None else last) + 1))
+
+    def curselection(self):
+        """Return the selected row positions"""
+        return tuple(sorted(self.selection))
+
+
+class Entry(Widget):
+    """Entry or combobox holding its text in a plain string"""
+
+    def __init__(self, master=None, *args, **options):
+        super().__init__(master, *args, **options)
+        self.text = ''
+
+    def get(self):
+        """Return the text"""
+        return self.text
+
+    def insert(self, index, text):
+        """Insert text at a character position or at the end"""
+        index = len(self.text) if index == 'end' else index
+        self.text = self.text[:index] + text + self.text[index:]
+
+    def delete(self, first, last=None):
+        """Delete a character or a range of characters"""
+        stop = len(self.text) if last == 'end' else (first + 1 if last is None else last)
+        self.text = self.text[:first] + self.text[stop:]
+
+    def set(self, value):
+        """Replace the text"""
+        self.text = str(value)
+
+    def current(self, index=None):
+        """Select one of the configured values by position"""
+        values = list(self.options.get('values') or ())
+        if index is None:
+            return values.index(self.text) if self.text in values else -1
+        self.text = str(values[index])
+        return index
+
+
+class Tk(Widget):
+    """Root window keeping after() callbacks until update() runs them.
+
+    Delays are ignored: update() runs every callback scheduled before it was
+    called, in order, so a benchmark measures the work and not the waiting.
+    """
+
+    def __init__(self, *args, **options):
+        super().__init__(None, *args, **options)
+        self.callbacks = {}
+        self.last_id = 0
+
+    def after(self, delay, callback=None, *args):
+        """Schedule callback(*args)"""
+        self.last_id += 1
+        self.callbacks[self.last_id] = (callback, args)
+        return self.last_id
+
+    def after_idle(self, callback, *args):
+        """Schedule callback(*args)"""
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, callback_id):
+        """Drop a scheduled callback"""
+        self.callbacks.pop(callback_id, None)
+
+    def update(self):
+        """Run the callbacks scheduled so far; return True if any ran"""
+        last_id = self.last_id
+        ran = False
+        for callback_id in sorted(self.callbacks):
+            if callback_id > last_id:
+                break
+            entry = self.callbacks.pop(callback_id, None)
+            if entry is not None:
+                entry[0](*entry[1])
+                ran = True
+        return ran
+
+    def run_until_idle(self):
+        """Run callbacks, letting worker threads progress, until none are scheduled"""
+        while self.update():
+            time.sleep(0)
+
+
+class Font:
+    """Font with fixed metrics"""
+
+    def __init__(self, *args, **options):
+        self.options = options
+
+    def metrics(self, name=None):
+        """Return a fixed line spacing"""
+        return 15 if name == 'linespace' else {'linespace': 15}
+
+
+class Variable:
+    """StringVar/IntVar/BooleanVar holding a plain value"""
+
+    def __init__(self, master=None, value=None):
+        self.value = value
+
+    def get(self):
+        """Return the value"""
+        return self.value
+
+    def set(self, value):
+        """Change the value"""
+        self.value = value
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def install():
+    """Register the fake tkinter modules; call before importing any application module"""
+    widgets = {name: type(name, (Widget,), {}) for name in (
+        'Toplevel', 'Frame', 'Label', 'Button', 'Scrollbar', 'Canvas', 'Checkbutton',
+        'Radiobutton', 'Notebook', 'Progressbar', 'LabelFrame', 'Text', 'Treeview')}
+    widgets.update(Tk=Tk, Listbox=Listbox, Entry=Entry, Combobox=Entry, Spinbox=Entry)
+    event_type = types.SimpleNamespace(KeyRelease='KeyRelease', KeyPress='KeyPress')
+    tk = _module('tkinter', **CONSTANTS, **widgets, StringVar=Variable, IntVar=Variable,
+                 BooleanVar=Variable, DoubleVar=Variable, EventType=event_type,
+                 TclError=RuntimeError)
+    tk.ttk = _module('tkinter.ttk', **widgets)
+    tk.font = _module('tkinter.font', Font=Font)
+    tk.messagebox = _module('tkinter.messagebox', showinfo=print, showerror=print,
+                            showwarning=print, askyesno=lambda *args, **kwargs: True)
+    tk.simpledialog = _module('tkinter.simpledialog', askstring=lambda *args, **kwargs: None)
+    sys.modules.update({'tkinter': tk, 'tkinter.ttk': tk.ttk, 'tkinter.font': tk.font,
+                        'tkinter.messagebox': tk.messagebox,
+                        'tkinter.simpledialog': tk.simpledialog})
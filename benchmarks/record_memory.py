@@ -0,0 +1,74 @@
+# record_memory.py
+"""Benchmark of the per-row memory held by get_pokemon_data results.
+
+Compares the old list of dicts (DataFrame.to_dict(orient='records')) with the
+PokemonRecords row-id view, on the Pokédex replicated --scale times.
+Run from the repository root: python benchmarks/record_memory.py --scale 100
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+# pylint: disable=wrong-import-position
+from pokedex_cache import load_pokedex
+from pokemon_records import PokedexColumns, PokemonRecords
+
+
+def scaled_pokedex(csv_path, scale):
+    """Return the Pokédex repeated scale times with unique names"""
+    frame = load_pokedex(csv_path, use_cache=False)
+    if scale == 1:
+        return frame
+    copies = np.repeat(np.arange(scale), len(frame))
+    big = pd.concat([frame] * scale, ignore_index=True)
+    big['Name'] = big['Name'] + '#' + pd.Series(copies).astype(str)
+    return big
+
+
+def measure(build):
+    """Return (result, bytes still allocated by it, peak bytes while building it)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    """Print the footprint of both representations"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default='data/Pokemon.csv')
+    parser.add_argument('--scale', type=int, default=100,
+                        help="how many copies of the Pokédex to load")
+    args = parser.parse_args()
+
+    frame = scaled_pokedex(args.csv, args.scale)
+    rows = len(frame)
+    row_ids = np.arange(rows)
+
+    dicts, dict_bytes, dict_peak = measure(lambda: frame.iloc[row_ids].to_dict(orient='records'))
+    del dicts
+    columns, column_bytes, _ = measure(lambda: PokedexColumns(frame))
+    records, record_bytes, record_peak = measure(lambda: PokemonRecords(columns, row_ids.copy()))
+    _, one_bytes, _ = measure(lambda: records[0])
+    materialized, _, materialize_peak = measure(records.to_dicts)
+    del materialized
+
+    print(f"rows: {rows}")
+    print(f"{'representation':<32}{'held':>14}{'per row':>12}{'peak':>14}")
+    print(f"{'list of dicts':<32}{dict_bytes:>14,}{dict_bytes / rows:>12.1f}{dict_peak:>14,}")
+    print(f"{'PokemonRecords view':<32}{record_bytes:>14,}{record_bytes / rows:>12.1f}"
+          f"{record_peak:>14,}")
+    print(f"{'  shared PokedexColumns':<32}{column_bytes:>14,}{column_bytes / rows:>12.1f}")
+    print(f"{'  one PokemonRecord':<32}{one_bytes:>14,}")
+    print(f"{'  to_dicts() on demand':<32}{'':>14}{'':>12}{materialize_peak:>14,}")
+
+
+if __name__ == '__main__':
+    main()
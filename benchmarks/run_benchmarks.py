@@ -0,0 +1,274 @@
+# run_benchmarks.py
+"""Benchmark suite for the model, controller and view hot paths.
+
+Builds synthetic Pokédexes scaled from data/Pokemon.csv and synthetic team
+stores, times each hot path many times, and reports latency percentiles and
+the peak memory allocated by one call. Results are written as JSON and
+compared with a stored baseline to flag regressions.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py --scales 1 10 100 1000
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+import headless_tk
+headless_tk.install()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+# pylint: disable=wrong-import-position
+from record_memory import scaled_pokedex
+from model import PokemonModel
+from controller import PokeBuilderController
+from view import PokeBuilderView, LEGENDARY_SCOPES
+from team_store import TeamStore
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+QUERIES = [
+    dict(),
+    dict(name='char'),
+    dict(name='pikchu', fuzzy=True),
+    dict(type1='Fire'),
+    dict(type1='Water', stat='Speed', min_value=90),
+    dict(name='a', type1='Dragon'),
+]
+ALL = (None, None)
+LIST_QUERIES = [('', '', 'Name', ALL), ('char', '', 'Name', ALL), ('', 'Fire', 'Type', ALL),
+                ('mega', 'Dragon', 'Number', ALL), ('pikchu', '', 'Name', ALL),
+                ('', '', 'Type', ALL), ('', 'Fire', 'Type', ((1,), False)),
+                ('', '', 'Name', ((1, 2, 3), None)), ('a', '', 'Number', (None, True))]
+
+
+def percentile_summary(latencies):
+    """Return latency percentiles in milliseconds"""
+    values = np.array(latencies) / 1e6
+    return {'calls': len(values), 'mean_ms': float(values.mean()),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p90_ms': float(np.percentile(values, 90)),
+            'p99_ms': float(np.percentile(values, 99)), 'max_ms': float(values.max())}
+
+
+def run_case(function, repeat, warmup=2):
+    """Time function() repeat times, then trace the memory one more call allocates"""
+    for _ in range(warmup):
+        function()
+    latencies = []
+    gc.collect()
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        function()
+        latencies.append(time.perf_counter_ns() - started)
+    summary = percentile_summary(latencies)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    summary['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return summary
+
+
+def load_case(build):
+    """Time one build of a model and keep it, then trace the memory a second build allocates"""
+    gc.collect()
+    started = time.perf_counter_ns()
+    model = build()
+    summary = percentile_summary([time.perf_counter_ns() - started])
+    gc.collect()
+    tracemalloc.start()
+    build().close()
+    summary['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return summary, model
+
+
+def cycle(items):
+    """Return a function returning the next item of a list on every call"""
+    state = {'position': -1}
+
+    def next_item():
+        state['position'] = (state['position'] + 1) % len(items)
+        return items[state['position']]
+    return next_item
+
+
+def write_pokedex(directory, scale):
+    """Write the Pokédex scaled scale times and return its path"""
+    path = os.path.join(directory, f'pokedex_x{scale}.csv')
+    if not os.path.exists(path):
+        scaled_pokedex('data/Pokemon.csv', scale).to_csv(path, index=False)
+    return path
+
+
+def write_team_store(directory, pokemon_names, teams, seed=0):
+    """Create a team store holding teams random teams and return its path"""
+    path = os.path.join(directory, f'teams_{teams}.db')
+    if not os.path.exists(path):
+        generator = random.Random(seed)
+        store = TeamStore(path)
+        store.add_teams((f'Team {number}',
+                         generator.sample(pokemon_names, generator.randint(1, 6)))
+                        for number in range(teams))
+        store.close()
+    return path
+
+
+def benchmark_pokedex(results, directory, scale, repeat):
+    """Benchmark the Pokédex queries and the list refresh at one dataset scale"""
+    csv_path = write_pokedex(directory, scale)
+    teams_path = os.path.join(directory, f'empty_x{scale}.db')
+    prefix = f'pokedex x{scale}'
+
+    results[f'{prefix}/load model'], model = load_case(
+        lambda: PokemonModel(csv_path, teams_path=teams_path, use_cache=False))
+
+    query = cycle(QUERIES)
+    results[f'{prefix}/get_pokemon_data'] = run_case(
+        lambda: len(model.get_pokemon_data(**query())), repeat)
+    results[f'{prefix}/get_types'] = run_case(model.get_types, repeat)
+
+    root = headless_tk.Tk()
+    view = PokeBuilderView(root, model, model.pokemon_df, PokeBuilderController(None, model))
+    list_query = cycle(LIST_QUERIES)
+
+    def update_pokemon_list():
+        enter_list_query(view, list_query())
+        view.update_pokemon_list()
+        root.run_until_idle()
+    results[f'{prefix}/update_pokemon_list'] = run_case(update_pokemon_list, repeat)
+    view.controller.filter_pipeline.close()
+    model.close()
+
+
+def enter_list_query(view, query):
+    """Fill the "Select Pokémon" filters with a (search, type, sort, scope) query"""
+    search, pokemon_type, sort_by, (generations, legendary) = query
+    view.search_entry.set(search)
+    view.type_combobox.set(pokemon_type)
+    view.sort_var.set(sort_by)
+    generations = generations or view.model.get_generations()
+    view.generation_from_combobox.set(min(generations))
+    view.generation_to_combobox.set(max(generations))
+    view.legendary_combobox.set(next(label for label, scope in LEGENDARY_SCOPES.items()
+                                     if scope is legendary))
+
+
+def benchmark_teams(results, directory, teams, repeat):
+    """Benchmark the team operations against a store holding teams teams"""
+    csv_path = write_pokedex(directory, 1)
+    names = pd.read_csv(csv_path)['Name'].tolist()
+    teams_path = write_team_store(directory, names, teams)
+    prefix = f'teams {teams}'
+
+    results[f'{prefix}/load model'], model = load_case(
+        lambda: PokemonModel(csv_path, teams_path=teams_path, use_cache=False))
+    generator = random.Random(1)
+
+    def team_name():
+        return f'Team {generator.randrange(teams)}'
+
+    results[f'{prefix}/load_team'] = run_case(lambda: model.load_team(team_name()), repeat)
+    results[f'{prefix}/get_team_data'] = run_case(lambda: model.get_team_data(team_name()),
+                                                  repeat)
+
+    def modify():
+        name = team_name()
+        pokemon = generator.choice(names)
+        model.modify_team(name, pokemon, action='add')
+        model.modify_team(name, pokemon, action='remove')
+    results[f'{prefix}/modify_team add+remove'] = run_case(modify, repeat)
+
+    saved = iter(range(10 ** 9))
+    results[f'{prefix}/save_team'] = run_case(
+        lambda: model.save_team(f'Benchmark {next(saved)}', generator.sample(names, 6)), repeat)
+    model.close()
+
+
+def compare(results, baseline, threshold, noise_ms):
+    """Print the change of every case against the baseline and return the regressions"""
+    regressions = []
+    print(f"\n{'case':<44}{'p50 ms':>10}{'baseline':>10}{'change':>9}{'peak KiB':>11}")
+    for case, summary in results.items():
+        before = baseline.get(case)
+        if before is None:
+            print(f"{case:<44}{summary['p50_ms']:>10.3f}{'-':>10}{'new':>9}"
+                  f"{summary['peak_kib']:>11.0f}")
+            continue
+        change = summary['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0
+        slower = change > threshold and summary['p50_ms'] - before['p50_ms'] > noise_ms
+        heavier = summary['peak_kib'] > before['peak_kib'] * (1 + threshold) + 64
+        flag = ' REGRESSION' if slower or heavier else ''
+        if flag:
+            regressions.append(case)
+        print(f"{case:<44}{summary['p50_ms']:>10.3f}{before['p50_ms']:>10.3f}{change:>+9.0%}"
+              f"{summary['peak_kib']:>11.0f}{flag}")
+    return regressions
+
+
+def main():
+    """Run the suite, save the results and compare them with the baseline"""
+    parser = argparse.ArgumentParser(description="Poké Builder benchmark suite")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000],
+                        help="Pokédex sizes as multiples of data/Pokemon.csv")
+    parser.add_argument('--team-counts', type=int, nargs='+',
+                        default=[10, 100, 1000, 10000, 100000],
+                        help="numbers of saved teams in the team store")
+    parser.add_argument('--repeat', type=int, default=50, help="timed calls per case")
+    parser.add_argument('--workdir', help="where to keep the generated data "
+                                          "(default: a temporary directory)")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'))
+    parser.add_argument('--baseline', default=os.path.join(RESULTS_DIR, 'baseline.json'))
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown or memory growth flagged as a regression")
+    parser.add_argument('--noise-ms', type=float, default=0.05,
+                        help="slowdowns smaller than this are never flagged")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = args.workdir or temporary
+        os.makedirs(directory, exist_ok=True)
+        for scale in args.scales:
+            print(f'Pokédex x{scale}...', file=sys.stderr)
+            benchmark_pokedex(results, directory, scale, args.repeat)
+        for teams in args.team_counts:
+            print(f'{teams} teams...', file=sys.stderr)
+            benchmark_teams(results, directory, teams, args.repeat)
+
+    report = {'meta': {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'python': platform.python_version(), 'platform': platform.platform(),
+                       'numpy': np.__version__, 'pandas': pd.__version__,
+                       'repeat': args.repeat},
+              'results': results}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as target:
+        json.dump(report, target, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding='utf-8') as source:
+            baseline = json.load(source)['results']
+    regressions = compare(results, baseline, args.threshold, args.noise_ms)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as target:
+            json.dump(report, target, indent=2)
+        print(f'\nBaseline stored in {args.baseline}')
+    if regressions:
+        print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# shared_memory.py
+"""Benchmark of the private memory each worker process needs for the Pokédex.
+
+Compares workers that each build their own PokemonModel with workers that
+attach a SharedPokemonModel to one Pokédex shared by the parent, on the
+Pokédex replicated --scale times. Private memory is the RssAnon of the
+worker: pages of the shared segment are not counted, since every worker
+maps the same ones.
+Run from the repository root: python benchmarks/shared_memory.py --scale 100
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+# pylint: disable=wrong-import-position
+from record_memory import scaled_pokedex
+from model import PokemonModel, SharedPokemonModel
+
+QUERIES = [dict(name='char'), dict(type1='Fire'), dict(type1='Water', stat='Speed', min_value=90),
+           dict(generations=(1, 2), legendary=False)]
+
+
+def private_mib():
+    """Return the resident memory of this process not shared with others, in MiB"""
+    with open('/proc/self/status', encoding='ascii') as status:
+        for line in status:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def worker(source, teams_path):
+    """Open a model, run the queries and return (load seconds, private MiB added)"""
+    before = private_mib()
+    started = time.perf_counter()
+    if isinstance(source, dict):
+        model = SharedPokemonModel(source, teams_path=teams_path)
+    else:
+        model = PokemonModel(source, teams_path=teams_path, use_cache=False)
+    loaded = time.perf_counter() - started
+    for query in QUERIES:
+        model.get_pokemon_data(**query).to_dicts()
+    model.get_selected_pokemon_data(model.get_pokemon_names(list(range(0, 600, 100))))
+    grown = private_mib() - before
+    model.close()
+    return loaded, grown
+
+
+def main():
+    """Print the load time and private memory of both kinds of workers"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default='data/Pokemon.csv')
+    parser.add_argument('--scale', type=int, default=100,
+                        help="how many copies of the Pokédex to load")
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'pokedex.csv')
+        scaled_pokedex(args.csv, args.scale).to_csv(csv_path, index=False)
+        teams_path = os.path.join(directory, 'teams.db')
+        owner = PokemonModel(csv_path, teams_path=teams_path, use_cache=False)
+        descriptor = owner.share()
+        print(f"rows: {len(owner.pokemon_df)}, workers: {args.workers}")
+        print(f"{'worker':<24}{'load s':>10}{'private MiB':>14}")
+        for label, source in (('own PokemonModel', csv_path), ('SharedPokemonModel', descriptor)):
+            with context.Pool(args.workers) as pool:
+                results = pool.starmap(worker, [(source, teams_path)] * args.workers)
+            loaded = max(seconds for seconds, _ in results)
+            grown = sum(mib for _, mib in results) / len(results)
+            print(f"{label:<24}{loaded:>10.2f}{grown:>14.1f}")
+        owner.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+# cli.py
+"""File for the headless command-line entry point"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from model import PokemonModel
+from pokemon_records import PokemonRecords
+from shared_pokedex import SharedPokedex
+from type_chart import defensive_multipliers, offensive_multipliers
+from graph_render import TEAM_ATTRIBUTES, draw_team_pies
+
+SUMMARY_STATS = TEAM_ATTRIBUTES + ['Total']
+SUMMARY_COLUMNS = (['Team ID', 'Team', 'Members', 'Size']
+                   + [f'{stat} {measure}' for stat in SUMMARY_STATS
+                      for measure in ('Mean', 'Min', 'Max')]
+                   + ['Covered Types', 'Resisted Types', 'Shared Weaknesses', 'Chart'])
+
+_worker_state = None
+
+
+def summary_arrays(columns, codes):
+    """Return the (names, stat columns, type codes) team summaries are computed from,
+    given the model's PokedexColumns and type codes"""
+    return (columns.arrays[columns.positions['Name']],
+            [columns.arrays[columns.positions[stat]] for stat in SUMMARY_STATS], codes)
+
+
+def summarize_team(arrays, team_id, team_name, members):
+    """Return the stat and type summary of one team"""
+    names, stats, codes = arrays
+    members = list(members)
+    values = np.column_stack([column[members] for column in stats]).astype(float)
+    summary = {'Team ID': team_id, 'Team': team_name,
+               'Members': names[members].tolist(), 'Size': len(members)}
+    for column, stat in enumerate(SUMMARY_STATS):
+        summary[f'{stat} Mean'] = round(float(values[:, column].mean()), 2) if members else None
+        summary[f'{stat} Min'] = int(values[:, column].min()) if members else None
+        summary[f'{stat} Max'] = int(values[:, column].max()) if members else None
+    defensive = defensive_multipliers(codes[members])
+    offensive = offensive_multipliers(codes[members])
+    summary['Covered Types'] = int((offensive > 1).any(axis=0).sum())
+    summary['Resisted Types'] = int((defensive < 1).any(axis=0).sum())
+    summary['Shared Weaknesses'] = int(((defensive > 1).sum(axis=0) >= 2).sum())
+    summary['Chart'] = None
+    return summary
+
+
+def render_team_chart(team_data, team_id, team_name, chart_dir):
+    """Save the team's stat pies as a PNG with the Agg backend and return its path"""
+    # pylint: disable=import-outside-toplevel
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(12, 8), dpi=100)
+    FigureCanvasAgg(figure)
+    draw_team_pies(figure, team_data)
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', team_name).strip('_') or 'team'
+    path = os.path.join(chart_dir, f'{team_id:06d}_{slug}.png')
+    figure.savefig(path)
+    return path
+
+
+def _init_worker(descriptor, chart_dir):
+    global _worker_state
+    shared = SharedPokedex(descriptor)
+    _worker_state = (shared, summary_arrays(shared.columns, shared.index.type_codes), chart_dir)
+
+
+def _summarize_chunk(teams):
+    shared, arrays, chart_dir = _worker_state
+    return [_summarize(shared.columns, arrays, team, chart_dir) for team in teams]
+
+
+def _summarize(columns, arrays, team, chart_dir):
+    summary = summarize_team(arrays, *team)
+    if chart_dir and team[2]:
+        summary['Chart'] = render_team_chart(PokemonRecords(columns, team[2]).to_frame(),
+                                             team[0], team[1], chart_dir)
+    return summary
+
+
+def iter_team_summaries(model, chart_dir=None, workers=None, chunk_size=64):
+    """Yield the summary of every saved team in save order.
+
+    Teams are handed out in chunks to a process pool whose workers read the
+    Pokédex from the model's shared memory copy instead of each unpickling
+    their own; only a few chunks are in flight at once so results stream out
+    without holding every team in memory.
+    """
+    teams = ((record.team_id, record.name, record.members)
+             for record in sorted(model.teams.values(), key=lambda record: record.team_id))
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1:
+        arrays = summary_arrays(model.columns, model.index.type_codes)
+        for team in teams:
+            yield _summarize(model.columns, arrays, team, chart_dir)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(model.share(), chart_dir)) as executor:
+        pending = deque()
+        chunk = []
+        for team in teams:
+            chunk.append(team)
+            if len(chunk) == chunk_size:
+                pending.append(executor.submit(_summarize_chunk, chunk))
+                chunk = []
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(executor.submit(_summarize_chunk, chunk))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_records(records, columns, output, output_format):
+    """Stream records to output as CSV rows or as the items of one JSON array"""
+    count = 0
+    if output_format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            if isinstance(record.get('Members'), list):
+                record = dict(record, Members=';'.join(record['Members']))
+            writer.writerow(record)
+            count += 1
+    else:
+        output.write('[')
+        for record in records:
+            output.write(',\n' if count else '\n')
+            output.write(json.dumps(record, default=_json_default))
+            count += 1
+        output.write('\n]\n')
+    return count
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def iter_filtered_pokemon(model, args, chunk_size=1024):
+    """Yield the Pokémon matching the filter options as plain dicts"""
+    row_ids = model.get_pokemon_ids(args.name, args.type, args.stat, args.min, args.fuzzy)
+    if args.sort:
+        row_ids = model.sort_pokemon_ids(row_ids, args.sort)
+    for start in range(0, len(row_ids), chunk_size):
+        frame = model.pokemon_df.iloc[row_ids[start:start + chunk_size]]
+        yield from frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+
+
+MATCHUP_COLUMNS = ['Attacker', 'Defender', 'Damage', 'Received', 'Moves First', 'Duel']
+
+
+def iter_matchup_pairs(model, matchup):
+    """Yield one record per member pair of a TeamMatchup"""
+    for row, attacker in enumerate(matchup.members_a):
+        for column, defender in enumerate(matchup.members_b):
+            yield {'Attacker': model.get_pokemon_name(attacker),
+                   'Defender': model.get_pokemon_name(defender),
+                   'Damage': round(float(matchup.damage[row, column]), 4),
+                   'Received': round(float(matchup.received[row, column]), 4),
+                   'Moves First': int(matchup.speed[row, column]),
+                   'Duel': float(matchup.duels[row, column])}
+
+
+SIMILAR_COLUMNS = ['Query', 'Rank', 'Name', 'Distance']
+
+
+def iter_similar_pokemon(model, names, k, type_weight):
+    """Yield the k nearest Pokémon in base stats of every named Pokémon, queried as one batch"""
+    queries = [model.get_pokemon_id(name) for name in names]
+    ids, distances = model.get_similar_for_team(queries, k, type_weight)
+    for query, row, row_distances in zip(queries, ids.tolist(), distances.tolist()):
+        for rank, (pokemon_id, distance) in enumerate(zip(row, row_distances), 1):
+            if pokemon_id >= 0:
+                yield {'Query': model.get_pokemon_name(query), 'Rank': rank,
+                       'Name': model.get_pokemon_name(pokemon_id),
+                       'Distance': round(distance, 4)}
+
+
+def build_parser():
+    """Return the argument parser of the command-line tool"""
+    parser = argparse.ArgumentParser(description="Poké Builder batch analysis")
+    parser.add_argument('--pokedex', default='data/Pokemon.csv', help="Pokédex CSV file")
+    parser.add_argument('--teams', default='data/saved_teams.db', help="saved teams database")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--format', choices=('csv', 'json'), default='csv',
+                        help="output format (default: csv)")
+    output.add_argument('--output', '-o', help="output file (default: standard output)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    teams = commands.add_parser('teams', parents=[output], help="summarize every saved team")
+    teams.add_argument('--charts', metavar='DIR',
+                       help="also render each team's stat pies as a PNG in DIR")
+    teams.add_argument('--workers', type=int, default=None,
+                       help="worker processes (default: one per core, 1 runs inline)")
+    teams.add_argument('--chunk-size', type=int, default=64,
+                       help="teams handed to a worker at a time")
+
+    pokemon = commands.add_parser('pokemon', parents=[output],
+                                  help="export the Pokémon matching filters")
+    pokemon.add_argument('--name', default='', help="name substring")
+    pokemon.add_argument('--fuzzy', action='store_true',
+                         help="allow one typo in the name when nothing matches exactly")
+    pokemon.add_argument('--type', default='', help="Type 1 or Type 2")
+    pokemon.add_argument('--stat', default='', help="stat to apply --min to")
+    pokemon.add_argument('--min', type=int, default=0, help="minimum value of --stat")
+    pokemon.add_argument('--sort', choices=('Name', 'Type', 'Number'), default='Name',
+                         help="sort order (default: Name)")
+
+    matchup = commands.add_parser('matchup', parents=[output],
+                                  help="compare every member of two saved teams")
+    matchup.add_argument('team_a', help="first team name")
+    matchup.add_argument('team_b', help="second team name")
+
+    similar = commands.add_parser('similar', parents=[output],
+                                  help="find the Pokémon with the closest base stats")
+    similar.add_argument('names', nargs='+', help="Pokémon names, searched as one batch")
+    similar.add_argument('-k', type=int, default=10, help="neighbours per Pokémon")
+    similar.add_argument('--type-weight', type=float, default=0.0,
+                         help="standard deviations a type difference counts for (default: 0)")
+
+    tournament = commands.add_parser('tournament', parents=[output],
+                                     help="rank every saved team in a round robin")
+    tournament.add_argument('--workers', type=int, default=None,
+                            help="worker processes (default: one per core, 1 runs inline)")
+    return parser
+
+
+def main(argv=None):
+    """Run the command-line tool and return its exit status"""
+    args = build_parser().parse_args(argv)
+    model = PokemonModel(args.pokedex, teams_path=args.teams)
+    if args.command == 'matchup':
+        matchup = model.compare_teams(args.team_a, args.team_b)
+        if matchup is None:
+            print(f'No saved team named {args.team_a!r} or {args.team_b!r}', file=sys.stderr)
+            model.close()
+            return 1
+        print(f'{args.team_a} wins {matchup.score:.1%} of duels against {args.team_b}',
+              file=sys.stderr)
+    if args.command == 'similar':
+        missing = [name for name in args.names if model.get_pokemon_id(name) is None]
+        if missing:
+            print(f'No Pokémon named {", ".join(map(repr, missing))}', file=sys.stderr)
+            model.close()
+            return 1
+    output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.command == 'teams':
+            if args.charts:
+                os.makedirs(args.charts, exist_ok=True)
+            records = iter_team_summaries(model, args.charts, args.workers, args.chunk_size)
+            columns = SUMMARY_COLUMNS
+        elif args.command == 'matchup':
+            records = iter_matchup_pairs(model, matchup)
+            columns = MATCHUP_COLUMNS
+        elif args.command == 'similar':
+            records = iter_similar_pokemon(model, args.names, args.k, args.type_weight)
+            columns = SIMILAR_COLUMNS
+        elif args.command == 'tournament':
+            ranking = model.rank_teams(workers=args.workers)
+            records = (record for record in ranking.to_dict(orient='records'))
+            columns = list(ranking.columns)
+        else:
+            records = iter_filtered_pokemon(model, args)
+            columns = list(model.pokemon_df.columns)
+        count = write_records(records, columns, output, args.format)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        model.close()
+    print(f'{count} records written', file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,13 @@
 #control.py
 """File for Control class"""
 
-import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
+from profiling import profiled, row_count
+from filter_pipeline import FilterPipeline
+from team_optimizer import TeamConstraints
 
 
 class PokeBuilderController:
@@ -13,8 +16,8 @@ class PokeBuilderController:
     def __init__(self, view, model):
         self.view = view
         self.model = model
-        self.saved_teams = pd.read_csv('data/saved_teams.csv') if os.path.exists('data/saved_teams.csv') \
-            else pd.DataFrame(columns=['Team Name', 'Members'])
+        self.filter_pipeline = None
+        self.team_optimizer = None
 
     def initialize(self):
         """Function for View Initialization and Data Retrieval"""
@@ -27,28 +30,43 @@ class PokeBuilderController:
         if self.view:
             self.view.type_combobox.bind('<<ComboboxSelected>>', self.apply_filters)
             self.view.search_entry.bind('<KeyRelease>', self.apply_filters)
-            self.view.confirm_team_button.bind('<Button-1>', lambda event: self.confirm_team())
 
     def initialize_pokemon_list(self):
         """Get pokemons' data from dataset"""
-        pokemon_data = self.model.get_pokemon_data()
-        self.view.update_pokemon_list(pokemon_data)
+        self.apply_filters()
 
     # Team Building and Confirmation
     def filter_pokemon(self):
         """Function for filter pokemon list"""
         self.apply_filters()
 
+    @profiled()
     def apply_filters(self, event=None):
-        """Function to apply filters to the pokemon list."""
-        name = self.view.search_entry.get()
-        type1 = self.view.type_combobox.get()
-        filtered_data = self.model.get_pokemon_data(name=name, type1=type1)
-        self.view.update_pokemon_list(filtered_data)
-
+        """Function to apply filters to the pokemon list.
+
+        Typing is debounced; every query runs off the UI thread and only the
+        newest one reaches the listbox.
+        """
+        if self.filter_pipeline is None:
+            self.filter_pipeline = FilterPipeline(self.view.master, self.compute_pokemon_list,
+                                                  self.view.show_pokemon_list)
+        query = (self.view.search_entry.get().strip(), self.view.type_combobox.get(),
+                 self.view.sort_var.get(), self.view.get_scope())
+        typing = event is not None and event.type == tk.EventType.KeyRelease
+        self.filter_pipeline.submit(query, debounce=typing)
+
+    @profiled(rows=row_count)
+    def compute_pokemon_list(self, query):
+        """Filter and sort the pokemon row ids for a (name, type, sort, scope) query"""
+        name, type1, sort_by, (generations, legendary) = query
+        row_ids = self.model.get_pokemon_ids(name=name, type1=type1, fuzzy=True,
+                                             generations=generations, legendary=legendary)
+        return self.model.sort_pokemon_ids(row_ids, sort_by)
+
+    @profiled()
     def confirm_team(self):
         """Function to confirm the selected pokemon team"""
-        selected_items = self.view.selected_team_listbox.get(0, tk.END)
+        selected_items = self.model.get_pokemon_names(self.view.selected_team_listbox.get_items())
         team_name = "Default Team"
 
         self.model.clear_team_members(team_name)
@@ -57,24 +75,107 @@ class PokeBuilderController:
         self.save_teams_data()
         self.view.update_saved_teams_tab()
 
+    def suggest_team(self):
+        """Search for the best team around the current members, or cancel a running search"""
+        if self.team_optimizer is not None:
+            self.team_optimizer.cancel()
+            return
+        generations, legendary = self.view.get_scope()
+        constraints = TeamConstraints(locked=list(self.view.current_team),
+                                      exclude_legendary=(self.view.exclude_legendary_var.get()
+                                                         or legendary is False),
+                                      generations=generations)
+        optimizer = self.model.create_team_optimizer()
+        updates = queue.Queue()
+
+        def run():
+            try:
+                suggestion = optimizer.optimize(
+                    constraints, progress=lambda fraction: updates.put(('progress', fraction)))
+                updates.put(('done', suggestion))
+            except Exception as error:  # reported on the UI thread
+                updates.put(('error', error))
+
+        self.team_optimizer = optimizer
+        self.view.show_suggestion_progress(0, running=True)
+        threading.Thread(target=run, name='team-optimizer', daemon=True).start()
+        self.poll_suggestion(updates)
+
+    def poll_suggestion(self, updates):
+        """Forward optimizer progress to the view until the search finishes"""
+        while not updates.empty():
+            kind, value = updates.get_nowait()
+            if kind == 'progress':
+                self.view.show_suggestion_progress(value)
+                continue
+            self.team_optimizer = None
+            self.view.show_suggestion_progress(1 if kind == 'done' else 0, running=False)
+            if kind == 'done':
+                self.view.set_current_team(list(value.members))
+            else:
+                messagebox.showerror("Error", f"Team suggestion failed: {value}")
+            return
+        self.view.master.after(100, self.poll_suggestion, updates)
+
+    def stream_pokedex(self):
+        """Publish the rest of a streamed Pokédex as a loader thread reads it"""
+        if not self.model.loading:
+            return
+        # One snapshot in flight at most, so the loader never runs far ahead.
+        updates = queue.Queue(maxsize=1)
+
+        def run():
+            try:
+                for snapshot in self.model.snapshots:
+                    updates.put(('snapshot', snapshot))
+            except Exception as error:  # reported on the UI thread
+                updates.put(('error', error))
+
+        threading.Thread(target=run, name='pokedex-loader', daemon=True).start()
+        self.view.refresh_pokedex()
+        self.poll_pokedex(updates)
+
+    def poll_pokedex(self, updates):
+        """Swap in loaded snapshots on the UI thread until the Pokédex is complete"""
+        while not updates.empty():
+            kind, value = updates.get_nowait()
+            if kind == 'error':
+                self.model.loading = False
+                self.view.refresh_pokedex()
+                messagebox.showerror("Error", f"Loading the Pokédex failed: {value}")
+                return
+            self.model.publish(*value)
+            self.view.refresh_pokedex()
+            if not self.model.loading:
+                return
+        self.view.master.after(100, self.poll_pokedex, updates)
+
+    def watch_team_writer(self):
+        """Report team edits that could not be saved, checking once a second"""
+        error = self.model.take_team_error()
+        if error is not None:
+            messagebox.showerror("Error", f"Saving teams failed, retrying: {error}")
+        self.view.master.after(1000, self.watch_team_writer)
+
     # Team Display and Management
+    @profiled()
     def load_team(self, team_name):
-        """Function for load team's members of selected team"""
-        members = self.model.load_team(team_name)
+        """Function for load team's members of selected team as the current team"""
+        members = self.model.get_team_member_ids(team_name)
         if members:
-            team_data = self.model.get_pokemon_data_by_names(members)
-            self.view.display_graph_for_team(team_data)
+            self.view.set_current_team(members)
         else:
-            self.view.display_error("No team members found for the selected team.")
+            messagebox.showerror("Error", "No team members found for the selected team.")
 
     def save_current_team(self, team_name, current_team):
-        """Save current team into file"""
-        self.model.save_team(team_name, current_team)
+        """Save current team of row ids into file"""
+        self.model.save_team(team_name, self.model.get_pokemon_names(list(current_team)))
 
-    def delete_team(self, index):
+    @profiled()
+    def delete_team(self, team_id):
         """Function for delete selected team from file"""
-        if index is not None:
-            self.model.delete_team(index)
+        if team_id is not None:
+            self.model.delete_team(team_id)
             self.view.update_saved_teams_tab()
             messagebox.showinfo("Success", "Team deleted successfully!")
 
@@ -84,4 +185,4 @@ class PokeBuilderController:
     # Data Persistence
     def save_teams_data(self):
         """Function for save team into file"""
-        self.model.saved_teams.to_csv('data/saved_teams.csv', index=False)
+        self.model.flush_teams()
@@ -0,0 +1,87 @@
+# filter_pipeline.py
+"""File for FilterPipeline class"""
+import queue
+import threading
+from tkinter import messagebox
+
+
+class FilterPipeline:
+    """Debounced query pipeline that computes results on a worker thread.
+
+    Only the newest submitted query is ever applied: older ones are dropped
+    before they start or discarded when they finish. Results are handed back
+    to the Tk main loop by polling with after(), so apply() always runs on
+    the UI thread, as does reporting a query that raised; the worker then
+    carries on with the next one.
+    """
+
+    def __init__(self, master, compute, apply, delay=150, poll_interval=15):
+        self.master = master
+        self.compute = compute
+        self.apply = apply
+        self.delay = delay
+        self.poll_interval = poll_interval
+        self._generation = 0
+        self._after_id = None
+        self._poll_id = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='filter-pipeline', daemon=True)
+        self._worker.start()
+
+    def submit(self, request, debounce=True):
+        """Queue a query, superseding every query submitted before it"""
+        self._generation += 1
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+        self._after_id = self.master.after(self.delay if debounce else 0,
+                                           self._dispatch, self._generation, request)
+
+    def _dispatch(self, generation, request):
+        """Hand a debounced query to the worker and start polling for its result"""
+        self._after_id = None
+        self._requests.put((generation, request))
+        if self._poll_id is None:
+            self._poll_id = self.master.after(self.poll_interval, self._poll)
+
+    def _run(self):
+        """Worker loop computing only the newest pending query"""
+        while True:
+            item = self._requests.get()
+            while not self._requests.empty():
+                item = self._requests.get_nowait()
+            if item is None:
+                return
+            generation, request = item
+            if generation != self._generation:
+                continue
+            try:
+                result, error = self.compute(request), None
+            except Exception as caught:  # reported on the UI thread
+                result, error = None, caught
+            if generation == self._generation:
+                self._results.put((generation, result, error))
+
+    def _poll(self):
+        """Apply the newest finished result on the main loop"""
+        self._poll_id = None
+        latest = None
+        while not self._results.empty():
+            latest = self._results.get_nowait()
+        if latest is not None and latest[0] == self._generation:
+            if latest[2] is not None:
+                messagebox.showerror("Error", f"Updating the list failed: {latest[2]}")
+            else:
+                self.apply(latest[1])
+            return
+        if latest is None or self._after_id is None:
+            self._poll_id = self.master.after(self.poll_interval, self._poll)
+
+    def close(self):
+        """Stop the worker thread and cancel pending callbacks"""
+        self._generation += 1
+        for callback_id in (self._after_id, self._poll_id):
+            if callback_id is not None:
+                self.master.after_cancel(callback_id)
+        self._after_id = self._poll_id = None
+        self._requests.put(None)
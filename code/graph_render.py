@@ -0,0 +1,127 @@
+# graph_render.py
+"""File for graph rendering helpers shared by the graph tabs"""
+from collections import OrderedDict
+import numpy as np
+
+TEAM_ATTRIBUTES = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+
+
+class RenderCache:
+    """LRU cache of rendered canvas pixels keyed by what was drawn.
+
+    A hit blits the stored pixels straight back onto the canvas without
+    drawing any artist. The artists then lag behind what is on screen, so
+    replot(key) is called to catch them up if the canvas is ever resized and
+    has to draw for real.
+    """
+
+    def __init__(self, canvas, replot=None, max_entries=16):
+        self.canvas = canvas
+        self.replot = replot
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.displayed = None
+        self.plotted = None
+        canvas.mpl_connect('resize_event', self._on_resize)
+
+    def show(self, key):
+        """Blit a cached render of key; return False if there is none"""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != self.canvas.get_width_height():
+            return False
+        self.entries.move_to_end(key)
+        self.canvas.restore_region(entry[1])
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.displayed = key
+        return True
+
+    def store(self, key):
+        """Draw the artists plotted for key and keep the resulting pixels"""
+        self.canvas.draw()
+        self.entries[key] = (self.canvas.get_width_height(),
+                             self.canvas.copy_from_bbox(self.canvas.figure.bbox))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.displayed = self.plotted = key
+
+    def clear(self):
+        """Drop every cached render, e.g. after the data behind them changed"""
+        self.entries.clear()
+
+    def forget_plot(self):
+        """Note that the artists were cleared or no longer match any key"""
+        self.plotted = None
+
+    def _on_resize(self, event=None):
+        self.entries.clear()
+        if self.displayed is not None and self.displayed != self.plotted and self.replot:
+            self.replot(self.displayed)
+            self.plotted = self.displayed
+
+
+def pie_label_format(total):
+    """Return the autopct formatter showing share and absolute value"""
+    return lambda p: f'{p:.1f}%\n({p / 100 * total:.1f})'
+
+
+def update_pie(wedges, texts, autotexts, values, labels, autopct, startangle=140,
+               labeldistance=1.1, pctdistance=0.6):
+    """Move existing pie wedges and labels to new values without recreating them"""
+    values = np.asarray(values, dtype=float)
+    fractions = values / values.sum()
+    theta1 = startangle
+    for wedge, label, autotext, fraction, text in zip(wedges, texts, autotexts,
+                                                      fractions, labels):
+        theta2 = theta1 + fraction * 360
+        wedge.set_theta1(theta1)
+        wedge.set_theta2(theta2)
+        middle = np.deg2rad((theta1 + theta2) / 2)
+        x, y = np.cos(middle), np.sin(middle)
+        label.set_position((labeldistance * x, labeldistance * y))
+        label.set_horizontalalignment('left' if x > 0 else 'right')
+        label.set_text(text)
+        autotext.set_position((pctdistance * x, pctdistance * y))
+        autotext.set_text(autopct(fraction * 100))
+        theta1 = theta2
+
+
+def update_bars(ax, bars, values, labels):
+    """Change existing bar heights and tick labels in place and rescale the axes"""
+    for bar, value in zip(bars, values):
+        bar.set_height(value)
+    ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.relim()
+    ax.autoscale_view()
+
+
+def draw_team_pies(figure, team_data):
+    """Draw one pie per base stat for a team on a 2x3 grid of a cleared figure.
+
+    Returns the (wedges, texts, autotexts) of every pie so they can be updated
+    in place later, or None when some stat could not be drawn as a pie.
+    """
+    artists = []
+    axes = figure.subplots(2, 3).flatten()
+
+    for i, attribute in enumerate(TEAM_ATTRIBUTES):
+        if attribute in team_data.columns:
+            pokemon_max = team_data.set_index('Name')[attribute]
+            total_max = pokemon_max.sum()
+
+            if total_max > 0:
+                artists.append(
+                    axes[i].pie(pokemon_max, labels=pokemon_max.index,
+                                autopct=pie_label_format(total_max), startangle=140))
+                axes[i].set_title(f'{attribute.capitalize()} Distribution')
+                axes[i].axis('equal')
+            else:
+                axes[i].text(0.5, 0.5, 'No data available',
+                            horizontalalignment='center', verticalalignment='center')
+                axes[i].set_title(f'{attribute.capitalize()} Distribution')
+        else:
+            axes[i].text(0.5, 0.5, 'Attribute not found', ha='center')
+            axes[i].set_title(f'{attribute.capitalize()} Distribution')
+
+    figure.tight_layout()
+    return artists if len(artists) == len(TEAM_ATTRIBUTES) else None
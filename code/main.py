@@ -1,19 +1,61 @@
 # main.py
 """File for run the application"""
+import time
+STARTED = time.perf_counter()
+# The clock starts before the other imports so their cost shows in --timing.
+# pylint: disable=wrong-import-position
+import argparse
+import sys
 import tkinter as tk
-import pandas as pd
+from startup_timer import StartupTimer
+from profiling import profiler
 from model import PokemonModel
+from pokedex_stream import DEFAULT_CHUNK_SIZE
 from view import PokeBuilderView
 from controller import PokeBuilderController
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    model = PokemonModel('data/Pokemon.csv')
+    parser = argparse.ArgumentParser(description="Poké Builder")
+    parser.add_argument('--eager-tabs', action='store_true',
+                        help="build every tab and import matplotlib before showing the window")
+    parser.add_argument('--timing', action='store_true',
+                        help="print how long each startup phase took")
+    parser.add_argument('--stream', action='store_true',
+                        help="read the Pokédex in chunks and open the window after the first one")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk when streaming")
+    parser.add_argument('--debug', action='store_true',
+                        help="show a Performance tab and a status bar with handler timings")
+    parser.add_argument('--profile-dump', metavar='PATH',
+                        help="write handler timings to this JSON file on exit")
+    args = parser.parse_args()
+
+    timer = StartupTimer(STARTED)
+    timer.mark('imports')
+    with timer.phase('create Tk root'):
+        root = tk.Tk()
+    with timer.phase('load model'):
+        model = PokemonModel('data/Pokemon.csv', stream=args.stream,
+                             chunk_size=args.chunk_size)
     controller = PokeBuilderController(None, model)
-    pokemon_data = model.get_pokemon_data()
-    if isinstance(pokemon_data, list):
-        pokemon_data = pd.DataFrame(pokemon_data)
 
-    view = PokeBuilderView(root, model, pokemon_data, controller)
+    with timer.phase('build view'):
+        view = PokeBuilderView(root, model, model.pokemon_df, controller,
+                               lazy_tabs=not args.eager_tabs, timer=timer,
+                               debug=args.debug)
     controller.view = view
+    controller.stream_pokedex()
+    controller.watch_team_writer()
+    if args.timing:
+        def first_window():
+            timer.mark('first window')
+            timer.report()
+        root.after_idle(first_window)
     root.mainloop()
+    unsaved = model.close()
+    if unsaved:
+        print(f"{len(unsaved)} team edits could not be saved", file=sys.stderr)
+    if args.timing:
+        timer.report()
+    if args.profile_dump:
+        profiler.dump(args.profile_dump)
@@ -0,0 +1,186 @@
+# matchup.py
+"""File for MatchupEngine class"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from type_chart import defensive_multipliers
+
+LEVEL = 50
+MOVE_POWER = 80
+STAB = 1.5
+# Mean of the uniform 0.85-1.00 damage roll.
+AVERAGE_ROLL = 0.925
+
+_worker_state = None
+
+
+class TeamMatchup:
+    """Pairwise matrices between the members of two teams (rows: team A, columns: team B)"""
+
+    def __init__(self, members_a, members_b, damage, received, speed, duels):
+        self.members_a = tuple(members_a)
+        self.members_b = tuple(members_b)
+        self.damage = damage
+        self.received = received
+        self.speed = speed
+        self.duels = duels
+        self.score = float(duels.mean()) if duels.size else 0.5
+
+    def __repr__(self):
+        return f"TeamMatchup({len(self.members_a)}x{len(self.members_b)}, score={self.score:.3f})"
+
+
+def level_stats(pokemon_df, level=LEVEL):
+    """Return (hp, attack, defense, sp_atk, sp_def, speed) arrays at the given level,
+    assuming perfect IVs and no EVs"""
+    def scaled(column):
+        return np.floor((2 * pokemon_df[column].to_numpy(dtype=float) + 31) * level / 100)
+    return (scaled('HP') + level + 10, scaled('Attack') + 5, scaled('Defense') + 5,
+            scaled('Sp. Atk') + 5, scaled('Sp. Def') + 5, scaled('Speed') + 5)
+
+
+def _init_worker(duels, teams, sizes):
+    global _worker_state
+    weights = _team_weights(teams, sizes, len(duels))
+    _worker_state = (weights, duels @ weights.T)
+
+
+def _rank_block(rows):
+    weights, duels_by_team = _worker_state
+    return _block_results(weights, duels_by_team, rows)
+
+
+def _team_weights(teams, sizes, pokemon):
+    """Return the (teams, pokemon) matrix giving each member a weight of 1 / team size"""
+    weights = np.zeros((len(teams), pokemon))
+    rows = np.repeat(np.arange(len(teams)), teams.shape[1])
+    members = teams.ravel()
+    present = members >= 0
+    np.add.at(weights, (rows[present], members[present]), 1)
+    return weights / np.maximum(sizes, 1)[:, None]
+
+
+def _block_results(weights, duels_by_team, rows):
+    """Return (wins, draws, mean score) of a block of teams against every team"""
+    start, stop = rows
+    scores = weights[start:stop] @ duels_by_team
+    scores[np.arange(stop - start), np.arange(start, stop)] = np.nan
+    wins = (scores > 0.5 + 1e-9).sum(axis=1)
+    draws = (np.abs(scores - 0.5) <= 1e-9).sum(axis=1)
+    return wins, draws, np.nanmean(scores, axis=1) if scores.shape[1] > 1 else \
+        np.full(stop - start, 0.5)
+
+
+class MatchupEngine:
+    """Expected one-on-one outcomes between Pokémon, computed by broadcasting stat arrays.
+
+    Every Pokémon attacks with an 80 power move of its best type, using its
+    better damage category against each opponent, and keeps attacking until
+    the defender faints. The faster Pokémon strikes first, so it wins a
+    duel that both sides need the same number of hits to finish.
+    """
+
+    def __init__(self, pokemon_df, type_codes, level=LEVEL, power=MOVE_POWER,
+                 workers=None, chunk_size=256):
+        self.type_codes = np.asarray(type_codes)
+        self.hp, self.attack, self.defense, self.sp_atk, self.sp_def, self.speed = \
+            level_stats(pokemon_df, level)
+        self.base_damage = (2 * level / 5 + 2) * power / 50
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_size = chunk_size
+
+    def effectiveness_matrix(self, attackers, defenders):
+        """Return the best type multiplier each attacker's types deal to each defender"""
+        attacking = self.type_codes[attackers]
+        received = defensive_multipliers(self.type_codes[defenders])
+        first = received[:, attacking[:, 0]].T
+        second = np.where(attacking[:, 1:] >= 0, received[:, attacking[:, 1]].T, 0)
+        return np.maximum(first, second)
+
+    def damage_matrix(self, attackers, defenders):
+        """Return the expected share of each defender's HP taken by one hit of each attacker"""
+        attackers = np.asarray(attackers, dtype=np.int64)
+        defenders = np.asarray(defenders, dtype=np.int64)
+        physical = self.attack[attackers, None] / self.defense[None, defenders]
+        special = self.sp_atk[attackers, None] / self.sp_def[None, defenders]
+        damage = (self.base_damage * np.maximum(physical, special) + 2) * STAB * AVERAGE_ROLL
+        damage *= self.effectiveness_matrix(attackers, defenders)
+        return damage / self.hp[None, defenders]
+
+    def speed_matrix(self, attackers, defenders):
+        """Return 1 where the row Pokémon moves first, -1 where the column one does, 0 on ties"""
+        attackers = np.asarray(attackers, dtype=np.int64)
+        defenders = np.asarray(defenders, dtype=np.int64)
+        return np.sign(self.speed[attackers, None] - self.speed[None, defenders]).astype(np.int8)
+
+    def duel_matrix(self, attackers, defenders, damage=None, received=None, speed=None):
+        """Return 1 where the row Pokémon wins a duel, 0 where it loses and 0.5 for a draw"""
+        damage = self.damage_matrix(attackers, defenders) if damage is None else damage
+        if received is None:
+            received = self.damage_matrix(defenders, attackers).T
+        speed = self.speed_matrix(attackers, defenders) if speed is None else speed
+        with np.errstate(divide='ignore'):
+            hits_needed = np.ceil(1 / damage)
+            hits_taken = np.ceil(1 / received)
+        duels = np.where(hits_needed < hits_taken, 1.0,
+                         np.where(hits_needed > hits_taken, 0.0, (speed + 1) / 2))
+        duels[np.isinf(hits_needed) & np.isinf(hits_taken)] = 0.5
+        return duels
+
+    def matchup(self, team_a, team_b):
+        """Return the TeamMatchup between two teams of row ids"""
+        team_a = np.asarray(team_a, dtype=np.int64)
+        team_b = np.asarray(team_b, dtype=np.int64)
+        damage = self.damage_matrix(team_a, team_b)
+        received = self.damage_matrix(team_b, team_a).T
+        speed = self.speed_matrix(team_a, team_b)
+        duels = self.duel_matrix(team_a, team_b, damage, received, speed)
+        return TeamMatchup(team_a.tolist(), team_b.tolist(), damage, received, speed, duels)
+
+    def tournament(self, teams, progress=None):
+        """Play every team against every other and return (wins, draws, losses, score) arrays.
+
+        A team beats another when its members win more than half of all
+        member-versus-member duels; score is its mean duel share over all
+        opponents. Teams are rows of member ids, padded with -1.
+        """
+        if len(teams) == 0:
+            empty = np.zeros(0)
+            return empty.astype(int), empty.astype(int), empty.astype(int), empty
+        teams = np.asarray(teams, dtype=np.int64).reshape(len(teams), -1)
+        sizes = (teams >= 0).sum(axis=1)
+        pokemon = np.unique(teams[teams >= 0])
+        local = np.where(teams >= 0, np.searchsorted(pokemon, teams), -1)
+        duels = self.duel_matrix(pokemon, pokemon)
+        blocks = [(start, min(start + self.chunk_size, len(teams)))
+                  for start in range(0, len(teams), self.chunk_size)]
+
+        results = []
+        if self.workers <= 1 or len(blocks) <= 1:
+            weights = _team_weights(local, sizes, len(pokemon))
+            duels_by_team = duels @ weights.T
+            for done, rows in enumerate(blocks, 1):
+                results.append(_block_results(weights, duels_by_team, rows))
+                if progress:
+                    progress(done / len(blocks))
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                     initargs=(duels, local, sizes)) as executor:
+                for done, result in enumerate(executor.map(_rank_block, blocks), 1):
+                    results.append(result)
+                    if progress:
+                        progress(done / len(blocks))
+        wins, draws, score = (np.concatenate(parts) for parts in zip(*results))
+        losses = len(teams) - 1 - wins - draws
+        return wins, draws, losses, score
+
+
+def ranking_frame(team_ids, team_names, wins, draws, losses, score):
+    """Return the tournament results as a DataFrame sorted from best to worst"""
+    ranking = pd.DataFrame({'Team ID': team_ids, 'Team': team_names, 'Wins': wins,
+                            'Draws': draws, 'Losses': losses, 'Score': score})
+    ranking['Points'] = ranking['Wins'] + 0.5 * ranking['Draws']
+    ranking = ranking.sort_values(['Points', 'Score'], ascending=False, kind='stable')
+    ranking.insert(0, 'Rank', np.arange(1, len(ranking) + 1))
+    return ranking.reset_index(drop=True)
@@ -1,99 +1,415 @@
 #model.py
 """File for Model class"""
-import os
+import copy
+import numpy as np
 import pandas as pd
+from profiling import profiled, row_count
+from pokedex_cache import load_pokedex, load_cache, save_cache, default_cache_path
+from pokemon_records import PokedexColumns, PokemonRecords
+from pokedex_stream import StreamingLoader, DEFAULT_CHUNK_SIZE
+from pokedex_index import PokedexIndex
+from stats_cube import StatsCube
+from stat_neighbors import StatNeighbors
+from skyline import pareto_front, SkylineCache
+from type_chart import team_coverage, score_candidates
+from team_optimizer import TeamOptimizer, TeamConstraints
+from matchup import MatchupEngine, ranking_frame
+from team_store import TeamStore, TeamWriter, TeamRecord, normalize_team_name
+from shared_pokedex import SharedPokedex, share_pokedex
 
 class PokemonModel:
     """Model class of program"""
 
-    def __init__(self, file_path):
-        self.pokemon_df = pd.read_csv(file_path)
+    def __init__(self, file_path, teams_path='data/saved_teams.db', use_cache=True,
+                 stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.file_path = file_path
+        self._open_teams(teams_path)
+        self.shared_pokedex = None
+        self.pokemon_df = None
+        self.pokemon_names = np.empty(0, dtype=object)
+        self.pokemon_ids_by_name = {}
+        self.loading = False
+        self.load_report = None
+        self.snapshots = None
+        cached = None
+        if stream and use_cache:
+            try:
+                cached = load_cache(default_cache_path(file_path), file_path)
+            except (OSError, ValueError, KeyError):
+                cached = None
+        if stream and cached is None:
+            self.snapshots = self.stream_pokedex(file_path, chunk_size, save=use_cache)
+            self.publish(*next(self.snapshots))
+        else:
+            pokemon_df = cached if cached is not None else \
+                load_pokedex(file_path, use_cache=use_cache)
+            self.publish(pokemon_df, PokedexIndex(pokemon_df), StatsCube(pokemon_df), True)
+
+    def _open_teams(self, teams_path):
+        """Open the team store and its write-behind writer; teams load on publish"""
         self.saved_teams_file = 'data/saved_teams.csv'
-        if os.path.exists(self.saved_teams_file):
-            self.saved_teams = pd.read_csv(self.saved_teams_file)
+        self.team_store = TeamStore(teams_path, legacy_csv=self.saved_teams_file)
+        self.team_writer = TeamWriter(teams_path)
+        self.team_members = None
+        self.next_provisional_id = -1
+        self.teams = {}
+        self.teams_by_key = {}
+
+    def stream_pokedex(self, file_path, chunk_size=DEFAULT_CHUNK_SIZE, save=True):
+        """
+        Yield (pokemon_df, index, stats_cube, complete) snapshots of a Pokédex
+        read in chunks, for publish(). The indexes are built by whichever
+        thread iterates, and the stats cube only folds in the new rows.
+        """
+        loader = StreamingLoader(file_path, chunk_size)
+        self.load_report = loader.report
+        stats_cube = StatsCube()
+        loaded = 0
+        for pokemon_df, complete in loader.snapshots():
+            stats_cube.add_rows(pokemon_df.iloc[loaded:])
+            loaded = len(pokemon_df)
+            if complete and save:
+                try:
+                    save_cache(pokemon_df, default_cache_path(file_path), file_path)
+                except OSError:
+                    pass
+            yield pokemon_df, PokedexIndex(pokemon_df), copy.deepcopy(stats_cube), complete
+
+    @profiled()
+    def publish(self, pokemon_df, index, stats_cube, complete):
+        """
+        Swap in a (possibly partial) Pokédex with the structures derived from it.
+        Snapshots only ever grow, so existing row ids keep pointing at the same Pokémon:
+        a row id is the Pokémon's id, pokemon_ids_by_name maps names to it and the
+        PokedexColumns arrays are indexed by it.
+        """
+        known = len(self.pokemon_names)
+        names = pokemon_df['Name'].to_numpy(dtype=object)
+        for row_id in range(known, len(names)):
+            self.pokemon_ids_by_name[names[row_id]] = row_id
+        self.pokemon_df = pokemon_df
+        self.columns = PokedexColumns(pokemon_df)
+        self.index = index
+        self.pokemon_names = names
+        self.stats_cube = stats_cube
+        self.stat_neighbors = None
+        self.pareto_fronts = SkylineCache()
+        self.loading = not complete
+        if self.team_members is None:
+            self._load_teams()
+        else:
+            self._index_teams()
+
+    def _load_teams(self):
+        """Read every saved team from the team store into memory"""
+        self.team_store.reconnect_if_replaced()
+        self.team_writer.take_assigned_ids()
+        self.team_members = {team_id: (team_name, members)
+                             for team_id, team_name, members in self.team_store.list_teams()}
+        self._index_teams()
+
+    def _index_teams(self):
+        """Rebuild the team records, mapping member names to the current row ids"""
+        self.teams.clear()
+        self.teams_by_key.clear()
+        for team_id, (team_name, members) in list(self.team_members.items()):
+            self._remember_team(team_id, team_name, members)
+
+    def reload_teams_if_changed(self):
+        """Re-read the saved teams if another process changed the team store"""
+        if self.team_writer.changed_outside():
+            self._load_teams()
         else:
-            self.saved_teams = pd.DataFrame(columns=['Team Name', 'Members'])
-
-    def get_pokemon_data(self, name='', type1='', stat='', min_value=0):
-        """Function to get Pokemons' data from dataset"""
-        data = self.pokemon_df
-        if name:
-            data = data[data['Name'].str.contains(name, case=False)]
-        if type1 and type1 != 'All':
-            data = data[(data['Type 1'] == type1) | (data['Type 2'] == type1)]
-        if stat and stat != 'All':
-            data = data[data[stat] >= int(min_value)]
-        return data.to_dict(orient='records')
-
-    def get_pokemon_names(self):
+            self._adopt_team_ids()
+
+    def _adopt_team_ids(self):
+        """Move the teams saved here from their provisional ids to their stored ones"""
+        for team_id, stored_id in self.team_writer.take_assigned_ids().items():
+            if team_id not in self.team_members:
+                continue
+            team_name, members = self.team_members[team_id]
+            self._forget_team(team_id)
+            if stored_id not in self.team_members:
+                self._remember_team(stored_id, team_name, members)
+
+    def take_team_error(self):
+        """Return the error that kept team edits from being saved, once, or None"""
+        return self.team_writer.take_error()
+
+    def share(self):
+        """
+        Copy the loaded Pokédex and its indexes into shared memory, once, and
+        return the descriptor other processes pass to SharedPokemonModel to
+        read it without a copy of their own. The segment lives until close().
+        """
+        if self.loading:
+            raise RuntimeError("the Pokédex is still loading")
+        if self.shared_pokedex is None:
+            self.shared_pokedex = share_pokedex(self.pokemon_df, self.index, self.stats_cube)
+        return self.shared_pokedex.descriptor
+
+    def close(self):
+        """Write every pending team edit to disk, close the team store and
+        release the shared Pokédex. Returns the team edits that could not be saved."""
+        unsaved = self.team_writer.close()
+        self.team_store.close()
+        if self.shared_pokedex is not None:
+            self.shared_pokedex.close()
+        return unsaved
+
+    @profiled(rows=row_count)
+    def get_pokemon_ids(self, name='', type1='', stat='', min_value=0, fuzzy=False,
+                        generations=None, legendary=None):
+        """Function to get row ids of the Pokemons matching the filters;
+        generations (an iterable, None for all) and legendary (True, False or None
+        for both) prune whole partitions"""
+        return self.index.query(name=name, type1=type1, stat=stat, min_value=min_value,
+                                fuzzy=fuzzy, generations=generations, legendary=legendary)
+
+    @profiled(rows=row_count)
+    def get_pokemon_data(self, name='', type1='', stat='', min_value=0, fuzzy=False,
+                         generations=None, legendary=None):
+        """Function to get Pokemons' data from dataset as lightweight row views;
+        call to_dicts() on the result when plain dicts are really needed"""
+        row_ids = self.get_pokemon_ids(name, type1, stat, min_value, fuzzy,
+                                       generations, legendary)
+        return PokemonRecords(self.columns, row_ids)
+
+    @profiled(rows=row_count)
+    def sort_pokemon_ids(self, row_ids, sort_by='Name'):
+        """Function to order row ids by a sort option ('Name', 'Type', 'Number')
+        or by custom keys such as [('Speed', False), ('Total', False)]"""
+        if not sort_by:
+            return row_ids
+        return self.index.order(row_ids, sort_by)
+
+    def get_pokemon_names(self, row_ids=None):
         """Function to get Pokemons' names from dataset"""
-        return self.pokemon_df['Name'].tolist()
+        if row_ids is None:
+            return self.pokemon_names.tolist()
+        return self.pokemon_names[row_ids].tolist()
+
+    def get_pokemon_name(self, row_id):
+        """Function to get the name of one Pokemon by row id"""
+        return self.pokemon_names[row_id]
+
+    def get_pokemon_id(self, name):
+        """Function to get the row id of a Pokemon by name, or None"""
+        return self.pokemon_ids_by_name.get(name)
+
+    def get_pokemon_by_ids(self, row_ids):
+        """Function to get the rows of some Pokemons as views, in the given order"""
+        return PokemonRecords(self.columns, row_ids)
+
+    def get_pokemon_frame(self, row_ids):
+        """Function to get the rows of some Pokemons as a DataFrame, in the given order"""
+        return self.pokemon_df.iloc[list(row_ids)]
 
     def get_types(self):
         """Function to get Pokemons' types from dataset"""
-        types = pd.concat([self.pokemon_df['Type 1'], self.pokemon_df['Type 2']]).unique()
-        types = [t for t in types if t is not None]
-        types.sort()
-        return types
+        return self.index.get_types()
+
+    def get_generations(self):
+        """Function to get the generations present in the dataset"""
+        return self.index.partitions.get_generations()
+
+    def _cube_filter(self, type1, generations=None, legendary=None):
+        """Return the stats cube filters for a Type 1 choice ('' or 'All' means any)
+        and a generation / legendary scope"""
+        filters = {'generations': generations, 'legendary': legendary}
+        if type1 not in ('', 'All', None):
+            filters['types'] = [type1]
+        return filters
+
+    def count_pokemon(self, type1='', generations=None, legendary=None):
+        """Function to count Pokemons of a Type 1 without scanning rows"""
+        return self.stats_cube.count(**self._cube_filter(type1, generations, legendary))
+
+    @profiled(rows=row_count)
+    def get_stats_by_type(self, attribute, type1='', generations=None, legendary=None):
+        """Function to get the mean of a stat for every Type 1"""
+        return self.stats_cube.means_by_type(attribute,
+                                             **self._cube_filter(type1, generations, legendary))
+
+    @profiled()
+    def get_stat_correlations(self, type1='', generations=None, legendary=None):
+        """Function to get the correlation matrix of the base stats"""
+        return self.stats_cube.correlation(**self._cube_filter(type1, generations, legendary))
+
+    @profiled()
+    def get_hp_distribution(self, type1='', bins=30, generations=None, legendary=None):
+        """Function to get the HP histogram (counts, edges) and its KDE curve (x, y)"""
+        filters = self._cube_filter(type1, generations, legendary)
+        counts, edges = self.stats_cube.hp_histogram(bins, **filters)
+        x, density = self.stats_cube.hp_density(**filters)
+        return counts, edges, x, density * (edges[1] - edges[0])
+
+    def _get_stat_neighbors(self):
+        """Return the stat-space neighbour index, building it on first use"""
+        if self.stat_neighbors is None:
+            self.stat_neighbors = StatNeighbors(self.pokemon_df, self.index.type_codes)
+        return self.stat_neighbors
+
+    @profiled(rows=row_count)
+    def get_similar_pokemon(self, row_id, k=10, type_weight=0.0):
+        """Function to get the k Pokemons with the closest base stats to one Pokemon,
+        as (row id, distance) pairs from nearest; type_weight > 0 favours shared types"""
+        ids, distances = self._get_stat_neighbors().nearest([row_id], k, type_weight)
+        return [(pokemon_id, distance) for pokemon_id, distance
+                in zip(ids[0].tolist(), distances[0].tolist()) if pokemon_id >= 0]
+
+    @profiled()
+    def get_similar_for_team(self, row_ids, k=5, type_weight=0.0):
+        """Function to get the k closest Pokemons to every member of a team in one pass,
+        as (row ids, distances) arrays with one row per member; members are never suggested"""
+        return self._get_stat_neighbors().nearest(row_ids, k, type_weight, exclude=row_ids)
 
+    @profiled(rows=row_count)
+    def get_slot_alternatives(self, team_ids, slot, k=10, type_weight=0.0,
+                              exclude_legendary=False, generations=None, legendary=None):
+        """Function to get (row id, distance) replacements for one team slot,
+        closest in base stats to the member in that slot and not already in the team"""
+        if exclude_legendary:
+            legendary = False
+        candidates = None
+        if self.index.partitions.is_pruned(generations, legendary):
+            candidates = self.index.partitions.rows(generations, legendary)
+        ids, distances = self._get_stat_neighbors().nearest(
+            [team_ids[slot]], k, type_weight, candidates=candidates, exclude=team_ids)
+        return [(pokemon_id, distance) for pokemon_id, distance
+                in zip(ids[0].tolist(), distances[0].tolist()) if pokemon_id >= 0]
+
+    @profiled(rows=row_count)
+    def get_pareto_front(self, stats, name='', type1='', stat='', min_value=0, fuzzy=False,
+                         generations=None, legendary=None):
+        """Function to get the row ids of the Pokemons matching the filters that no other
+        matching Pokemon dominates (matches or beats on every given stat, beats on one)"""
+        generations = None if generations is None else tuple(sorted(generations))
+        key = (tuple(stats), name, type1, stat, min_value, fuzzy, generations, legendary)
+        front = self.pareto_fronts.get(key)
+        if front is None:
+            row_ids = self.get_pokemon_ids(name, type1, stat, min_value, fuzzy,
+                                           generations, legendary)
+            values = np.column_stack([self.columns.arrays[self.columns.positions[column]][row_ids]
+                                      for column in stats])
+            front = row_ids[pareto_front(values)]
+            self.pareto_fronts.store(key, front)
+        return front
+
+    def _remember_team(self, team_id, team_name, member_names):
+        """Record a team in the in-memory lookup tables"""
+        self.team_members[team_id] = (team_name, list(member_names))
+        members = tuple(self.pokemon_ids_by_name[name.strip()] for name in member_names
+                        if name.strip() in self.pokemon_ids_by_name)
+        record = self.teams.get(team_id)
+        if record is None:
+            record = TeamRecord(team_id, team_name, members)
+            self.teams[team_id] = record
+            first = self.teams_by_key.setdefault(normalize_team_name(team_name), record)
+            if 0 < team_id < first.team_id:
+                self.teams_by_key[normalize_team_name(team_name)] = record
+        else:
+            record.members = members
+        return record
+
+    def _forget_team(self, team_id):
+        """Remove a team from the in-memory lookup tables"""
+        self.team_members.pop(team_id, None)
+        record = self.teams.pop(team_id, None)
+        if record is None:
+            return
+        key = normalize_team_name(record.name)
+        if self.teams_by_key.get(key) is record:
+            del self.teams_by_key[key]
+            for other in self.teams.values():
+                if normalize_team_name(other.name) == key:
+                    self.teams_by_key[key] = other
+                    break
+
+    def find_team(self, team_name):
+        """Return the TeamRecord saved under a case-insensitive team name, or None"""
+        return self.teams_by_key.get(normalize_team_name(team_name))
+
+    def _provisional_team_id(self):
+        """Return a negative id for a team until the team store hands out its own"""
+        team_id = self.next_provisional_id
+        self.next_provisional_id -= 1
+        return team_id
+
+    @profiled()
     def modify_team(self, team_name, pokemon_name, action="add"):
         """Function for modify team's members"""
-        team = self.saved_teams[self.saved_teams['Team Name'].str.strip().str.lower()
-                                     == team_name.strip().lower()]
-        if team.empty:
-            if action == "add":
-                self.saved_teams = self.saved_teams.append({
-                    'Team Name': team_name, 'Members': [pokemon_name]
-                }, ignore_index=True)
+        self._adopt_team_ids()
+        record = self.find_team(team_name)
+        if record is None:
+            if action != "add":
+                return
+            team_id, current_members = self._provisional_team_id(), []
         else:
-            current_members = team['Members'].iloc[0].split(',')
-            current_members = [member.strip() for member in current_members]
-            if action == "add":
-                if pokemon_name not in current_members:
-                    current_members.append(pokemon_name)
-            elif action == "remove":
-                if pokemon_name in current_members:
-                    current_members.remove(pokemon_name)
-            self.saved_teams.loc[self.saved_teams['Team Name'].str.lower() == \
-                    team_name.lower(), 'Members'] = [','.join(current_members)]
-        self.save_team()
+            team_id = record.team_id
+            team_name, current_members = self.team_members[team_id]
+            current_members = list(current_members)
+        if action == "add" and pokemon_name not in current_members:
+            current_members.append(pokemon_name)
+        elif action == "remove" and pokemon_name in current_members:
+            current_members.remove(pokemon_name)
+        self._remember_team(team_id, team_name, current_members)
+        self.team_writer.put(action, team_id, team_name, pokemon_name)
 
+    def get_team_member_ids(self, team_name):
+        """Function to get the row ids of a saved team's members"""
+        record = self.find_team(team_name)
+        return [] if record is None else list(record.members)
+
+    @profiled(rows=row_count)
     def load_team(self, team_name):
         """Function for load team's members of selected team"""
-        team_data = self.saved_teams[self.saved_teams['Team Name'].str.strip().str.lower()
-                                     == team_name.strip().lower()]
-        if not team_data.empty:
-            members = team_data.iloc[0]['Members'].split(',')
-            return members
-        return []
+        return self.get_pokemon_names(self.get_team_member_ids(team_name))
 
+    @profiled()
     def save_team(self, team_name=None, team_members=None):
         """Function to save the selected team into file"""
         if team_name and team_members:
-            new_entry = pd.DataFrame({'Team Name': [team_name],
-                                      'Members': [','.join(team_members)]})
-            self.saved_teams = pd.concat([self.saved_teams, new_entry], ignore_index=True)
-            self.saved_teams.to_csv('data/saved_teams.csv', index=False)
+            team_id = self._provisional_team_id()
+            self._remember_team(team_id, team_name, list(team_members))
+            self.team_writer.put('save', team_id, team_name, list(team_members))
 
-    def delete_team(self, index):
-        """Function for delete a team by its index in the saved teams DataFrame."""
-        if 0 <= index < len(self.saved_teams):
-            self.saved_teams.drop(index, inplace=True)
-            self.saved_teams.reset_index(drop=True, inplace=True)
+    @profiled()
+    def delete_team(self, team_id):
+        """Function for delete a team by its id in the team store."""
+        self._adopt_team_ids()
+        team_id = self.team_writer.resolve(team_id)
+        existed = team_id in self.teams
+        self._forget_team(team_id)
+        self.team_writer.put('delete', team_id)
+        return existed
 
     def add_pokemon_to_team(self, team_name, pokemon):
         """Function for add new member to team"""
-        team_index = self.saved_teams[self.saved_teams['Team Name'] == team_name].index
-        if not team_index.empty:
-            team_index = team_index[0]
-            existing_members = self.saved_teams.loc[team_index, 'Members'].split(',')
-            if pokemon not in existing_members:
-                existing_members.append(pokemon)
-                self.saved_teams.at[team_index, 'Members'] = ','.join(existing_members)
-                self.saved_teams.to_csv(self.saved_teams_file, index=False)
-        else:
-            self.save_team(team_name, [pokemon])
+        self.modify_team(team_name, pokemon, action="add")
 
+    @profiled()
+    def clear_team_members(self, team_name):
+        """Function for remove every member of a team"""
+        record = self.find_team(team_name)
+        if record is not None:
+            team_name = self.team_members[record.team_id][0]
+            self._remember_team(record.team_id, team_name, [])
+            self.team_writer.put('clear', record.team_id, team_name)
+
+    @profiled()
+    def flush_teams(self):
+        """Function to start writing the pending team edits now, without waiting for them"""
+        self.team_writer.flush(wait=False)
+
+    @profiled(rows=row_count)
+    def get_saved_teams(self):
+        """Return (id, name, members) of every saved team"""
+        self.reload_teams_if_changed()
+        return [(record.team_id, record.name, self.get_pokemon_names(list(record.members)))
+                for record in self.teams.values()]
+
+    @profiled(rows=row_count)
     def get_selected_pokemon_data(self, pokemon_names):
         """
         Retrieve data for a selected list of Pokémon by their names.
@@ -101,25 +417,150 @@ class PokemonModel:
         :param pokemon_names: List of Pokémon names to retrieve data for.
         :return: DataFrame containing data for the selected Pokémon.
         """
-        return self.pokemon_df[self.pokemon_df['Name'].isin(pokemon_names)]
+        row_ids = {self.pokemon_ids_by_name[name] for name in pokemon_names
+                   if name in self.pokemon_ids_by_name}
+        return self.get_pokemon_frame(sorted(row_ids))
 
     def load_all_team_names(self):
-        """Load all team names from the saved teams file."""
-        if os.path.exists(self.saved_teams_file):
-            self.saved_teams = pd.read_csv(self.saved_teams_file)
-            return self.saved_teams['Team Name'].tolist()
-        return []
+        """Load all team names from the saved teams store."""
+        self.reload_teams_if_changed()
+        return [record.name for record in self.teams.values()]
 
+    @profiled(rows=row_count)
     def get_team_data(self, team_name):
         """
         Retrieve data for all Pokémon in a specified team by team name.
         """
-        team_data = self.saved_teams[self.saved_teams['Team Name'].str.lower() == team_name.lower()]
-        if team_data.empty:
+        record = self.find_team(team_name)
+        if record is None:
             return pd.DataFrame()
+        return self.get_pokemon_frame(record.members)
+
+    def get_team_coverage(self, team_name):
+        """
+        Return the type coverage of a saved team: for every type, how many
+        members are weak to, resist or are immune to it, and the best
+        multiplier the team's types deal to it.
+        """
+        record = self.find_team(team_name)
+        members = [] if record is None else list(record.members)
+        return team_coverage(self.index.type_codes[members])
+
+    def suggest_team_additions(self, team_name, limit=10, generations=None, legendary=None):
+        """
+        Rank every Pokémon in the generation / legendary scope by how much it
+        would improve a saved team's type matchups, breaking ties by Total.
+        Current members are left out.
+        """
+        record = self.find_team(team_name)
+        members = [] if record is None else list(record.members)
+        candidates = self.index.partitions.rows(generations, legendary)
+        candidates = candidates[~np.isin(candidates, members)]
+        scores = score_candidates(self.index.type_codes[candidates],
+                                  self.index.type_codes[members])
+        totals = self.pokemon_df['Total'].to_numpy()[candidates]
+        order = np.lexsort((-totals, -scores))[:limit]
+        suggestions = self.pokemon_df.iloc[candidates[order]].copy()
+        suggestions['Score'] = scores[order]
+        return suggestions
+
+    def create_team_optimizer(self, workers=None):
+        """Return a TeamOptimizer over the whole Pokédex"""
+        return TeamOptimizer(self.pokemon_df, self.index.type_codes, workers=workers,
+                             partitions=self.index.partitions)
+
+    def suggest_best_team(self, constraints=None, progress=None, workers=None):
+        """
+        Search for the highest-scoring team under the given TeamConstraints
+        and return a TeamSuggestion holding the member row ids.
+        """
+        optimizer = self.create_team_optimizer(workers)
+        return optimizer.optimize(constraints or TeamConstraints(), progress=progress)
+
+    def create_matchup_engine(self, workers=None):
+        """Return a MatchupEngine over the whole Pokédex"""
+        return MatchupEngine(self.pokemon_df, self.index.type_codes, workers=workers)
+
+    def compare_teams(self, team_a, team_b):
+        """
+        Return the TeamMatchup between two saved teams, holding damage,
+        speed order and duel matrices between every pair of members, or
+        None if either team does not exist.
+        """
+        record_a, record_b = self.find_team(team_a), self.find_team(team_b)
+        if record_a is None or record_b is None:
+            return None
+        return self.create_matchup_engine().matchup(record_a.members, record_b.members)
+
+    def rank_teams(self, workers=None, progress=None):
+        """
+        Play a round-robin tournament between every saved team with members
+        and return the ranking as a DataFrame.
+        """
+        records = sorted((record for record in self.teams.values() if record.members),
+                         key=lambda record: record.team_id)
+        width = max((len(record.members) for record in records), default=0)
+        teams = np.full((len(records), width), -1, dtype=np.int64)
+        for row, record in enumerate(records):
+            teams[row, :len(record.members)] = record.members
+        results = self.create_matchup_engine(workers).tournament(teams, progress=progress)
+        return ranking_frame([record.team_id for record in records],
+                             [record.name for record in records], *results)
+
+
+class SharedPokemonModel(PokemonModel):
+    """
+    Read-only PokemonModel over a Pokédex another process published with
+    PokemonModel.share(). Columns, indexes and the stats cube are views of
+    the shared memory segment, so attaching copies nothing and the queries
+    work as usual. A full DataFrame, needed by the team optimizer, matchups,
+    suggestions and stat neighbours, is built on first use around the same
+    shared columns. Saved teams still come from the team store.
+    """
+
+    def __init__(self, descriptor, teams_path='data/saved_teams.db'):
+        # pylint: disable=super-init-not-called
+        self.file_path = None
+        self._open_teams(teams_path)
+        self.shared_pokedex = SharedPokedex(descriptor)
+        self._pokemon_df = None
+        self.columns = self.shared_pokedex.columns
+        self.index = self.shared_pokedex.index
+        self.pokemon_names = self.shared_pokedex.names
+        self.pokemon_ids_by_name = self.shared_pokedex.name_ids
+        self.stats_cube = self.shared_pokedex.stats_cube
+        self.stat_neighbors = None
+        self.pareto_fronts = SkylineCache()
+        self.loading = False
+        self.load_report = None
+        self.snapshots = None
+        self._load_teams()
+
+    @property
+    def pokemon_df(self):
+        """The whole Pokédex as a DataFrame wrapping the shared columns"""
+        if self._pokemon_df is None:
+            self._pokemon_df = self.shared_pokedex.frame()
+        return self._pokemon_df
+
+    def publish(self, pokemon_df, index, stats_cube, complete):
+        """A shared Pokédex cannot be replaced"""
+        raise RuntimeError("a shared Pokédex is read-only")
+
+    def share(self):
+        """Return the descriptor of the Pokédex this model is attached to"""
+        return self.shared_pokedex.descriptor
 
-        members = team_data.iloc[0]['Members'].split(',')
-        members = [name.strip() for name in members]
+    def close(self):
+        """Close the team store and let go of the shared Pokédex"""
+        self.columns = self.index = self.stats_cube = None
+        self.pokemon_names = self.pokemon_ids_by_name = None
+        self._pokemon_df = self.stat_neighbors = None
+        return super().close()
 
-        pokemon_data = self.pokemon_df[self.pokemon_df['Name'].isin(members)]
-        return pokemon_data
+    def get_pokemon_frame(self, row_ids):
+        """Function to get the rows of some Pokemons as a DataFrame, in the given order"""
+        row_ids = np.asarray(list(row_ids), dtype=np.int64)
+        frame = PokemonRecords(self.columns, row_ids).to_frame()
+        frame.index = row_ids
+        return frame
@@ -0,0 +1,139 @@
+# name_search.py
+"""File for NameSearchEngine class"""
+import threading
+from collections import OrderedDict
+import numpy as np
+
+GRAM_SIZE = 3
+
+
+class NameSearchEngine:
+    """N-gram index over Pokémon names for substring, incremental and fuzzy search"""
+
+    def __init__(self, names, cache_size=32):
+        self.names = [name.lower() for name in names]
+        self.size = len(self.names)
+        self.postings = self._build_postings(self.names)
+        self.cache_size = cache_size
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_postings(names):
+        """Map every 1-, 2- and 3-gram to the sorted row ids of names containing it"""
+        postings = {}
+        for row_id, name in enumerate(names):
+            grams = set()
+            for size in range(1, GRAM_SIZE + 1):
+                grams.update(name[i:i + size] for i in range(len(name) - size + 1))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row_id)
+        return {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    @staticmethod
+    def _grams(term, size):
+        """Return the distinct grams of the given size in a search term"""
+        return {term[i:i + size] for i in range(len(term) - size + 1)}
+
+    def _lookup(self, term, candidates=None):
+        """Return row ids of names containing the term.
+
+        Previous results in candidates are narrowed directly when they are
+        smaller than every posting list the index would have to intersect.
+        """
+        size = min(len(term), GRAM_SIZE)
+        lists = []
+        for gram in self._grams(term, size):
+            ids = self.postings.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append(ids)
+        lists.sort(key=len)
+        if candidates is not None and len(candidates) <= len(lists[0]):
+            return self._narrow(candidates, term)
+        result = lists[0]
+        for ids in lists[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                return result
+        if len(term) <= GRAM_SIZE:
+            return result
+        return self._narrow(result, term)
+
+    def _narrow(self, candidates, term):
+        """Keep only the candidates whose name contains the term"""
+        names = self.names
+        return np.fromiter((row_id for row_id in candidates if term in names[row_id]),
+                           dtype=np.int64)
+
+    def _cached_candidates(self, term):
+        """Return the cached result of the longest previous query contained in term"""
+        best = None
+        for query, result in self._recent.items():
+            if query in term and (best is None or len(query) > len(best[0])):
+                best = (query, result)
+        return best
+
+    def search(self, term, fuzzy=False):
+        """Return sorted row ids of names containing term.
+
+        Results of recent queries are kept, so extending the previous query by a
+        character only narrows its result instead of searching from scratch.
+        With fuzzy=True, a term matching nothing falls back to names containing
+        a substring within one edit of it.
+        """
+        term = term.strip().lower()
+        if not term:
+            return np.arange(self.size)
+        with self._lock:
+            cached = self._cached_candidates(term)
+        if cached is None:
+            result = self._lookup(term)
+        elif cached[0] == term:
+            result = cached[1]
+        else:
+            result = self._lookup(term, cached[1])
+        with self._lock:
+            self._recent[term] = result
+            self._recent.move_to_end(term)
+            while len(self._recent) > self.cache_size:
+                self._recent.popitem(last=False)
+        if fuzzy and not len(result):
+            return self.fuzzy_search(term)
+        return result
+
+    def fuzzy_search(self, term, max_edits=1):
+        """Return sorted row ids of names containing a substring within max_edits of term"""
+        term = term.strip().lower()
+        # q-gram lemma: an approximate occurrence keeps at least
+        # (len - size + 1) - size * max_edits of the term's grams.
+        for size in (GRAM_SIZE, 2):
+            grams = self._grams(term, size)
+            threshold = len(term) - size + 1 - size * max_edits
+            if threshold > 0:
+                break
+        else:
+            return self.search(term)
+        postings = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not postings:
+            return np.empty(0, dtype=np.int64)
+        counts = np.bincount(np.concatenate(postings), minlength=self.size)
+        candidates = np.flatnonzero(counts >= threshold)
+        names = self.names
+        return np.fromiter(
+            (row_id for row_id in candidates
+             if _within_edits(term, names[row_id], max_edits)), dtype=np.int64)
+
+
+def _within_edits(pattern, text, max_edits):
+    """Return True if some substring of text is within max_edits of pattern"""
+    previous = [0] * (len(text) + 1)
+    for i, pattern_char in enumerate(pattern, 1):
+        current = [i] + [0] * len(text)
+        for j, text_char in enumerate(text, 1):
+            current[j] = min(previous[j - 1] + (pattern_char != text_char),
+                             previous[j] + 1, current[j - 1] + 1)
+        if min(current) > max_edits:
+            return False
+        previous = current
+    return min(previous) <= max_edits
@@ -0,0 +1,130 @@
+# pokedex_cache.py
+"""File for the compiled Pokédex cache"""
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+CATEGORICAL_COLUMNS = ('Type 1', 'Type 2')
+
+
+def default_cache_path(csv_path):
+    """Return the cache file stored next to a Pokédex CSV"""
+    return os.path.splitext(csv_path)[0] + '.npz'
+
+
+def file_fingerprint(path):
+    """Return the (size, mtime in ns) pair used to notice source changes cheaply"""
+    info = os.stat(path)
+    return np.array([info.st_size, info.st_mtime_ns], dtype=np.int64)
+
+
+def file_digest(path):
+    """Return the SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def prepare_frame(frame):
+    """Give a freshly parsed Pokédex the same dtypes the cache restores"""
+    for column in CATEGORICAL_COLUMNS:
+        if column in frame.columns:
+            categories = sorted(frame[column].dropna().unique())
+            frame[column] = pd.Categorical(frame[column], categories=categories)
+    return frame
+
+
+def save_cache(frame, cache_path, source_path):
+    """Write the frame as typed arrays: numeric columns as-is, categorical
+    columns as codes plus a category table, strings as one fixed-width table"""
+    arrays = {
+        'version': np.array([CACHE_VERSION]),
+        'fingerprint': file_fingerprint(source_path),
+        'digest': np.array([file_digest(source_path)]),
+        'columns': np.array(frame.columns, dtype=str),
+    }
+    kinds = []
+    for position, column in enumerate(frame.columns):
+        series = frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kinds.append('category')
+            arrays[f'values{position}'] = series.cat.codes.to_numpy()
+            arrays[f'table{position}'] = np.array(series.cat.categories, dtype=str)
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            kinds.append('values')
+            arrays[f'values{position}'] = series.to_numpy()
+        else:
+            kinds.append('string')
+            arrays[f'values{position}'] = series.fillna('').to_numpy(dtype=str)
+    arrays['kinds'] = np.array(kinds)
+    write_arrays(arrays, cache_path)
+
+
+def write_arrays(arrays, cache_path):
+    """Replace the cache file atomically with the given arrays"""
+    temporary = f'{cache_path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as target:
+        np.savez(target, **arrays)
+    os.replace(temporary, cache_path)
+
+
+def load_cache(cache_path, source_path):
+    """Return the cached frame, or None if the cache is missing or stale.
+
+    When only the content hash matched, the cache is rewritten with the new
+    fingerprint so later loads skip hashing the source again.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    with np.load(cache_path, allow_pickle=False) as cache:
+        if int(cache['version'][0]) != CACHE_VERSION:
+            return None
+        fingerprint = file_fingerprint(source_path)
+        refresh = not np.array_equal(cache['fingerprint'], fingerprint)
+        if refresh and str(cache['digest'][0]) != file_digest(source_path):
+            return None
+        data = {}
+        for position, (column, kind) in enumerate(zip(cache['columns'], cache['kinds'])):
+            values = cache[f'values{position}']
+            if kind == 'category':
+                data[str(column)] = pd.Categorical.from_codes(values, cache[f'table{position}'])
+            elif kind == 'string':
+                data[str(column)] = values.astype(object)
+            else:
+                data[str(column)] = values
+        if refresh:
+            arrays = {name: cache[name] for name in cache.files}
+    if refresh:
+        arrays['fingerprint'] = fingerprint
+        try:
+            write_arrays(arrays, cache_path)
+        except OSError:
+            pass
+    return pd.DataFrame(data)
+
+
+def load_pokedex(csv_path, cache_path=None, use_cache=True):
+    """Return the Pokédex DataFrame, parsing the CSV only when the cache is stale.
+
+    The cache is trusted when the source size and mtime match; otherwise its
+    recorded content hash decides, so touching the CSV does not force a rebuild.
+    """
+    if not use_cache:
+        return prepare_frame(pd.read_csv(csv_path))
+    cache_path = cache_path or default_cache_path(csv_path)
+    try:
+        frame = load_cache(cache_path, csv_path)
+    except (OSError, ValueError, KeyError):
+        frame = None
+    if frame is not None:
+        return frame
+    frame = prepare_frame(pd.read_csv(csv_path))
+    try:
+        save_cache(frame, cache_path, csv_path)
+    except OSError:
+        pass
+    return frame
@@ -0,0 +1,165 @@
+# pokedex_index.py
+"""File for PokedexIndex class"""
+import threading
+from collections import OrderedDict
+import numpy as np
+from name_search import NameSearchEngine
+from pokedex_partitions import PokedexPartitions, intersect_sorted
+from type_chart import type_codes
+
+STAT_COLUMNS = ['Total', 'HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+SORT_OPTIONS = {
+    'Name': (('Name', True),),
+    'Type': (('Type 1', True), ('Type 2', True), ('Name', True)),
+    'Number': (('#', True),),
+}
+
+
+class PokedexIndex:
+    """Column index over the Pokédex, built once so filters never rescan the DataFrame"""
+
+    def __init__(self, pokemon_df, max_custom_sorts=16):
+        self.pokemon_df = pokemon_df
+        self.size = len(pokemon_df)
+        self.name_search = NameSearchEngine(pokemon_df['Name'].tolist())
+        self.type_bitmaps = self._build_type_bitmaps(pokemon_df)
+        self.type_codes = type_codes(pokemon_df)
+        self.partitions = PokedexPartitions(pokemon_df)
+        self.stat_orders = {}
+        self.stat_values = {}
+        self.stat_columns = {}
+        for stat in STAT_COLUMNS:
+            if stat in pokemon_df.columns:
+                values = pokemon_df[stat].to_numpy()
+                self.stat_columns[stat] = values
+                order = np.argsort(values, kind='stable')
+                self.stat_orders[stat] = order
+                self.stat_values[stat] = values[order]
+        self.max_custom_sorts = max_custom_sorts
+        self._sort_lock = threading.Lock()
+        self.custom_sorts = OrderedDict()
+        self.preset_sorts = {key: self._build_sort(key) for key in SORT_OPTIONS.values()}
+
+    def _build_type_bitmaps(self, pokemon_df):
+        """Build one boolean row bitmap per type, covering both type columns"""
+        bitmaps = {}
+        for column in ('Type 1', 'Type 2'):
+            if column not in pokemon_df.columns:
+                continue
+            values = pokemon_df[column].to_numpy(dtype=object)
+            for type_name in pokemon_df[column].dropna().unique():
+                bitmap = bitmaps.setdefault(type_name, np.zeros(self.size, dtype=bool))
+                bitmap |= values == type_name
+        return bitmaps
+
+    def get_types(self):
+        """Return the sorted list of indexed types"""
+        return sorted(self.type_bitmaps)
+
+    def all_mask(self):
+        """Return a bitmap selecting every row"""
+        return np.ones(self.size, dtype=bool)
+
+    def type_mask(self, type_name):
+        """Return the bitmap of rows having the given type in either slot"""
+        bitmap = self.type_bitmaps.get(type_name)
+        if bitmap is None:
+            return np.zeros(self.size, dtype=bool)
+        return bitmap
+
+    def stat_range(self, stat, min_value=None, max_value=None):
+        """Return row ids whose stat lies in [min_value, max_value] using binary search"""
+        values = self.stat_values[stat]
+        low = 0 if min_value is None else np.searchsorted(values, min_value, side='left')
+        high = len(values) if max_value is None else \
+            np.searchsorted(values, max_value, side='right')
+        return self.stat_orders[stat][low:high]
+
+    def stat_mask(self, stat, min_value=None, max_value=None):
+        """Return the bitmap of rows whose stat lies in the given range"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.stat_range(stat, min_value, max_value)] = True
+        return mask
+
+    def name_mask(self, name, fuzzy=False):
+        """Return the bitmap of rows whose name contains the search term"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.name_search.search(name, fuzzy=fuzzy)] = True
+        return mask
+
+    def query_mask(self, name='', type1='', stat='', min_value=0, fuzzy=False):
+        """Combine the type, stat and name filters into one row bitmap"""
+        mask = None
+        if type1 and type1 != 'All':
+            mask = self.type_mask(type1).copy()
+        if stat and stat != 'All':
+            stat_mask = self.stat_mask(stat, int(min_value))
+            mask = stat_mask if mask is None else mask & stat_mask
+        if name:
+            name_mask = self.name_mask(name, fuzzy)
+            mask = name_mask if mask is None else mask & name_mask
+        return self.all_mask() if mask is None else mask
+
+    def query(self, name='', type1='', stat='', min_value=0, fuzzy=False,
+              generations=None, legendary=None):
+        """Return the row ids matching all given filters.
+
+        When generations or legendary rule out whole partitions, only the
+        rows of the remaining partitions are read.
+        """
+        if not self.partitions.is_pruned(generations, legendary):
+            return np.flatnonzero(self.query_mask(name, type1, stat, min_value, fuzzy))
+        matches = self.name_search.search(name, fuzzy=fuzzy) if name else None
+        by_type = type1 and type1 != 'All'
+        by_stat = stat and stat != 'All'
+        if matches is not None and not by_type and not by_stat:
+            return np.sort(self.partitions.intersect(matches, generations, legendary))
+        rows = self.partitions.gather(generations, legendary)
+        if by_type:
+            rows = rows[self.type_mask(type1)[rows]]
+        if by_stat:
+            rows = rows[self.stat_columns[stat][rows] >= int(min_value)]
+        rows = np.sort(rows)
+        # The names are checked against the remaining rows only, not a bitmap of every row.
+        return rows if matches is None else intersect_sorted(rows, matches)
+
+    @staticmethod
+    def sort_key(sort_by):
+        """Normalize a sort option name or a list of columns / (column, ascending) pairs"""
+        if isinstance(sort_by, str):
+            return SORT_OPTIONS.get(sort_by, ((sort_by, True),))
+        return tuple((item, True) if isinstance(item, str) else (item[0], bool(item[1]))
+                     for item in sort_by)
+
+    def _build_sort(self, key):
+        """Compute the stable row permutation for a normalized sort key"""
+        columns = [column for column, _ in key]
+        frame = self.pokemon_df[columns].reset_index(drop=True)
+        ordered = frame.sort_values(by=columns, ascending=[ascending for _, ascending in key],
+                                    kind='stable', na_position='last')
+        return ordered.index.to_numpy()
+
+    def sort_permutation(self, sort_by):
+        """Return the cached permutation for a sort, computing custom sorts on first use"""
+        key = self.sort_key(sort_by)
+        permutation = self.preset_sorts.get(key)
+        if permutation is not None:
+            return permutation
+        with self._sort_lock:
+            permutation = self.custom_sorts.get(key)
+            if permutation is not None:
+                self.custom_sorts.move_to_end(key)
+                return permutation
+        permutation = self._build_sort(key)
+        with self._sort_lock:
+            self.custom_sorts[key] = permutation
+            while len(self.custom_sorts) > self.max_custom_sorts:
+                self.custom_sorts.popitem(last=False)
+        return permutation
+
+    def order(self, row_ids, sort_by):
+        """Return row_ids ordered by a cached permutation instead of re-sorting"""
+        permutation = self.sort_permutation(sort_by)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[row_ids] = True
+        return permutation[mask[permutation]]
@@ -0,0 +1,79 @@
+# pokedex_partitions.py
+"""File for PokedexPartitions class"""
+import numpy as np
+
+
+def intersect_sorted(first, second):
+    """Return the ids present in both sorted arrays, looking up the smaller in the larger"""
+    small, large = (first, second) if len(first) < len(second) else (second, first)
+    if not len(small):
+        return small
+    positions = np.minimum(np.searchsorted(large, small), len(large) - 1)
+    return small[large[positions] == small]
+
+
+class PokedexPartitions:
+    """Row ids of the Pokédex grouped by (Generation, Legendary) partition.
+
+    The rows keep their positions, so row ids stay valid; instead the ids
+    are stored once, sorted by partition, with the offset where each
+    partition starts. A scoped query gathers only the slices of the
+    partitions it needs and never looks at the other rows.
+    """
+
+    def __init__(self, pokemon_df):
+        self.size = len(pokemon_df)
+        if 'Generation' in pokemon_df.columns and 'Legendary' in pokemon_df.columns:
+            generations = pokemon_df['Generation'].to_numpy(dtype=np.int64)
+            legendary = pokemon_df['Legendary'].to_numpy(dtype=bool)
+        else:
+            generations = np.zeros(self.size, dtype=np.int64)
+            legendary = np.zeros(self.size, dtype=bool)
+        codes = generations * 2 + legendary
+        keys, partition_of_row = np.unique(codes, return_inverse=True)
+        self.keys = [(int(code) // 2, bool(code % 2)) for code in keys]
+        self.row_ids = np.argsort(partition_of_row, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(partition_of_row,
+                                                                  minlength=len(keys)))])
+
+    def get_generations(self):
+        """Return the sorted generations present in the Pokédex"""
+        return sorted({generation for generation, _ in self.keys})
+
+    def select(self, generations=None, legendary=None):
+        """Return the indexes of the partitions matching the filters (None means any)"""
+        generations = None if generations is None else set(generations)
+        return [partition for partition, (generation, is_legendary) in enumerate(self.keys)
+                if (generations is None or generation in generations)
+                and (legendary is None or is_legendary == legendary)]
+
+    def is_pruned(self, generations=None, legendary=None):
+        """Return True when the filters leave out at least one partition"""
+        return len(self.select(generations, legendary)) < len(self.keys)
+
+    def gather(self, generations=None, legendary=None):
+        """Return the row ids of the partitions matching the filters, partition by partition"""
+        slices = [self.row_ids[self.offsets[partition]:self.offsets[partition + 1]]
+                  for partition in self.select(generations, legendary)]
+        if not slices:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    def intersect(self, row_ids, generations=None, legendary=None):
+        """Return the ids from a sorted array that lie in the partitions matching
+        the filters, reading only those partitions' slices"""
+        found = [intersect_sorted(self.row_ids[self.offsets[partition]:
+                                               self.offsets[partition + 1]], row_ids)
+                 for partition in self.select(generations, legendary)]
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(found)
+
+    def rows(self, generations=None, legendary=None):
+        """Return the sorted row ids of the partitions matching the filters"""
+        return np.sort(self.gather(generations, legendary))
+
+    def count(self, generations=None, legendary=None):
+        """Return the number of rows in the partitions matching the filters"""
+        return int(sum(self.offsets[partition + 1] - self.offsets[partition]
+                       for partition in self.select(generations, legendary)))
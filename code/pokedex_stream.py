@@ -0,0 +1,153 @@
+# pokedex_stream.py
+"""File for the streaming Pokédex loader"""
+import numpy as np
+import pandas as pd
+from type_chart import TYPES
+
+DEFAULT_CHUNK_SIZE = 50000
+INTEGER_DTYPES = {
+    '#': np.int16, 'Total': np.int16, 'HP': np.int16, 'Attack': np.int16,
+    'Defense': np.int16, 'Sp. Atk': np.int16, 'Sp. Def': np.int16, 'Speed': np.int16,
+    'Generation': np.int8,
+}
+TYPE_DTYPE = pd.CategoricalDtype(sorted(TYPES))
+COLUMNS = ['#', 'Name', 'Type 1', 'Type 2', 'Total', 'HP', 'Attack', 'Defense',
+           'Sp. Atk', 'Sp. Def', 'Speed', 'Generation', 'Legendary']
+LEGENDARY_VALUES = {'true': True, 'false': False, '1': True, '0': False}
+
+
+class LoadReport:
+    """Counts of what the streaming loader read, kept and dropped"""
+
+    def __init__(self, max_examples=20):
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.max_examples = max_examples
+        self.invalid_lines = []
+
+    def __repr__(self):
+        return (f"LoadReport(read={self.rows_read}, kept={self.rows_kept}, "
+                f"invalid={self.invalid}, duplicates={self.duplicates})")
+
+
+class StreamingLoader:
+    """Reads a Pokédex CSV chunk by chunk into compact dtypes.
+
+    Rows with a missing name, an unknown type, a stat that is not an integer
+    in range, or an unreadable Legendary flag are dropped. Rows repeating an
+    earlier (#, Name) pair are dropped too, so Mega and alternate forms that
+    share a number are kept. Seen pairs are remembered as 64-bit hashes.
+    """
+
+    def __init__(self, csv_path, chunk_size=DEFAULT_CHUNK_SIZE, growth=2):
+        self.csv_path = csv_path
+        self.chunk_size = chunk_size
+        self.growth = growth
+        self.report = LoadReport()
+        self._seen = np.zeros(0, dtype=np.uint64)
+
+    def chunks(self):
+        """Yield validated, deduplicated chunks with a fresh RangeIndex each"""
+        line = 2
+        reader = pd.read_csv(self.csv_path, chunksize=self.chunk_size,
+                             dtype={'Name': str, 'Type 1': str, 'Type 2': str})
+        with reader:
+            for raw in reader:
+                self.report.rows_read += len(raw)
+                chunk = self._clean(raw, line)
+                line += len(raw)
+                if len(chunk):
+                    self.report.rows_kept += len(chunk)
+                    yield chunk
+
+    def snapshots(self):
+        """Yield (frame, complete) for a growing Pokédex.
+
+        The first chunk is published at once; after that a new snapshot is
+        only assembled when the row count has grown by the growth factor, so
+        the total copying stays linear in the final size. Every snapshot
+        extends the previous one, so row ids stay valid between them.
+        """
+        frame = None
+        parts = []
+        pending = 0
+        for chunk in self.chunks():
+            parts.append(chunk)
+            pending += len(chunk)
+            published = 0 if frame is None else len(frame)
+            if frame is None or published + pending >= self.growth * published:
+                frame = self._extend(frame, parts)
+                parts, pending = [], 0
+                yield frame, False
+        if parts or frame is None:
+            frame = self._extend(frame, parts)
+        yield frame, True
+
+    def _extend(self, frame, parts):
+        """Return frame with parts appended"""
+        if frame is not None:
+            parts = [frame] + parts
+        if not parts:
+            return self._empty()
+        return pd.concat(parts, ignore_index=True)
+
+    def _empty(self):
+        """Return an empty Pokédex with the loader's dtypes"""
+        frame = pd.DataFrame({column: pd.Series(dtype=object) for column in COLUMNS})
+        return self._convert(frame)
+
+    def _clean(self, raw, first_line):
+        """Validate, convert and deduplicate one raw chunk"""
+        missing = [column for column in COLUMNS if column not in raw.columns]
+        if missing:
+            raise ValueError(f"{self.csv_path} is missing columns: {', '.join(missing)}")
+        raw = raw[COLUMNS]
+        valid = raw['Name'].notna() & (raw['Name'].str.strip() != '')
+        for column in ('Type 1', 'Type 2'):
+            known = raw[column].isin(TYPE_DTYPE.categories)
+            valid &= known if column == 'Type 1' else known | raw[column].isna()
+        numbers = {}
+        for column, dtype in INTEGER_DTYPES.items():
+            values = pd.to_numeric(raw[column], errors='coerce')
+            limits = np.iinfo(dtype)
+            valid &= values.notna() & (values == values.round()) \
+                & (values >= 0) & (values <= limits.max)
+            numbers[column] = values
+        legendary = raw['Legendary']
+        if legendary.dtype != bool:
+            legendary = legendary.astype(str).str.strip().str.lower().map(LEGENDARY_VALUES)
+        valid &= legendary.notna()
+
+        invalid = np.flatnonzero(~valid.to_numpy())
+        self.report.invalid += len(invalid)
+        room = self.report.max_examples - len(self.report.invalid_lines)
+        self.report.invalid_lines.extend((invalid[:max(room, 0)] + first_line).tolist())
+
+        chunk = raw.loc[valid].assign(Legendary=legendary[valid],
+                                      **{column: values[valid]
+                                         for column, values in numbers.items()})
+        chunk = self._convert(chunk.reset_index(drop=True))
+        return self._deduplicate(chunk)
+
+    def _convert(self, chunk):
+        """Cast a validated chunk to the compact loader dtypes"""
+        chunk = chunk.astype({column: dtype for column, dtype in INTEGER_DTYPES.items()})
+        chunk['Name'] = chunk['Name'].astype(object).str.strip()
+        for column in ('Type 1', 'Type 2'):
+            chunk[column] = chunk[column].astype(TYPE_DTYPE)
+        chunk['Legendary'] = chunk['Legendary'].astype(bool)
+        return chunk
+
+    def _deduplicate(self, chunk):
+        """Drop rows whose (#, Name) pair was already loaded"""
+        keys = pd.util.hash_pandas_object(chunk[['#', 'Name']], index=False).to_numpy()
+        fresh = ~pd.Series(keys).duplicated().to_numpy()
+        if len(self._seen):
+            positions = np.searchsorted(self._seen, keys).clip(max=len(self._seen) - 1)
+            fresh &= self._seen[positions] != keys
+        self.report.duplicates += int((~fresh).sum())
+        # Two sorted runs: the stable sort merges them in linear time.
+        self._seen = np.sort(np.concatenate([self._seen, np.sort(keys[fresh])]), kind='stable')
+        return chunk.loc[fresh].reset_index(drop=True)
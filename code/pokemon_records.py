@@ -0,0 +1,116 @@
+# pokemon_records.py
+"""File for the compact Pokémon record views"""
+from collections.abc import Mapping, Sequence
+import numpy as np
+import pandas as pd
+
+
+class PokedexColumns:
+    """One NumPy array per Pokédex column, shared by every record view.
+
+    Categorical columns keep their small integer codes plus a label table
+    whose last entry is NaN, so code -1 (missing) needs no special case.
+    """
+
+    def __init__(self, pokemon_df):
+        self.names = list(pokemon_df.columns)
+        self.positions = {column: position for position, column in enumerate(self.names)}
+        self.arrays = []
+        self.labels = []
+        for column in self.names:
+            series = pokemon_df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                self.arrays.append(series.cat.codes.to_numpy())
+                self.labels.append(np.append(series.cat.categories.to_numpy(dtype=object),
+                                             np.nan))
+            else:
+                self.arrays.append(series.to_numpy())
+                self.labels.append(None)
+        self.size = len(pokemon_df)
+
+    def value(self, position, row_id):
+        """Return one cell as a plain Python value"""
+        value = self.arrays[position][row_id]
+        labels = self.labels[position]
+        if labels is not None:
+            return labels[value]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def column_values(self, position, row_ids):
+        """Return the cells of one column for many rows as a list of Python values"""
+        values = self.arrays[position][row_ids]
+        labels = self.labels[position]
+        if labels is not None:
+            return labels[values].tolist()
+        return values.tolist()
+
+
+class PokemonRecord(Mapping):
+    """Read-only dict-like view of one Pokédex row"""
+
+    __slots__ = ('columns', 'row_id')
+
+    def __init__(self, columns, row_id):
+        self.columns = columns
+        self.row_id = row_id
+
+    def __getitem__(self, column):
+        position = self.columns.positions.get(column)
+        if position is None:
+            raise KeyError(column)
+        return self.columns.value(position, self.row_id)
+
+    def __iter__(self):
+        return iter(self.columns.names)
+
+    def __len__(self):
+        return len(self.columns.names)
+
+    def to_dict(self):
+        """Materialize the row as a plain dict"""
+        return {column: self.columns.value(position, self.row_id)
+                for position, column in enumerate(self.columns.names)}
+
+    def __repr__(self):
+        return f"PokemonRecord({self.to_dict()!r})"
+
+
+class PokemonRecords(Sequence):
+    """Read-only list-like view of Pokédex rows that only stores their row ids"""
+
+    __slots__ = ('columns', 'row_ids')
+
+    def __init__(self, columns, row_ids):
+        self.columns = columns
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return PokemonRecords(self.columns, self.row_ids[item])
+        return PokemonRecord(self.columns, int(self.row_ids[item]))
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def __iter__(self):
+        for row_id in self.row_ids.tolist():
+            yield PokemonRecord(self.columns, row_id)
+
+    def to_dicts(self):
+        """Materialize every row as a plain dict, column by column"""
+        values = [self.columns.column_values(position, self.row_ids)
+                  for position in range(len(self.columns.names))]
+        return [dict(zip(self.columns.names, row)) for row in zip(*values)]
+
+    def to_frame(self):
+        """Return the rows as a DataFrame with the original dtypes"""
+        data = {}
+        for position, column in enumerate(self.columns.names):
+            values = self.columns.arrays[position][self.row_ids]
+            labels = self.columns.labels[position]
+            data[column] = values if labels is None else \
+                pd.Categorical.from_codes(values, labels[:-1])
+        return pd.DataFrame(data)
+
+    def __repr__(self):
+        return f"PokemonRecords({len(self)} rows)"
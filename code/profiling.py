@@ -0,0 +1,216 @@
+# profiling.py
+"""File for the hot-path profiler"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+
+class CallStats:
+    """Call count, total time, slowest call, rows and latency histogram of one hot path"""
+    __slots__ = ('calls', 'total', 'slowest', 'rows', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.rows = 0
+        self.histogram = [0] * len(BUCKETS_MS)
+
+
+class Profiler:
+    """Records timed calls into a fixed-size ring buffer and per-name statistics.
+
+    Recording a call costs a lock, a tuple and a few additions, so the hot
+    paths stay instrumented in normal use. profile_next() runs the next
+    outermost instrumented call under cProfile, for one interaction.
+    """
+
+    def __init__(self, capacity=4096, enabled=True):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.events = [None] * capacity
+        self.position = 0
+        self.stats = {}
+        self.started = time.time()
+        self._clock_offset = self.started - time.perf_counter()
+        self.last_profile = None
+        self._profile_request = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, name, elapsed, rows=None, start=None):
+        """Store one call that took elapsed seconds and handled rows rows"""
+        start = time.perf_counter() - elapsed if start is None else start
+        with self._lock:
+            self.events[self.position % self.capacity] = (name, start, elapsed, rows)
+            self.position += 1
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CallStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.slowest = max(stats.slowest, elapsed)
+            if rows is not None:
+                stats.rows += rows
+            stats.histogram[bisect_left(BUCKETS_MS, elapsed * 1000)] += 1
+
+    @contextmanager
+    def timed(self, name):
+        """Time the enclosed block; set .rows on the yielded object to record a row count"""
+        if not self.enabled:
+            yield _Timing()
+            return
+        timing = _Timing()
+        profile = self._enter()
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            elapsed = time.perf_counter() - start
+            self._exit(profile, name)
+            self.record(name, elapsed, timing.rows, start)
+
+    def profiled(self, name=None, rows=None):
+        """Decorator recording every call; rows(result) gives the row count, if any"""
+        def decorate(function):
+            label = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                profile = self._enter()
+                start = time.perf_counter()
+                try:
+                    result = function(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    self._exit(profile, label)
+                self.record(label, elapsed, None if rows is None else rows(result), start)
+                return result
+            return wrapper
+        return decorate
+
+    def profile_next(self, path=None, callback=None):
+        """Run the next outermost instrumented call under cProfile.
+
+        The sorted statistics are kept in last_profile, written to path as a
+        pstats file if given, and passed to callback(name, text) if given.
+        """
+        self._profile_request = (path, callback)
+
+    def _enter(self):
+        """Count the nesting depth, starting cProfile for an armed outermost call"""
+        local = self._local
+        depth = local.depth = getattr(local, 'depth', 0) + 1
+        if depth > 1 or self._profile_request is None:
+            return None
+        with self._lock:
+            request, self._profile_request = self._profile_request, None
+        if request is None:
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile, request
+
+    def _exit(self, profile, name):
+        self._local.depth -= 1
+        if profile is None:
+            return
+        profile, (path, callback) = profile
+        profile.disable()
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(25)
+        self.last_profile = f"{name}\n{text.getvalue()}"
+        if path:
+            profile.dump_stats(path)
+        if callback:
+            callback(name, self.last_profile)
+
+    def recent(self, limit=50):
+        """Return up to limit (name, timestamp, seconds, rows) events, newest first"""
+        with self._lock:
+            count = min(limit, self.position, self.capacity)
+            events = [self.events[(self.position - 1 - i) % self.capacity] for i in range(count)]
+        return [(name, start + self._clock_offset, elapsed, rows)
+                for name, start, elapsed, rows in events]
+
+    def summary(self):
+        """Return one dict per instrumented name, slowest total time first"""
+        with self._lock:
+            items = [(name, stats.calls, stats.total, stats.slowest, stats.rows,
+                      list(stats.histogram)) for name, stats in self.stats.items()]
+        rows = []
+        for name, calls, total, slowest, row_count, histogram in items:
+            rows.append({'name': name, 'calls': calls, 'total_ms': total * 1000,
+                         'mean_ms': total * 1000 / calls,
+                         'p90_ms': _percentile(histogram, 0.9, slowest * 1000),
+                         'max_ms': slowest * 1000, 'rows': row_count,
+                         'histogram': dict(zip(map(str, BUCKETS_MS), histogram))})
+        return sorted(rows, key=lambda row: -row['total_ms'])
+
+    def report(self, stream=None):
+        """Print the per-name statistics as a table"""
+        stream = stream or sys.stderr
+        rows = self.summary()
+        width = max([len(row['name']) for row in rows] + [4])
+        print(f"{'name':<{width}}  {'calls':>7}  {'mean ms':>9}  {'p90 ms':>8}  "
+              f"{'max ms':>9}  {'rows':>9}", file=stream)
+        for row in rows:
+            print(f"{row['name']:<{width}}  {row['calls']:>7}  {row['mean_ms']:>9.2f}  "
+                  f"{row['p90_ms']:>8.2f}  {row['max_ms']:>9.2f}  {row['rows']:>9}", file=stream)
+
+    def dump(self, path):
+        """Write the statistics, the recent calls and the last cProfile output as JSON"""
+        data = {'started': self.started, 'dumped': time.time(), 'summary': self.summary(),
+                'recent': [dict(zip(('name', 'time', 'seconds', 'rows'), event))
+                           for event in self.recent(self.capacity)],
+                'last_profile': self.last_profile}
+        with open(path, 'w', encoding='utf-8') as target:
+            json.dump(data, target, indent=2)
+
+    def reset(self):
+        """Forget every recorded call"""
+        with self._lock:
+            self.events = [None] * self.capacity
+            self.position = 0
+            self.stats = {}
+
+
+class _Timing:
+    """Mutable holder for the row count of a timed block"""
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = None
+
+
+def row_count(result):
+    """Return len(result) for sized results, else None; the usual rows= argument"""
+    return len(result) if hasattr(result, '__len__') else None
+
+
+def _percentile(histogram, fraction, slowest_ms):
+    """Return the upper bound of the histogram bucket holding the given fraction of calls,
+    capped at the slowest call so the open last bucket never reports infinity"""
+    target = fraction * sum(histogram)
+    seen = 0
+    for bound, count in zip(BUCKETS_MS, histogram):
+        seen += count
+        if count and seen >= target:
+            return min(bound, slowest_ms)
+    return 0
+
+
+profiler = Profiler()
+profiled = profiler.profiled
@@ -0,0 +1,400 @@
+# shared_pokedex.py
+"""File for SharedPokedex class"""
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+from name_search import NameSearchEngine
+from pokedex_index import PokedexIndex, SORT_OPTIONS
+from pokedex_partitions import PokedexPartitions
+from pokemon_records import PokedexColumns
+from stats_cube import StatsCube
+
+# Every array starts on a cache line boundary of the segment.
+ALIGNMENT = 64
+# Segments closed while views of them were still in use.
+_MAPPED_SEGMENTS = []
+
+
+def encode_strings(values):
+    """Return (UTF-8 bytes as uint8, offset where each string starts, plus the end)"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def string_order(values):
+    """Return the positions of values sorted by their UTF-8 bytes, ties by position"""
+    if not len(values):
+        return np.zeros(0, dtype=np.int64)
+    return np.argsort(np.array([value.encode('utf-8') for value in values], dtype=bytes),
+                      kind='stable')
+
+
+class StringTable(Sequence):
+    """Read-only list of strings kept as one UTF-8 buffer and their offsets.
+
+    Indexing with a position returns a str; indexing with a slice, a mask or
+    an array of positions returns an object array, like a NumPy array would.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def encoded(self, position):
+        """Return the UTF-8 bytes of one string"""
+        return self.data[self.offsets[position]:self.offsets[position + 1]].tobytes()
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            if not -len(self) <= item < len(self):
+                raise IndexError(item)
+            return self.encoded(item % len(self)).decode('utf-8')
+        positions = np.arange(len(self))[item] if isinstance(item, slice) else np.asarray(item)
+        if positions.dtype == bool:
+            positions = np.flatnonzero(positions)
+        positions = positions.astype(np.int64, copy=False)
+        positions = np.where(positions < 0, positions + len(self), positions)
+        if ((positions < 0) | (positions >= len(self))).any():
+            raise IndexError(item)
+        data = self.data.data
+        values = np.empty(len(positions), dtype=object)
+        values[:] = [str(data[start:end], 'utf-8') for start, end
+                     in zip(self.offsets[positions].tolist(), self.offsets[positions + 1].tolist())]
+        return values
+
+    def tolist(self):
+        """Return every string as a list"""
+        return self[:].tolist()
+
+
+class StringLookup:
+    """Read-only dict-like map from the strings of a StringTable to their positions.
+
+    Keys are found by binary search in a sorted order of the table instead
+    of hashing every string into a dict. A repeated string maps to its last
+    position, as a dict filled in order would.
+    """
+
+    def __init__(self, table, order):
+        self.table = table
+        self.order = order
+
+    def _find(self, key):
+        """Return the table position of key, or -1"""
+        if not isinstance(key, str):
+            return -1
+        key = key.encode('utf-8')
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.table.encoded(self.order[middle]) <= key:
+                low = middle + 1
+            else:
+                high = middle
+        if low and self.table.encoded(self.order[low - 1]) == key:
+            return int(self.order[low - 1])
+        return -1
+
+    def _value(self, position):
+        return position
+
+    def get(self, key, default=None):
+        """Return the value of key, or default"""
+        position = self._find(key)
+        return default if position < 0 else self._value(position)
+
+    def __getitem__(self, key):
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        return self._value(position)
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+
+class SharedPostings(StringLookup):
+    """Read-only map from name n-grams to the row ids of the names containing them"""
+
+    def __init__(self, grams, order, ids, offsets):
+        super().__init__(grams, order)
+        self.ids = ids
+        self.offsets = offsets
+
+    def _value(self, position):
+        return self.ids[self.offsets[position]:self.offsets[position + 1]]
+
+
+class SharedNameSearch(NameSearchEngine):
+    """NameSearchEngine over lower-case names and postings held in shared memory"""
+
+    def __init__(self, names, postings, cache_size=32):  # pylint: disable=super-init-not-called
+        self.names = names
+        self.size = len(names)
+        self.postings = postings
+        self.cache_size = cache_size
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+
+class SharedPartitions(PokedexPartitions):
+    """PokedexPartitions whose row ids and offsets are held in shared memory"""
+
+    def __init__(self, keys, row_ids, offsets):  # pylint: disable=super-init-not-called
+        self.keys = [tuple(key) for key in keys]
+        self.row_ids = row_ids
+        self.offsets = offsets
+        self.size = int(offsets[-1])
+
+
+class SharedColumns(PokedexColumns):
+    """PokedexColumns whose arrays are views of shared memory"""
+
+    def __init__(self, names, arrays, labels, size):  # pylint: disable=super-init-not-called
+        self.names = list(names)
+        self.positions = {column: position for position, column in enumerate(self.names)}
+        self.arrays = arrays
+        self.labels = labels
+        self.size = size
+
+
+class SharedPokedexIndex(PokedexIndex):
+    """PokedexIndex whose bitmaps, stat orders and preset sorts are held in shared memory.
+
+    Custom sorts are still built and cached by each process, from a frame of
+    only the columns they use.
+    """
+
+    def __init__(self, shared, max_custom_sorts=16):  # pylint: disable=super-init-not-called
+        layout = shared.descriptor
+        self.shared = shared
+        self.size = shared.size
+        self.name_search = SharedNameSearch(
+            StringTable(shared.array('search names'), shared.array('search names offsets')),
+            SharedPostings(StringTable(shared.array('grams'), shared.array('grams offsets')),
+                           shared.array('grams order'), shared.array('postings'),
+                           shared.array('postings offsets')))
+        self.type_bitmaps = {type_name: shared.array(f'type {type_name}')
+                             for type_name in layout['types']}
+        self.type_codes = shared.array('type codes')
+        self.partitions = SharedPartitions(layout['partitions'],
+                                           shared.array('partition rows'),
+                                           shared.array('partition offsets'))
+        self.stat_columns = {stat: shared.array(f'column {stat}') for stat in layout['stats']}
+        self.stat_orders = {stat: shared.array(f'order {stat}') for stat in layout['stats']}
+        self.stat_values = {stat: shared.array(f'sorted {stat}') for stat in layout['stats']}
+        self.max_custom_sorts = max_custom_sorts
+        self._sort_lock = threading.Lock()
+        self.custom_sorts = OrderedDict()
+        self.preset_sorts = {SORT_OPTIONS[option]: shared.array(f'sort {option}')
+                             for option in layout['sorts']}
+
+    def _build_sort(self, key):
+        """Compute the stable row permutation for a normalized sort key"""
+        columns = [column for column, _ in key]
+        frame = self.shared.frame(columns)
+        ordered = frame.sort_values(by=columns, ascending=[ascending for _, ascending in key],
+                                    kind='stable', na_position='last')
+        return ordered.index.to_numpy()
+
+
+def _open_segment(name):
+    """Attach to an existing segment without letting this process's resource
+    tracker unlink it at exit: it belongs to the process that created it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    segment = shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching always registers the segment, so take it back. A
+    # worker sharing its parent's tracker drops the owner's entry with it,
+    # which _unlink_segment restores before the owner unlinks.
+    resource_tracker.unregister(segment._name, 'shared_memory')  # pylint: disable=protected-access
+    return segment
+
+
+def _unlink_segment(segment):
+    """Remove a segment this process created"""
+    if sys.version_info < (3, 13):
+        # pylint: disable=protected-access
+        resource_tracker.register(segment._name, 'shared_memory')
+    segment.unlink()
+
+
+def _close_segment(segment):
+    """Unmap a segment, or keep it mapped while views of it are still in use"""
+    try:
+        segment.close()
+    except BufferError:
+        # A caller still holds an array or frame: the mapping lives as long
+        # as the process rather than pulling memory from under it.
+        _MAPPED_SEGMENTS.append(segment)
+
+
+class SharedPokedex:
+    """A loaded Pokédex and its indexes, laid out in one shared memory segment.
+
+    share_pokedex() copies the columns (categorical columns as codes, strings
+    as one UTF-8 buffer with offsets), the name search postings, type
+    bitmaps and codes, stat orders, preset sorts, partitions and stats cube
+    into a new segment. Other processes pass its small picklable descriptor
+    to SharedPokedex to attach: every array is then a read-only view of the
+    segment, so attaching copies nothing.
+    """
+
+    def __init__(self, descriptor, segment=None):
+        self.descriptor = descriptor
+        self.owner = segment is not None
+        self.segment = segment if segment is not None else _open_segment(descriptor['segment'])
+        self.buffer = self.segment.buf
+        # Unmap through _close_segment even when close() is never called.
+        self._release = weakref.finalize(self, _close_segment, self.segment)
+        self.size = descriptor['rows']
+        self.arrays = {}
+        self.names = self.strings('Name')
+        self.name_ids = StringLookup(self.names, self.array('name order'))
+        self.columns = SharedColumns(
+            [column for column, _, _ in descriptor['columns']],
+            [self.strings(column) if kind == 'string' else self.array(f'column {column}')
+             for column, kind, _ in descriptor['columns']],
+            [None if labels is None else np.append(np.array(labels, dtype=object), np.nan)
+             for _, _, labels in descriptor['columns']],
+            self.size)
+        self.index = SharedPokedexIndex(self)
+        self.stats_cube = self._attach_stats_cube()
+
+    def array(self, key):
+        """Return the read-only view of one shared array"""
+        view = self.arrays.get(key)
+        if view is None:
+            dtype, shape, offset = self.descriptor['arrays'][key]
+            view = np.frombuffer(self.buffer, dtype=dtype, count=int(np.prod(shape)),
+                                 offset=offset).reshape(shape)
+            view.flags.writeable = False
+            self.arrays[key] = view
+        return view
+
+    def strings(self, column):
+        """Return a string column as a StringTable"""
+        return StringTable(self.array(f'column {column}'),
+                           self.array(f'column {column} offsets'))
+
+    def _attach_stats_cube(self):
+        stats_cube = StatsCube()
+        stats_cube.cell_keys = [tuple(key) for key in self.descriptor['cells']]
+        stats_cube.cell_ids = {key: cell for cell, key in enumerate(stats_cube.cell_keys)}
+        stats_cube.counts = self.array('cube counts')
+        stats_cube.sums = self.array('cube sums')
+        stats_cube.cross = self.array('cube cross')
+        stats_cube.histogram = self.array('cube histogram')
+        return stats_cube
+
+    def frame(self, columns=None):
+        """Return a DataFrame of some columns (all by default) in Pokédex order.
+
+        Numeric and categorical columns wrap the shared arrays without
+        copying; only string columns are decoded into Python strings.
+        """
+        data = {}
+        for column, kind, labels in self.descriptor['columns']:
+            if columns is not None and column not in columns:
+                continue
+            if kind == 'string':
+                data[column] = self.strings(column)[:]
+            elif kind == 'category':
+                data[column] = pd.Categorical.from_codes(self.array(f'column {column}'), labels)
+            else:
+                data[column] = self.array(f'column {column}')
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        """Drop this Pokédex's views of the segment and unmap it; the owner also
+        removes it. Arrays a caller still holds keep the mapping alive."""
+        self.arrays.clear()
+        self.names = self.name_ids = self.columns = self.index = self.stats_cube = None
+        self.buffer = None
+        self._release()
+        if self.owner:
+            self.owner = False
+            _unlink_segment(self.segment)
+
+
+def share_pokedex(pokemon_df, index, stats_cube):
+    """Copy a loaded Pokédex and its index and stats cube into a new shared memory
+    segment and return the owning SharedPokedex"""
+    arrays = {}
+    columns = []
+    for column in pokemon_df.columns:
+        series = pokemon_df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns.append((column, 'category', series.cat.categories.tolist()))
+            arrays[f'column {column}'] = series.cat.codes.to_numpy()
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            columns.append((column, 'values', None))
+            arrays[f'column {column}'] = series.to_numpy()
+        else:
+            columns.append((column, 'string', None))
+            values = series.fillna('').astype(str).tolist()
+            arrays[f'column {column}'], arrays[f'column {column} offsets'] = \
+                encode_strings(values)
+            if column == 'Name':
+                arrays['name order'] = string_order(values)
+
+    search = index.name_search
+    arrays['search names'], arrays['search names offsets'] = encode_strings(search.names)
+    grams = sorted(search.postings, key=lambda gram: gram.encode('utf-8'))
+    arrays['grams'], arrays['grams offsets'] = encode_strings(grams)
+    arrays['grams order'] = np.arange(len(grams), dtype=np.int64)
+    postings = [search.postings[gram] for gram in grams]
+    arrays['postings'] = np.concatenate(postings) if postings else np.zeros(0, dtype=np.int64)
+    arrays['postings offsets'] = np.concatenate(
+        [[0], np.cumsum([len(ids) for ids in postings], dtype=np.int64)])
+
+    for type_name, bitmap in index.type_bitmaps.items():
+        arrays[f'type {type_name}'] = bitmap
+    arrays['type codes'] = index.type_codes
+    arrays['partition rows'] = index.partitions.row_ids
+    arrays['partition offsets'] = index.partitions.offsets
+    for stat in index.stat_orders:
+        arrays[f'order {stat}'] = index.stat_orders[stat]
+        arrays[f'sorted {stat}'] = index.stat_values[stat]
+    sorts = [option for option, key in SORT_OPTIONS.items() if key in index.preset_sorts]
+    for option in sorts:
+        arrays[f'sort {option}'] = index.preset_sorts[SORT_OPTIONS[option]]
+    arrays['cube counts'] = stats_cube.counts
+    arrays['cube sums'] = stats_cube.sums
+    arrays['cube cross'] = stats_cube.cross
+    arrays['cube histogram'] = stats_cube.histogram
+
+    layout = {}
+    size = 0
+    for key, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        arrays[key] = values
+        layout[key] = (values.dtype.str, values.shape, size)
+        size += -(-max(values.nbytes, 1) // ALIGNMENT) * ALIGNMENT
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for key, values in arrays.items():
+        dtype, shape, offset = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset)[...] = values
+
+    descriptor = {
+        'segment': segment.name,
+        'rows': len(pokemon_df),
+        'arrays': layout,
+        'columns': columns,
+        'types': list(index.type_bitmaps),
+        'stats': list(index.stat_orders),
+        'sorts': sorts,
+        'partitions': index.partitions.keys,
+        'cells': list(stats_cube.cell_keys),
+    }
+    return SharedPokedex(descriptor, segment)
@@ -0,0 +1,77 @@
+# skyline.py
+"""File for the Pareto frontier (skyline) computation"""
+from collections import OrderedDict
+import numpy as np
+
+
+def _distinct_rows(values):
+    """Return (distinct rows, index of each row's distinct row).
+
+    Integer columns with small ranges, such as base stats, are packed into
+    one int64 key per row, which np.unique sorts far faster than whole rows.
+    """
+    if np.issubdtype(values.dtype, np.integer):
+        low = values.min(axis=0).astype(np.int64)
+        spans = values.max(axis=0).astype(np.int64) - low + 1
+        if np.prod(spans.astype(float)) < 2 ** 62:
+            multipliers = np.cumprod(np.concatenate([[1], spans[:-1]]))
+            keys = (values - low) @ multipliers
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            return values[first], inverse
+    distinct, inverse = np.unique(values, axis=0, return_inverse=True)
+    return distinct, inverse.ravel()
+
+
+def pareto_front(values):
+    """Return the indices of the rows of an (n, k) array not dominated by any other row
+    (another row at least as high everywhere and higher somewhere), maximizing every column.
+
+    Sort-filter-skyline: identical rows are collapsed, and the distinct rows
+    are sorted by decreasing sum. The first remaining row is then always on
+    the frontier, because a row dominating it would have a larger sum, so it
+    is taken and every remaining row it dominates is dropped in one
+    vectorized step. Strong rows come first and discard most of the data
+    early, so the work is about (frontier size x surviving rows) instead of
+    the n² pairs of a pairwise loop.
+    """
+    values = np.asarray(values)
+    if values.ndim != 2 or not len(values):
+        return np.zeros(0, dtype=np.int64)
+    distinct, inverse = _distinct_rows(values)
+    order = np.argsort(-distinct.sum(axis=1, dtype=np.float64), kind='stable')
+    remaining = distinct[order]
+    kept = []
+    while len(remaining):
+        best = remaining[0]
+        kept.append(order[0])
+        survivors = (remaining > best).any(axis=1)
+        remaining, order = remaining[survivors], order[survivors]
+    on_front = np.zeros(len(distinct), dtype=bool)
+    on_front[kept] = True
+    return np.flatnonzero(on_front[inverse])
+
+
+class SkylineCache:
+    """LRU cache of Pareto frontiers keyed by (stats, filters)"""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Return the cached frontier row ids of key, or None"""
+        front = self.entries.get(key)
+        if front is not None:
+            self.entries.move_to_end(key)
+        return front
+
+    def store(self, key, front):
+        """Keep the frontier row ids of key, evicting the least recently used"""
+        self.entries[key] = front
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every frontier"""
+        self.entries.clear()
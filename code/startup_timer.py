@@ -0,0 +1,40 @@
+# startup_timer.py
+"""File for StartupTimer class"""
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Collects the wall time spent in each startup phase"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.last_mark = self.started
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, end - start))
+            self.last_mark = end
+
+    def mark(self, name):
+        """Record the time since the previous phase or mark as one phase"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last_mark))
+        self.last_mark = now
+
+    def report(self, stream=None):
+        """Print every phase with its share of the time since start"""
+        stream = stream or sys.stderr
+        total = time.perf_counter() - self.started
+        width = max([len(name) for name, _ in self.phases] + [5])
+        for name, elapsed in self.phases:
+            print(f"{name:<{width}}  {elapsed * 1000:8.1f} ms  {elapsed / total:6.1%}", file=stream)
+        print(f"{'total':<{width}}  {total * 1000:8.1f} ms", file=stream)
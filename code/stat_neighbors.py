@@ -0,0 +1,94 @@
+# stat_neighbors.py
+"""File for StatNeighbors class"""
+import numpy as np
+
+STATS = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+
+
+class StatNeighbors:
+    """Nearest neighbours of Pokémon in z-scored base stat space.
+
+    Distances are computed for many queries at once as |q|² + |x|² - 2 q·x
+    over blocks of chunk_size rows, and only the k best of each block are
+    kept with argpartition, so memory stays at (queries x chunk_size).
+
+    With type_weight w, every type that only one of the two Pokémon has adds
+    w² / 2 to the squared distance: two single-type Pokémon of different
+    types end up as far apart as if they differed by w standard deviations
+    in one stat.
+    """
+
+    def __init__(self, pokemon_df, type_codes, chunk_size=65536):
+        stats = pokemon_df[STATS].to_numpy(dtype=np.float64)
+        spread = stats.std(axis=0) if len(stats) else np.ones(len(STATS))
+        spread[spread == 0] = 1
+        self.features = ((stats - stats.mean(axis=0)) / spread).astype(np.float32)
+        self.norms = np.einsum('ij,ij->i', self.features, self.features)
+        self.type_codes = np.asarray(type_codes)
+        self.type_counts = (self.type_codes >= 0).sum(axis=1).astype(np.float32)
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return len(self.features)
+
+    def _shared_types(self, queries, rows):
+        """Return the (queries, rows) number of types each query shares with each row"""
+        query_codes = self.type_codes[queries]
+        row_codes = self.type_codes[rows]
+        shared = np.zeros((len(queries), len(rows)), dtype=np.float32)
+        for query_slot in range(2):
+            code = query_codes[:, query_slot, None]
+            for row_slot in range(2):
+                shared += (row_codes[None, :, row_slot] == code) & (code >= 0)
+        return shared
+
+    def distances(self, queries, rows, type_weight=0.0):
+        """Return the (queries, rows) squared distances between two sets of row ids"""
+        queries = np.asarray(queries, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        squared = (self.norms[queries, None] + self.norms[None, rows]
+                   - 2 * self.features[queries] @ self.features[rows].T)
+        np.maximum(squared, 0, out=squared)
+        if type_weight:
+            different = (self.type_counts[queries, None] + self.type_counts[None, rows]
+                         - 2 * self._shared_types(queries, rows))
+            squared += type_weight ** 2 / 2 * different
+        return squared
+
+    def nearest(self, queries, k=10, type_weight=0.0, candidates=None, exclude=()):
+        """Return (row ids, distances) of the k nearest candidates of every query.
+
+        Both results have one row per query, sorted from nearest; a query
+        never matches itself or anything in exclude. Missing neighbours,
+        when fewer than k candidates remain, have id -1 and distance inf.
+        """
+        queries = np.atleast_1d(np.asarray(queries, dtype=np.int64))
+        pool = np.arange(len(self)) if candidates is None else \
+            np.asarray(candidates, dtype=np.int64)
+        excluded = np.asarray(list(exclude), dtype=np.int64)
+        best_ids = np.full((len(queries), 0), -1, dtype=np.int64)
+        best = np.zeros((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, len(pool), self.chunk_size):
+            rows = pool[start:start + self.chunk_size]
+            squared = self.distances(queries, rows, type_weight)
+            squared[rows[None, :] == queries[:, None]] = np.inf
+            if len(excluded):
+                squared[:, np.isin(rows, excluded)] = np.inf
+            ids = np.broadcast_to(rows, squared.shape)
+            best_ids = np.concatenate([best_ids, ids], axis=1)
+            best = np.concatenate([best, squared], axis=1)
+            if best.shape[1] > k:
+                keep = np.argpartition(best, k - 1, axis=1)[:, :k]
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+                best = np.take_along_axis(best, keep, axis=1)
+
+        order = np.argsort(best, axis=1, kind='stable')
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        best = np.sqrt(np.take_along_axis(best, order, axis=1))
+        best_ids[np.isinf(best)] = -1
+        if best.shape[1] < k:
+            padding = k - best.shape[1]
+            best_ids = np.pad(best_ids, ((0, 0), (0, padding)), constant_values=-1)
+            best = np.pad(best, ((0, 0), (0, padding)), constant_values=np.inf)
+        return best_ids, best
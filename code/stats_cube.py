@@ -0,0 +1,144 @@
+# stats_cube.py
+"""File for StatsCube class"""
+import numpy as np
+import pandas as pd
+
+STATS = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+HISTOGRAM_STAT = 'HP'
+
+
+class StatsCube:
+    """Partial aggregates of the six base stats per (Type 1, Generation, Legendary) cell.
+
+    Every cell stores its row count, stat sums, stat cross-products (whose
+    diagonal holds the sums of squares) and a one-point-per-value HP
+    histogram. Any combination of types, generations and legendary flag is
+    answered by adding up cells, and new rows only update their own cells.
+    """
+
+    def __init__(self, pokemon_df=None):
+        self.cell_keys = []
+        self.cell_ids = {}
+        self.counts = np.zeros(0)
+        self.sums = np.zeros((0, len(STATS)))
+        self.cross = np.zeros((0, len(STATS), len(STATS)))
+        self.histogram = np.zeros((0, 256))
+        if pokemon_df is not None:
+            self.add_rows(pokemon_df)
+
+    def add_rows(self, pokemon_df):
+        """Fold new rows into the partial aggregates"""
+        if pokemon_df.empty:
+            return
+        keys = zip(pokemon_df['Type 1'].astype(object),
+                   pokemon_df['Generation'].astype(int),
+                   pokemon_df['Legendary'].astype(bool))
+        cells = np.array([self._cell(key) for key in keys], dtype=np.int64)
+        self._grow(len(self.cell_keys), int(pokemon_df[HISTOGRAM_STAT].max()) + 1)
+
+        size = len(self.cell_keys)
+        values = pokemon_df[STATS].to_numpy(dtype=float)
+        self.counts += np.bincount(cells, minlength=size)
+        for i in range(len(STATS)):
+            self.sums[:, i] += np.bincount(cells, weights=values[:, i], minlength=size)
+            for j in range(i, len(STATS)):
+                products = np.bincount(cells, weights=values[:, i] * values[:, j],
+                                       minlength=size)
+                self.cross[:, i, j] += products
+                if i != j:
+                    self.cross[:, j, i] += products
+        width = self.histogram.shape[1]
+        hp = pokemon_df[HISTOGRAM_STAT].to_numpy(dtype=np.int64).clip(0)
+        self.histogram += np.bincount(cells * width + hp,
+                                      minlength=size * width).reshape(size, width)
+
+    def _cell(self, key):
+        cell = self.cell_ids.get(key)
+        if cell is None:
+            cell = self.cell_ids[key] = len(self.cell_keys)
+            self.cell_keys.append(key)
+        return cell
+
+    def _grow(self, cells, width):
+        """Extend the aggregate arrays to hold new cells and larger HP values"""
+        extra = cells - len(self.counts)
+        width = max(width, self.histogram.shape[1])
+        self.counts = np.concatenate([self.counts, np.zeros(extra)])
+        self.sums = np.concatenate([self.sums, np.zeros((extra, len(STATS)))])
+        self.cross = np.concatenate([self.cross, np.zeros((extra, len(STATS), len(STATS)))])
+        self.histogram = np.pad(self.histogram,
+                                ((0, extra), (0, width - self.histogram.shape[1])))
+
+    def select(self, types=None, generations=None, legendary=None):
+        """Return the mask of cells matching the filters (None means any)"""
+        types = None if types is None else set(types)
+        generations = None if generations is None else set(generations)
+        return np.array([(types is None or type1 in types)
+                         and (generations is None or generation in generations)
+                         and (legendary is None or is_legendary == legendary)
+                         for type1, generation, is_legendary in self.cell_keys], dtype=bool)
+
+    def count(self, **filters):
+        """Return the number of rows matching the filters"""
+        return int(self.counts[self.select(**filters)].sum())
+
+    def means_by_type(self, attribute, **filters):
+        """Return a DataFrame with the mean of a stat for every Type 1"""
+        mask = self.select(**filters)
+        stat = STATS.index(attribute)
+        totals = {}
+        for cell in np.flatnonzero(mask):
+            count, total = totals.get(self.cell_keys[cell][0], (0, 0))
+            totals[self.cell_keys[cell][0]] = (count + self.counts[cell],
+                                               total + self.sums[cell, stat])
+        rows = [(type1, total / count) for type1, (count, total) in sorted(totals.items())
+                if count]
+        return pd.DataFrame(rows, columns=['Type 1', attribute])
+
+    def correlation(self, **filters):
+        """Return the 6x6 Pearson correlation matrix of the base stats"""
+        mask = self.select(**filters)
+        count = self.counts[mask].sum()
+        if not count:
+            return pd.DataFrame(np.nan, index=STATS, columns=STATS)
+        mean = self.sums[mask].sum(axis=0) / count
+        covariance = self.cross[mask].sum(axis=0) / count - np.outer(mean, mean)
+        deviation = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = covariance / np.outer(deviation, deviation)
+        return pd.DataFrame(corr, index=STATS, columns=STATS)
+
+    def hp_histogram(self, bins=30, **filters):
+        """Return (counts, edges) of HP over the observed range, like numpy.histogram"""
+        values = self.histogram[self.select(**filters)].sum(axis=0)
+        present = np.flatnonzero(values)
+        if not len(present):
+            return np.zeros(bins), np.linspace(0, 1, bins + 1)
+        low, high = present[0], present[-1]
+        edges = np.linspace(low, high, bins + 1) if high > low else \
+            np.linspace(low - 0.5, high + 0.5, bins + 1)
+        points = np.arange(low, high + 1)
+        positions = np.searchsorted(edges, points, side='right') - 1
+        counts = np.bincount(positions.clip(0, bins - 1), weights=values[low:high + 1],
+                             minlength=bins)
+        return counts, edges
+
+    def hp_density(self, points=200, **filters):
+        """Return (x, density) of a Gaussian KDE of HP computed from the histogram cells.
+
+        Uses Scott's bandwidth like seaborn, with density scaled to counts per HP unit.
+        """
+        values = self.histogram[self.select(**filters)].sum(axis=0)
+        count = values.sum()
+        present = np.flatnonzero(values)
+        if count < 2:
+            return np.zeros(0), np.zeros(0)
+        mean = (present * values[present]).sum() / count
+        variance = (values[present] * (present - mean) ** 2).sum() / (count - 1)
+        bandwidth = np.sqrt(variance) * count ** (-1 / 5)
+        grid = np.linspace(present[0], present[-1], points)
+        if not bandwidth:
+            return grid, np.zeros(points)
+        offsets = (grid[:, None] - present[None, :]) / bandwidth
+        kernel = np.exp(-0.5 * offsets ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+        return grid, kernel @ values[present]
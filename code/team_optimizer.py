@@ -0,0 +1,243 @@
+# team_optimizer.py
+"""File for TeamOptimizer class"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from type_chart import TYPES, defensive_multipliers, offensive_multipliers
+
+STAT_WEIGHT = 1.0
+COVERAGE_WEIGHT = 0.5
+RESIST_WEIGHT = 0.5
+WEAKNESS_WEIGHT = 0.75
+GOAL_PENALTY = 2.0
+
+_worker_arrays = None
+
+
+class TeamConstraints:
+    """Constraints the optimizer must respect when building a team"""
+
+    def __init__(self, locked=(), exclude_legendary=False, generations=None,
+                 min_stats=None, coverage_goal=0, team_size=6):
+        self.locked = tuple(locked)
+        self.exclude_legendary = exclude_legendary
+        self.generations = None if generations is None else set(generations)
+        self.min_stats = dict(min_stats or {})
+        self.coverage_goal = coverage_goal
+        self.team_size = team_size
+
+
+class TeamSuggestion:
+    """Best team found by the optimizer"""
+
+    def __init__(self, members, score, cancelled=False):
+        self.members = tuple(members)
+        self.score = score
+        self.cancelled = cancelled
+
+    def __repr__(self):
+        return f"TeamSuggestion({self.members!r}, {self.score:.3f}, cancelled={self.cancelled})"
+
+
+def score_teams(arrays, teams):
+    """Score a (B, k) batch of row-id teams in one vectorized pass.
+
+    The score rewards high base stat totals, the share of types the team hits
+    super effectively and the share of attacking types someone resists, and
+    penalizes types that threaten half of the team or more.
+    """
+    stats, super_effective, resists, weak, team_size, coverage_goal = arrays
+    teams = np.asarray(teams)
+    covered = super_effective[teams].any(axis=1).sum(axis=1)
+    resisted = resists[teams].any(axis=1).sum(axis=1)
+    threatened = (weak[teams].sum(axis=1) * 2 >= team_size).sum(axis=1)
+    score = (STAT_WEIGHT * stats[teams].sum(axis=1) / team_size
+             + COVERAGE_WEIGHT * covered / len(TYPES)
+             + RESIST_WEIGHT * resisted / len(TYPES)
+             - WEAKNESS_WEIGHT * threatened / len(TYPES))
+    if coverage_goal and teams.shape[1] == team_size:
+        score -= GOAL_PENALTY * np.maximum(0, coverage_goal - covered) / len(TYPES)
+    return score
+
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _score_chunk(teams):
+    return score_teams(_worker_arrays, teams)
+
+
+class TeamOptimizer:
+    """Beam search with branch-and-bound pruning and local search over team members.
+
+    Candidate teams are scored in batches, spread over a ProcessPoolExecutor
+    when they are numerous enough to pay for the transfer. Given the
+    Pokédex's PokedexPartitions, generation and legendary constraints skip
+    whole partitions instead of testing every row.
+    """
+
+    def __init__(self, pokemon_df, type_codes, beam_width=64, pool_size=150,
+                 workers=None, chunk_size=4096, partitions=None):
+        self.pokemon_df = pokemon_df
+        self.partitions = partitions
+        self.beam_width = beam_width
+        self.pool_size = pool_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_size = chunk_size
+        total = pokemon_df['Total'].to_numpy(dtype=float)
+        self.stats = total / total.max() if len(total) and total.max() > 0 else total
+        self.super_effective = offensive_multipliers(type_codes) > 1
+        defensive = defensive_multipliers(type_codes)
+        self.resists = defensive < 1
+        self.weak = defensive > 1
+        self.cancelled = False
+
+    def cancel(self):
+        """Ask a running optimize() call to stop and return its best team so far"""
+        self.cancelled = True
+
+    def candidate_pool(self, constraints):
+        """Return row ids allowed by the constraints, pruned to the strongest and most varied"""
+        frame = self.pokemon_df
+        if self.partitions is not None:
+            legendary = False if constraints.exclude_legendary else None
+            candidates = self.partitions.rows(constraints.generations, legendary)
+        else:
+            allowed = np.ones(len(frame), dtype=bool)
+            if constraints.exclude_legendary and 'Legendary' in frame.columns:
+                allowed &= ~frame['Legendary'].to_numpy(dtype=bool)
+            if constraints.generations is not None and 'Generation' in frame.columns:
+                allowed &= frame['Generation'].isin(constraints.generations).to_numpy()
+            candidates = np.flatnonzero(allowed)
+        for stat, minimum in constraints.min_stats.items():
+            candidates = candidates[frame[stat].to_numpy()[candidates] >= minimum]
+        candidates = candidates[~np.isin(candidates, list(constraints.locked))]
+        if len(candidates) <= self.pool_size:
+            return candidates
+        by_stats = candidates[np.argsort(-self.stats[candidates], kind='stable')]
+        pool = list(by_stats[:self.pool_size // 2])
+        per_type = max(1, self.pool_size // (2 * len(TYPES)))
+        for code in range(len(TYPES)):
+            strongest = by_stats[self.super_effective[by_stats, code]][:per_type]
+            pool.extend(strongest)
+        return np.unique(np.array(pool, dtype=np.int64))
+
+    def optimize(self, constraints=None, progress=None):
+        """Search for the highest-scoring team; progress(fraction) is called as it goes"""
+        constraints = constraints or TeamConstraints()
+        self.cancelled = False
+        arrays = (self.stats, self.super_effective, self.resists, self.weak,
+                  constraints.team_size, constraints.coverage_goal)
+        pool = self.candidate_pool(constraints)
+        locked = list(constraints.locked)[:constraints.team_size]
+        open_slots = min(constraints.team_size - len(locked), len(pool))
+        if open_slots <= 0:
+            team = np.array([locked], dtype=np.int64)
+            return TeamSuggestion(locked, float(score_teams(arrays, team)[0]))
+
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                           initargs=(arrays,))
+        try:
+            best, best_score = self._greedy(arrays, locked, pool, open_slots, executor)
+            beams = np.array([locked], dtype=np.int64).reshape(1, len(locked))
+            for step in range(open_slots):
+                if self.cancelled:
+                    return TeamSuggestion(best, best_score, cancelled=True)
+                beams = self._expand(arrays, beams, pool, open_slots - step - 1,
+                                     best_score, executor)
+                if progress:
+                    progress((step + 1) / (open_slots + 1))
+                if not len(beams):
+                    break
+            if len(beams):
+                final_scores = self._score(arrays, beams, executor)
+                top = int(np.argmax(final_scores))
+                if final_scores[top] > best_score:
+                    best, best_score = beams[top].tolist(), float(final_scores[top])
+            best, best_score = self._local_search(arrays, best, best_score, locked,
+                                                  pool, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        if progress:
+            progress(1.0)
+        return TeamSuggestion(best, best_score, cancelled=self.cancelled)
+
+    def _score(self, arrays, teams, executor):
+        """Score a batch of teams, in worker processes when the batch is large"""
+        if executor is None or len(teams) <= self.chunk_size:
+            return score_teams(arrays, teams)
+        chunks = [teams[start:start + self.chunk_size]
+                  for start in range(0, len(teams), self.chunk_size)]
+        return np.concatenate(list(executor.map(_score_chunk, chunks)))
+
+    def _greedy(self, arrays, locked, pool, open_slots, executor):
+        """Build a first complete team one best member at a time, as the incumbent"""
+        team = list(locked)
+        for _ in range(open_slots):
+            options = pool[~np.isin(pool, team)]
+            teams = np.hstack([np.tile(team, (len(options), 1)).astype(np.int64),
+                               options[:, None]])
+            team = teams[int(np.argmax(self._score(arrays, teams, executor)))].tolist()
+        return team, float(self._score(arrays, np.array([team]), executor)[0])
+
+    def _upper_bound(self, arrays, teams, remaining):
+        """Optimistic score of any completion of partial teams with remaining slots"""
+        stats, super_effective, resists, weak, team_size, _ = arrays
+        best_stat = stats.max() if len(stats) else 0
+        covered = super_effective[teams].any(axis=1).sum(axis=1)
+        resisted = resists[teams].any(axis=1).sum(axis=1)
+        most_covered = super_effective.sum(axis=1).max()
+        most_resisted = resists.sum(axis=1).max()
+        threatened = (weak[teams].sum(axis=1) * 2 >= team_size).sum(axis=1)
+        return (STAT_WEIGHT * (stats[teams].sum(axis=1) + remaining * best_stat) / team_size
+                + COVERAGE_WEIGHT * np.minimum(len(TYPES), covered + remaining * most_covered)
+                / len(TYPES)
+                + RESIST_WEIGHT * np.minimum(len(TYPES), resisted + remaining * most_resisted)
+                / len(TYPES)
+                - WEAKNESS_WEIGHT * threatened / len(TYPES))
+
+    def _expand(self, arrays, beams, pool, remaining, incumbent, executor):
+        """Extend every beam by one pool member and keep the best distinct teams"""
+        teams = np.hstack([np.repeat(beams, len(pool), axis=0),
+                           np.tile(pool, len(beams))[:, None]])
+        if beams.shape[1]:
+            fresh = ~(teams[:, :-1] == teams[:, -1:]).any(axis=1)
+            teams = teams[fresh]
+        teams = np.unique(np.sort(teams, axis=1), axis=0)
+        if remaining:
+            teams = teams[self._upper_bound(arrays, teams, remaining) > incumbent]
+        if not len(teams):
+            return teams
+        scores = self._score(arrays, teams, executor)
+        if len(teams) > self.beam_width:
+            keep = np.argpartition(-scores, self.beam_width - 1)[:self.beam_width]
+            teams = teams[keep]
+        return teams
+
+    def _local_search(self, arrays, team, score, locked, pool, executor):
+        """Swap single unlocked members for pool candidates while the score improves"""
+        team = list(team)
+        free_slots = [slot for slot, member in enumerate(team) if member not in locked]
+        while not self.cancelled:
+            options = pool[~np.isin(pool, team)]
+            if not len(options):
+                break
+            swaps = []
+            for slot in free_slots:
+                variants = np.tile(team, (len(options), 1)).astype(np.int64)
+                variants[:, slot] = options
+                swaps.append(variants)
+            if not swaps:
+                break
+            swaps = np.vstack(swaps)
+            scores = self._score(arrays, swaps, executor)
+            top = int(np.argmax(scores))
+            if scores[top] <= score + 1e-12:
+                break
+            team, score = swaps[top].tolist(), float(scores[top])
+        return team, score
@@ -0,0 +1,375 @@
+# team_store.py
+"""File for TeamStore class"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+
+SCHEMA_VERSION = 1
+
+
+def _add_member(members, pokemon_name):
+    return members if pokemon_name in members else members + [pokemon_name]
+
+
+def _remove_member(members, pokemon_name):
+    return [member for member in members if member != pokemon_name]
+
+
+def _clear_members(members, _):
+    return []
+
+
+MEMBER_UPDATES = {'add': _add_member, 'remove': _remove_member, 'clear': _clear_members}
+
+
+def normalize_team_name(team_name):
+    """Return the case-insensitive lookup key of a team name"""
+    return team_name.strip().lower()
+
+
+class TeamRecord:
+    """In-memory saved team with its members parsed into a tuple of Pokémon ids"""
+    __slots__ = ('team_id', 'name', 'members')
+
+    def __init__(self, team_id, name, members):
+        self.team_id = team_id
+        self.name = name
+        self.members = members
+
+    def __repr__(self):
+        return f"TeamRecord({self.team_id!r}, {self.name!r}, {self.members!r})"
+
+
+class TeamStore:
+    """SQLite store of saved teams.
+
+    Edits are indexed row updates inside transactions, so a crash never
+    leaves a half-written file behind. WAL journaling lets
+    several processes read while one writes, and BEGIN IMMEDIATE plus the
+    busy timeout serialize concurrent writers.
+    """
+
+    def __init__(self, db_path, legacy_csv=None, timeout=10.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.connection = None
+        self.connect()
+        with self.transaction() as cursor:
+            cursor.execute('CREATE TABLE IF NOT EXISTS teams ('
+                           'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                           'name TEXT NOT NULL, '
+                           'name_key TEXT NOT NULL, '
+                           "members TEXT NOT NULL DEFAULT '[]')")
+            cursor.execute('CREATE INDEX IF NOT EXISTS teams_name_key ON teams (name_key, id)')
+            version = cursor.execute('PRAGMA user_version').fetchone()[0]
+            if version < SCHEMA_VERSION:
+                if legacy_csv and os.path.exists(legacy_csv):
+                    self._import_csv(cursor, legacy_csv)
+                cursor.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def connect(self):
+        """Open the database file, or reopen it after it was replaced on disk"""
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                          isolation_level=None, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        self.inode = self.signature()[0][0]
+
+    @contextmanager
+    def transaction(self):
+        """Run statements atomically, holding the write lock from the start"""
+        cursor = self.connection.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+        cursor.execute('COMMIT')
+
+    @staticmethod
+    def _import_csv(cursor, csv_path):
+        """Copy teams from the old saved_teams.csv format"""
+        saved_teams = pd.read_csv(csv_path)
+        for _, row in saved_teams.iterrows():
+            members = row['Members'] if isinstance(row['Members'], str) else ''
+            members = [member.strip() for member in members.split(',') if member.strip()]
+            cursor.execute('INSERT INTO teams (name, name_key, members) VALUES (?, ?, ?)',
+                           (row['Team Name'], normalize_team_name(row['Team Name']),
+                            json.dumps(members)))
+
+    def reconnect_if_replaced(self):
+        """Reopen the database if its file was replaced on disk since connect()"""
+        if self.signature()[0][0] != self.inode:
+            self.connect()
+
+    @staticmethod
+    def _find(cursor, team_name):
+        return cursor.execute('SELECT id, members FROM teams WHERE name_key = ? '
+                              'ORDER BY id LIMIT 1',
+                              (normalize_team_name(team_name),)).fetchone()
+
+    @staticmethod
+    def _insert(cursor, team_name, members):
+        cursor.execute('INSERT INTO teams (name, name_key, members) VALUES (?, ?, ?)',
+                       (team_name, normalize_team_name(team_name), json.dumps(list(members))))
+        return cursor.lastrowid
+
+    def add_teams(self, teams):
+        """Append many (name, members) teams in one transaction"""
+        with self.transaction() as cursor:
+            cursor.executemany('INSERT INTO teams (name, name_key, members) VALUES (?, ?, ?)',
+                               ((team_name, normalize_team_name(team_name),
+                                 json.dumps(list(members))) for team_name, members in teams))
+
+    def update_members(self, cursor, team_id, team_name, update):
+        """Replace a team's members with update(current_members) on the stored row.
+
+        Runs inside transaction(). A provisional (negative) team_id names a team
+        not written yet: the first team saved under team_name is updated, or
+        created when there is none. Returns the id of the stored team, or None
+        when the team was deleted.
+        """
+        if team_id >= 0:
+            row = cursor.execute('SELECT id, members FROM teams WHERE id = ?',
+                                 (team_id,)).fetchone()
+            if row is None:
+                return None
+        else:
+            row = self._find(cursor, team_name)
+            if row is None:
+                return self._insert(cursor, team_name, update([]))
+        cursor.execute('UPDATE teams SET members = ? WHERE id = ?',
+                       (json.dumps(update(json.loads(row[1]))), row[0]))
+        return row[0]
+
+    def apply_edit(self, cursor, edit, ids):
+        """Apply one (action, team_id, team_name, value) edit queued by a TeamWriter.
+
+        Runs inside transaction(). ids maps the provisional ids of teams created
+        by earlier edits to their stored ids, and gains the ids this edit hands out.
+        """
+        action, team_id, team_name, value = edit
+        stored_id = ids.get(team_id, team_id)
+        if action == 'save':
+            ids[team_id] = self._insert(cursor, team_name, value)
+        elif action == 'delete':
+            cursor.execute('DELETE FROM teams WHERE id = ?', (stored_id,))
+        else:
+            update = MEMBER_UPDATES[action]
+            stored_id = self.update_members(cursor, stored_id, team_name,
+                                            lambda members: update(members, value))
+            if stored_id is not None and team_id < 0:
+                ids[team_id] = stored_id
+
+    def list_teams(self):
+        """Return (id, name, members) for every team in save order"""
+        rows = self.connection.execute('SELECT id, name, members FROM teams ORDER BY id')
+        return [(team_id, name, json.loads(members)) for team_id, name, members in rows]
+
+    def signature(self):
+        """Return (inode, mtime, size) of the database file and of its write-ahead log.
+
+        Any commit changes one of them, so a different signature means the
+        store may have been edited by another process.
+        """
+        parts = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                parts.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                parts.append((None, None, None))
+        return tuple(parts)
+
+    def checkpoint(self):
+        """Fold the write-ahead log back into the database file"""
+        self.connection.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+
+class TeamWriter:
+    """Write-behind queue in front of a team store, with its own connection.
+
+    Edits are queued as operations and return at once: 'save' a new team,
+    'add' or 'remove' a member, 'clear' the members or 'delete' the team.
+    A background thread waits delay seconds after the first pending edit and
+    applies the burst in one transaction to the rows as they are stored, so
+    edits made meanwhile by other processes are kept. Teams saved here carry
+    a provisional negative id until the store hands out their real one.
+    The write-ahead log is checkpointed, which syncs the database file,
+    every sync_interval seconds after a write and on close.
+    """
+
+    def __init__(self, db_path, delay=0.2, sync_interval=5.0, timeout=10.0):
+        self.store = TeamStore(db_path, timeout=timeout)
+        self.delay = delay
+        self.sync_interval = sync_interval
+        self.pending = []
+        self.ids = {}
+        self.assigned = {}
+        self.error = None
+        self.failing = False
+        self.changed = False
+        self.known_signature = self.store.signature()
+        self._condition = threading.Condition()
+        self._writing = False
+        self._flush_requested = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name='team-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, action, team_id, team_name=None, value=None):
+        """Queue an edit of a team; value is the member names for 'save'
+        and the Pokémon name for 'add' and 'remove'"""
+        with self._condition:
+            self._check_open()
+            self.pending.append((action, team_id, team_name, value))
+            self._condition.notify_all()
+
+    def _check_open(self):
+        if self._closing:
+            raise RuntimeError("team writer is closed")
+
+    def resolve(self, team_id):
+        """Return the stored id of a team, which differs for teams saved here"""
+        with self._condition:
+            return self.ids.get(team_id, team_id)
+
+    def take_assigned_ids(self):
+        """Return {provisional id: stored id} for the teams written since the last call"""
+        with self._condition:
+            assigned, self.assigned = self.assigned, {}
+            return assigned
+
+    def take_error(self):
+        """Return the error that stopped the edits reaching disk once, then None"""
+        with self._condition:
+            error, self.error = self.error, None
+            return error
+
+    def flush(self, wait=True, timeout=None):
+        """Write the pending edits now; with wait, block until they are committed
+        or a write attempt failed, and return whether they all reached the store"""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            if wait:
+                self._condition.wait_for(
+                    lambda: not self._writing and (not self.pending or self.failing), timeout)
+                return not self.pending and not self._writing
+            return True
+
+    def changed_outside(self):
+        """Return True once after another process changed the store file.
+
+        Nothing is reported while edits of our own are still on their way to disk.
+        """
+        with self._condition:
+            if self.pending or self._writing:
+                return False
+            signature = self.store.signature()
+            if signature == self.known_signature and not self.changed:
+                return False
+            self.changed = False
+            self.known_signature = signature
+            return True
+
+    def _run(self):
+        synced = True
+        last_sync = time.monotonic()
+        while True:
+            with self._condition:
+                if not self.pending and not self._closing:
+                    self._condition.wait(None if synced else self.sync_interval)
+                if self.pending and not self._closing:
+                    # Let the rest of a burst of edits arrive before writing.
+                    self._condition.wait_for(lambda: self._closing or self._flush_requested,
+                                             self.delay)
+                edits, self.pending = self.pending, []
+                self._flush_requested = False
+                closing = self._closing
+                self._writing = bool(edits)
+            if edits:
+                self._write(edits, closing)
+                synced = False
+            if not synced and (closing or time.monotonic() - last_sync >= self.sync_interval):
+                synced = self._sync()
+                last_sync = time.monotonic()
+            if closing:
+                return
+
+    def _write(self, edits, closing):
+        ids = dict(self.ids)
+        changed = failed = None
+        try:
+            self.store.reconnect_if_replaced()
+            with self.store.transaction() as cursor:
+                # We hold the write lock, so a change seen now came from another process.
+                changed = self.store.signature() != self.known_signature
+                for edit in edits:
+                    self.store.apply_edit(cursor, edit, ids)
+        except Exception as error:  # pylint: disable=broad-except
+            # A corrupt row or a bad edit must not kill the thread either:
+            # the edits stay queued and the error is reported through take_error.
+            failed = error
+        with self._condition:
+            if failed is None:
+                self.assigned.update((team_id, stored_id) for team_id, stored_id in ids.items()
+                                     if team_id not in self.ids)
+                self.ids = ids
+                self.changed = self.changed or changed
+                self.known_signature = self.store.signature()
+                self.failing = False
+            else:
+                # Keep the edits, in order, ahead of newer ones for the next attempt.
+                self.pending = edits + self.pending
+                self._fail(failed)
+            self._writing = False
+            self._condition.notify_all()
+        if failed is not None and not closing:
+            time.sleep(self.delay)
+
+    def _fail(self, error):
+        """Record an error, reporting only the first of a run of failed attempts"""
+        if not self.failing:
+            self.error = error
+        self.failing = True
+
+    def _sync(self):
+        with self._condition:
+            self._writing = True
+        failed = None
+        try:
+            self.store.checkpoint()
+        except Exception as error:  # pylint: disable=broad-except
+            failed = error
+        with self._condition:
+            if failed is not None:
+                self._fail(failed)
+            self.known_signature = self.store.signature()
+            self._writing = False
+            self._condition.notify_all()
+        return failed is None
+
+    def close(self):
+        """Write the pending edits, sync the file and stop the thread.
+
+        Returns the edits that could not be written.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.store.close()
+        return list(self.pending)
@@ -0,0 +1,112 @@
+# type_chart.py
+"""File for type effectiveness calculations"""
+import numpy as np
+import pandas as pd
+
+TYPES = ['Normal', 'Fire', 'Water', 'Electric', 'Grass', 'Ice', 'Fighting', 'Poison', 'Ground',
+         'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark', 'Steel', 'Fairy']
+TYPE_CODES = {type_name: code for code, type_name in enumerate(TYPES)}
+
+# Attacking type -> defending types whose multiplier differs from 1.
+_MATCHUPS = {
+    'Normal': {'Rock': .5, 'Ghost': 0, 'Steel': .5},
+    'Fire': {'Fire': .5, 'Water': .5, 'Grass': 2, 'Ice': 2, 'Bug': 2, 'Rock': .5,
+             'Dragon': .5, 'Steel': 2},
+    'Water': {'Fire': 2, 'Water': .5, 'Grass': .5, 'Ground': 2, 'Rock': 2, 'Dragon': .5},
+    'Electric': {'Water': 2, 'Electric': .5, 'Grass': .5, 'Ground': 0, 'Flying': 2,
+                 'Dragon': .5},
+    'Grass': {'Fire': .5, 'Water': 2, 'Grass': .5, 'Poison': .5, 'Ground': 2, 'Flying': .5,
+              'Bug': .5, 'Rock': 2, 'Dragon': .5, 'Steel': .5},
+    'Ice': {'Fire': .5, 'Water': .5, 'Grass': 2, 'Ice': .5, 'Ground': 2, 'Flying': 2,
+            'Dragon': 2, 'Steel': .5},
+    'Fighting': {'Normal': 2, 'Ice': 2, 'Poison': .5, 'Flying': .5, 'Psychic': .5, 'Bug': .5,
+                 'Rock': 2, 'Ghost': 0, 'Dark': 2, 'Steel': 2, 'Fairy': .5},
+    'Poison': {'Grass': 2, 'Poison': .5, 'Ground': .5, 'Rock': .5, 'Ghost': .5, 'Steel': 0,
+               'Fairy': 2},
+    'Ground': {'Fire': 2, 'Electric': 2, 'Grass': .5, 'Poison': 2, 'Flying': 0, 'Bug': .5,
+               'Rock': 2, 'Steel': 2},
+    'Flying': {'Electric': .5, 'Grass': 2, 'Fighting': 2, 'Bug': 2, 'Rock': .5, 'Steel': .5},
+    'Psychic': {'Fighting': 2, 'Poison': 2, 'Psychic': .5, 'Dark': 0, 'Steel': .5},
+    'Bug': {'Fire': .5, 'Grass': 2, 'Fighting': .5, 'Poison': .5, 'Flying': .5, 'Psychic': 2,
+            'Ghost': .5, 'Dark': 2, 'Steel': .5, 'Fairy': .5},
+    'Rock': {'Fire': 2, 'Ice': 2, 'Fighting': .5, 'Ground': .5, 'Flying': 2, 'Bug': 2,
+             'Steel': .5},
+    'Ghost': {'Normal': 0, 'Psychic': 2, 'Ghost': 2, 'Dark': .5},
+    'Dragon': {'Dragon': 2, 'Steel': .5, 'Fairy': 0},
+    'Dark': {'Fighting': .5, 'Psychic': 2, 'Ghost': 2, 'Dark': .5, 'Fairy': .5},
+    'Steel': {'Fire': .5, 'Water': .5, 'Electric': .5, 'Ice': 2, 'Rock': 2, 'Steel': .5,
+              'Fairy': 2},
+    'Fairy': {'Fire': .5, 'Fighting': 2, 'Poison': .5, 'Dragon': 2, 'Dark': 2, 'Steel': .5},
+}
+
+# EFFECTIVENESS[attacking, defending] is the damage multiplier of a move type on a type.
+EFFECTIVENESS = np.ones((len(TYPES), len(TYPES)))
+for _attacking, _row in _MATCHUPS.items():
+    for _defending, _multiplier in _row.items():
+        EFFECTIVENESS[TYPE_CODES[_attacking], TYPE_CODES[_defending]] = _multiplier
+
+# Extra row/column of ones so that code -1 (no second type) is neutral.
+_PADDED = np.ones((len(TYPES) + 1, len(TYPES) + 1))
+_PADDED[:-1, :-1] = EFFECTIVENESS
+
+
+def type_codes(pokemon_df):
+    """Return an (n, 2) array of type codes for Type 1 / Type 2, -1 where missing"""
+    codes = np.full((len(pokemon_df), 2), -1, dtype=np.int8)
+    for slot, column in enumerate(('Type 1', 'Type 2')):
+        if column in pokemon_df.columns:
+            type_names = pokemon_df[column].astype(object)
+            codes[:, slot] = type_names.map(TYPE_CODES).fillna(-1).to_numpy()
+    return codes
+
+
+def defensive_multipliers(codes):
+    """Return (n, 18) damage multipliers taken from every attacking type"""
+    codes = np.asarray(codes)
+    return (_PADDED[:-1, codes[:, 0]] * _PADDED[:-1, codes[:, 1]]).T
+
+
+def offensive_multipliers(codes):
+    """Return (n, 18) best same-type multipliers dealt to every single defending type"""
+    codes = np.asarray(codes)
+    best = np.maximum(_PADDED[codes[:, 0], :-1],
+                      np.where(codes[:, 1:] >= 0, _PADDED[codes[:, 1], :-1], 0))
+    return np.where(codes[:, :1] >= 0, best, 0)
+
+
+def team_coverage(team_codes):
+    """Return a per-type DataFrame of the team's defensive profile and offensive coverage.
+
+    Weak / Resist / Immune count members taking >1x, <1x and 0x damage from
+    the attacking type; Coverage is the best multiplier the team's own types
+    deal to a Pokémon of that type.
+    """
+    defensive = defensive_multipliers(team_codes)
+    offensive = offensive_multipliers(team_codes)
+    return pd.DataFrame({
+        'Weak': (defensive > 1).sum(axis=0),
+        'Resist': ((defensive < 1) & (defensive > 0)).sum(axis=0),
+        'Immune': (defensive == 0).sum(axis=0),
+        'Coverage': offensive.max(axis=0) if len(offensive) else np.zeros(len(TYPES)),
+    }, index=pd.Index(TYPES, name='Type'))
+
+
+def score_candidates(candidate_codes, team_codes):
+    """Score how much each candidate would improve the team's type matchups.
+
+    A candidate gains a point for every attacking type nobody on the team
+    resists yet that it resists, and for every defending type the team cannot
+    hit super effectively yet that it can. It loses a point for every type
+    that already threatens two or more members and also threatens it.
+    """
+    team_defensive = defensive_multipliers(team_codes)
+    team_offensive = offensive_multipliers(team_codes)
+    resisted = (team_defensive < 1).any(axis=0)
+    covered = (team_offensive > 1).any(axis=0)
+    exposed = (team_defensive > 1).sum(axis=0) >= 2
+
+    defensive = defensive_multipliers(candidate_codes)
+    offensive = offensive_multipliers(candidate_codes)
+    return (((defensive < 1) & ~resisted).sum(axis=1)
+            + ((offensive > 1) & ~covered).sum(axis=1)
+            - ((defensive > 1) & exposed).sum(axis=1))
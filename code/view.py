@@ -1,22 +1,63 @@
 # view.py
 """File for View class"""
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox,  simpledialog
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
+from contextlib import nullcontext
 import numpy as np
+from profiling import profiled, profiler
+from virtual_list import VirtualListbox
+from graph_render import (RenderCache, TEAM_ATTRIBUTES, draw_team_pies, pie_label_format,
+                          update_pie, update_bars)
+
+DATASET_GRAPHS = ("Stats by Type", "Correlation Matrix", "Hp Distribution", "Pareto Frontier")
+PARETO_STATS = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+PARETO_DEFAULT = ('Attack', 'Sp. Atk', 'Speed')
+# The scatter behind a two-stat frontier shows at most this many Pokémon.
+PARETO_BACKGROUND = 5000
+# A Pokémon of another type counts as this many standard deviations away in one stat.
+SIMILAR_TYPE_WEIGHT = 1.0
+# Legendary filter choices of the "Select Pokémon" tab and the flag each one keeps.
+LEGENDARY_SCOPES = {"All": None, "No legendaries": False, "Only legendaries": True}
+PERFORMANCE_COLUMNS = ('calls', 'mean_ms', 'p90_ms', 'max_ms', 'rows')
+
+# Plotting libraries are imported by load_plotting() the first time a graph is needed.
+Figure = None
+plt = None
+FigureCanvasTkAgg = None
+LineCollection = None
+sns = None
+
+
+def load_plotting():
+    """Import matplotlib and seaborn on first use"""
+    global Figure, plt, FigureCanvasTkAgg, LineCollection, sns
+    if Figure is None:
+        from matplotlib.figure import Figure as figure_class
+        import matplotlib.pyplot as pyplot
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+        from matplotlib.collections import LineCollection as collection_class
+        import seaborn
+        plt, FigureCanvasTkAgg, sns = pyplot, canvas_class, seaborn
+        LineCollection = collection_class
+        Figure = figure_class
+
 
 class PokeBuilderView:
     """View class for this program"""
-    def __init__(self, master, model, pokemon_data, controller):
+    def __init__(self, master, model, pokemon_data, controller, lazy_tabs=True, timer=None,
+                 debug=False):
         self.controller = controller
         self.master = master
         self.model = model
         self.pokemon_data = pokemon_data
         self.master.title("Poké Builder")
         self.current_team = []
+        self.similar_slot = 0
+        self.lazy_tabs = lazy_tabs
+        self.timer = timer
+        self.debug = debug
+        self.built_tabs = set()
         self.controller.view = self
         self.setup_ui()
 
@@ -34,21 +75,63 @@ class PokeBuilderView:
         self.tab_control.add(self.graph_tab, text='Graph View')
         self.tab_control.add(self.team_graph_tab, text='Team Graph View')
         self.tab_control.add(self.team_tab, text='Saved Team')
+        if self.debug:
+            self.performance_tab = ttk.Frame(self.tab_control)
+            self.tab_control.add(self.performance_tab, text='Performance')
 
         self.main_frame = ttk.Frame(self.select_tab)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.setup_select_tab()
-        self.setup_graph_tab()
-        self.setup_team_graph_tab()
-        self.setup_team_tab()
+        self.tab_builders = {
+            str(self.select_tab): ('Select Pokémon', self.setup_select_tab),
+            str(self.graph_tab): ('Graph View', self.setup_graph_tab),
+            str(self.team_graph_tab): ('Team Graph View', self.setup_team_graph_tab),
+            str(self.team_tab): ('Saved Team', self.setup_team_tab),
+        }
+        if self.debug:
+            self.tab_builders[str(self.performance_tab)] = ('Performance',
+                                                            self.setup_performance_tab)
+        self.build_tab(self.select_tab)
+        if not self.lazy_tabs:
+            for tab in (self.graph_tab, self.team_graph_tab, self.team_tab):
+                self.build_tab(tab)
 
         self.main_frame = ttk.Frame(self.select_tab)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
 
         self.controller.setup_bindings()
+        self.tab_control.bind('<<NotebookTabChanged>>', self.on_tab_changed)
 
         self.tab_control.pack(expand=1, fill="both")
+        if self.debug:
+            self.status_var = tk.StringVar()
+            ttk.Label(self.master, textvariable=self.status_var,
+                      anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X)
+            self.refresh_performance()
+
+    def build_tab(self, tab):
+        """Creates the widgets of a tab the first time it is needed"""
+        key = str(tab)
+        if key in self.built_tabs:
+            return
+        self.built_tabs.add(key)
+        name, builder = self.tab_builders[key]
+        with self.timer.phase(f'build tab: {name}') if self.timer else nullcontext():
+            builder()
+
+    def is_tab_built(self, tab):
+        """Returns True once the widgets of a tab exist"""
+        return str(tab) in self.built_tabs
+
+    def on_tab_changed(self, event=None):
+        """Builds the newly shown tab on first display"""
+        self.build_tab(self.tab_control.nametowidget(self.tab_control.select()))
+
+    def ensure_plotting(self):
+        """Imports the plotting libraries, timing the import during startup"""
+        if Figure is None:
+            with self.timer.phase('import matplotlib/seaborn') if self.timer else nullcontext():
+                load_plotting()
 
     def setup_select_tab(self):
         """Sets up the UI elements specific to the "Select Pokémon" tab"""
@@ -72,6 +155,25 @@ class PokeBuilderView:
         self.type_combobox.pack(side=tk.LEFT, padx=5)
         self.type_combobox.bind('<<ComboboxSelected>>', self.update_pokemon_list)
 
+        ttk.Label(filter_frame, text="Gen:").pack(side=tk.LEFT)
+        generations = self.model.get_generations()
+        self.generation_from_combobox = ttk.Combobox(filter_frame, values=generations,
+                                                     state="readonly", width=3)
+        self.generation_to_combobox = ttk.Combobox(filter_frame, values=generations,
+                                                   state="readonly", width=3)
+        for combobox in (self.generation_from_combobox, self.generation_to_combobox):
+            combobox.pack(side=tk.LEFT, padx=2)
+            combobox.bind('<<ComboboxSelected>>', self.update_pokemon_list)
+        if generations:
+            self.generation_from_combobox.current(0)
+            self.generation_to_combobox.current(len(generations) - 1)
+
+        self.legendary_combobox = ttk.Combobox(filter_frame, values=list(LEGENDARY_SCOPES),
+                                               state="readonly", width=15)
+        self.legendary_combobox.current(0)
+        self.legendary_combobox.pack(side=tk.LEFT, padx=5)
+        self.legendary_combobox.bind('<<ComboboxSelected>>', self.update_pokemon_list)
+
         ttk.Label(filter_frame, text="Sort by:").pack(side=tk.LEFT)
         self.sort_var = tk.StringVar(value="Name")
         ttk.Radiobutton(filter_frame, text="Name", variable=self.sort_var,
@@ -83,23 +185,34 @@ class PokeBuilderView:
 
         listbox_frame = ttk.Frame(self.select_tab)
         listbox_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.pokemon_listbox = tk.Listbox(listbox_frame, height=20)
+        self.pokemon_listbox = VirtualListbox(listbox_frame, label=self.model.get_pokemon_name,
+                                              height=20, empty_text="No results found.")
         self.pokemon_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = tk.Scrollbar(listbox_frame, orient="vertical",
-                                 command=self.pokemon_listbox.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.pokemon_listbox.config(yscrollcommand=scrollbar.set)
         self.populate_pokemon_listbox()
 
         management_frame = ttk.Frame(self.select_tab)
         management_frame.pack(fill=tk.X, expand=True, padx=15, pady=10)
 
-        self.selected_team_listbox = tk.Listbox(management_frame, height=5, width=10)
+        self.selected_team_listbox = VirtualListbox(management_frame,
+                                                    label=self.model.get_pokemon_name,
+                                                    height=5, width=10)
         self.selected_team_listbox.pack(fill=tk.X, expand=True)
 
-        confirm_team_button = ttk.Button(self.select_tab, text="Confirm Team",
-                                         command=self.confirm_team)
-        confirm_team_button.pack(expand=True, pady=2)
+        similar_frame = ttk.Frame(management_frame)
+        similar_frame.pack(fill=tk.X, pady=2)
+        ttk.Button(similar_frame, text="Find Similar",
+                   command=self.show_slot_alternatives).pack(side=tk.LEFT, padx=2)
+        ttk.Button(similar_frame, text="Swap In",
+                   command=self.swap_in_alternative).pack(side=tk.LEFT, padx=2)
+        self.similar_distances = {}
+        self.similar_listbox = VirtualListbox(management_frame, label=self.similar_label,
+                                              height=5, width=10,
+                                              empty_text="Select a member, then Find Similar.")
+        self.similar_listbox.pack(fill=tk.X, expand=True)
+
+        self.confirm_team_button = ttk.Button(self.select_tab, text="Confirm Team",
+                                              command=self.confirm_team)
+        self.confirm_team_button.pack(expand=True, pady=2)
 
         add_button = ttk.Button(self.select_tab, text="Add Pokémon", command=self.add_pokemon)
         add_button.pack(expand=True, pady=2)
@@ -111,6 +224,17 @@ class PokeBuilderView:
         clear_team_button = ttk.Button(self.select_tab, text="Clear Team", command=self.clear_team)
         clear_team_button.pack(expand=True, pady=2)
 
+        suggest_frame = ttk.Frame(self.select_tab)
+        suggest_frame.pack(expand=True, pady=2)
+        self.suggest_team_button = ttk.Button(suggest_frame, text="Suggest Best Team",
+                                              command=self.controller.suggest_team)
+        self.suggest_team_button.pack(side=tk.LEFT, padx=2)
+        self.exclude_legendary_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(suggest_frame, text="No legendaries",
+                        variable=self.exclude_legendary_var).pack(side=tk.LEFT, padx=2)
+        self.suggest_progress = ttk.Progressbar(self.select_tab, maximum=100, length=150)
+        self.suggest_progress.pack(expand=True, pady=2)
+
         quit_button = ttk.Button(self.select_tab, text="Quit", command=self.master.quit)
         quit_button.pack(expand=True, pady=2)
 
@@ -127,7 +251,8 @@ class PokeBuilderView:
         ttk.Label(self.button_frame, text="Graph Type:").pack(side=tk.LEFT, padx=5)
         self.graph_type_var = tk.StringVar(value="Pie graph for selected pokemon")
         graph_types = ["Pie graph for selected pokemon", "Bar graph for selected pokemon",
-                                    "Stats by Type", "Correlation Matrix", "Hp Distribution"]
+                                    "Stats by Type", "Correlation Matrix", "Hp Distribution",
+                                    "Pareto Frontier"]
         self.graph_type_combobox = ttk.Combobox(self.button_frame, textvariable=self.graph_type_var,
                                                 values=graph_types, state="readonly")
         self.graph_type_combobox.pack(side=tk.LEFT, padx=5, pady=5)
@@ -152,6 +277,15 @@ class PokeBuilderView:
                                        command=self.trigger_graph_drawing)
         draw_graph_button.pack(padx=5)
 
+        pareto_frame = ttk.Frame(self.graph_tab)
+        pareto_frame.pack(fill=tk.X)
+        ttk.Label(pareto_frame, text="Pareto stats:").pack(side=tk.LEFT, padx=5)
+        self.pareto_vars = {}
+        for stat in PARETO_STATS:
+            self.pareto_vars[stat] = tk.BooleanVar(value=stat in PARETO_DEFAULT)
+            ttk.Checkbutton(pareto_frame, text=stat,
+                            variable=self.pareto_vars[stat]).pack(side=tk.LEFT, padx=2)
+
         self.prepare_plot_area()
 
         self.graph_listbox = tk.Listbox(self.graph_tab, height=10)
@@ -191,60 +325,127 @@ class PokeBuilderView:
 
     def setup_team_tab(self):
         """Sets up the UI elements for the "Saved Team" tab"""
-        default_data = self.controller.initialize_pokemon_list()
-        self.update_pokemon_list(default_data)
-
         team_frame = ttk.Frame(self.team_tab)
         team_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        self.team_listbox = tk.Listbox(team_frame, height=10)
+        self.team_listbox = VirtualListbox(team_frame, label=self.saved_team_label, height=10)
         self.team_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.update_saved_teams_tab()
 
         button_frame = ttk.Frame(team_frame)
         button_frame.pack(fill=tk.X, pady=5)
 
-        self.confirm_team_button = ttk.Button(button_frame, text="Delete Selected Team",
-                                                command=self.on_delete_button_clicked)
-        self.confirm_team_button.pack(padx=5, pady=5)
+        self.delete_team_button = ttk.Button(button_frame, text="Delete Selected Team",
+                                             command=self.on_delete_button_clicked)
+        self.delete_team_button.pack(padx=5, pady=5)
 
         self.quit_button = ttk.Button(button_frame, text="Quit", command=self.master.quit)
         self.quit_button.pack(padx=5, pady=5)
 
+    def setup_performance_tab(self):
+        """Sets up the "Performance" tab listing the instrumented hot paths"""
+        button_frame = ttk.Frame(self.performance_tab)
+        button_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(button_frame, text="Profile Next Action",
+                   command=self.profile_next_action).pack(side=tk.LEFT, padx=3)
+        ttk.Button(button_frame, text="Dump to File",
+                   command=self.dump_performance).pack(side=tk.LEFT, padx=3)
+        ttk.Button(button_frame, text="Reset",
+                   command=profiler.reset).pack(side=tk.LEFT, padx=3)
+
+        self.performance_table = ttk.Treeview(self.performance_tab, height=12,
+                                              columns=PERFORMANCE_COLUMNS)
+        self.performance_table.heading('#0', text='Handler')
+        self.performance_table.column('#0', width=280)
+        for column in PERFORMANCE_COLUMNS:
+            self.performance_table.heading(column, text=column.replace('_', ' '))
+            self.performance_table.column(column, width=80, anchor=tk.E)
+        self.performance_table.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        self.profile_text = tk.Text(self.performance_tab, height=14, wrap=tk.NONE)
+        self.profile_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.shown_profile = profiler.last_profile
+
+    def refresh_performance(self):
+        """Show the slowest recent call in the status bar and refresh the performance table"""
+        recent = profiler.recent(50)
+        if recent:
+            name, _, seconds, _ = max(recent, key=lambda event: event[2])
+            self.status_var.set(f"{profiler.position} calls, slowest of the last "
+                                f"{len(recent)}: {name} {seconds * 1000:.1f} ms")
+        if self.is_tab_built(self.performance_tab):
+            self.performance_table.delete(*self.performance_table.get_children())
+            for row in profiler.summary():
+                values = [row['calls'], f"{row['mean_ms']:.2f}", f"{row['p90_ms']:.2f}",
+                          f"{row['max_ms']:.2f}", row['rows']]
+                self.performance_table.insert('', tk.END, text=row['name'], values=values)
+            # The profiled action may run on a worker thread, so its output is polled here.
+            if profiler.last_profile is not self.shown_profile:
+                self.shown_profile = profiler.last_profile
+                self.profile_text.delete('1.0', tk.END)
+                self.profile_text.insert(tk.END, self.shown_profile)
+        self.master.after(1000, self.refresh_performance)
+
+    def profile_next_action(self):
+        """Run the next interaction under cProfile and show its statistics"""
+        self.profile_text.delete('1.0', tk.END)
+        self.profile_text.insert(tk.END, "Waiting for the next action...")
+        self.shown_profile = profiler.last_profile
+        profiler.profile_next()
+
+    def dump_performance(self):
+        """Write the profiler's statistics and recent calls to a JSON file"""
+        path = time.strftime('profile_%Y%m%d_%H%M%S.json')
+        profiler.dump(path)
+        messagebox.showinfo("Profile Saved", f"Performance data written to {path}.")
+
     # Data Visualization
 
     def plot_pie_chart(self, data, attribute):
         """Draws a pie chart of the given attribute for the selected Pokémon."""
-        self.prepare_plot_area()
+        self.prepare_plot_area(clear=False)
         total = data[attribute].sum()
+        sizes = data[attribute].replace(0, np.nan).dropna() if total > 0 else data[attribute][:0]
+        labels = data.loc[sizes.index, 'Name']
+        title = f'Proportion of {attribute.capitalize()} among Selected Pokémon'
+
+        artists = self.graph_artists
+        if not sizes.empty and artists and artists[0] == 'pie' and len(artists[1]) == len(sizes):
+            update_pie(*artists[1:], sizes, labels, pie_label_format(total))
+            self.ax.set_title(title)
+            return
 
+        self.clear_plot_area()
         if total > 0:
-            sizes = data[attribute].replace(0, np.nan).dropna()
-            labels = data.loc[sizes.index, 'Name']
-
             if sizes.empty:
                 self.ax.text(0.5, 0.5, 'No valid data to display', horizontalalignment='center',
                             verticalalignment='center', transform=self.ax.transAxes)
                 self.ax.set_title(f'No data available for {attribute}')
             else:
                 wedges, texts, autotexts = self.ax.pie(sizes, labels=labels,
-                                                    autopct=lambda p: f'{p:.1f}% \
-                                                        \n({p/100 * total:.1f})',
+                                                    autopct=pie_label_format(total),
                                                     startangle=140, colors=plt.cm.tab20.colors)
+                self.graph_artists = ('pie', wedges, texts, autotexts)
 
                 self.ax.axis('equal')
-                self.ax.set_title(f'Proportion of {attribute.capitalize()} among Selected Pokémon')
+                self.ax.set_title(title)
         else:
             self.ax.text(0.5, 0.5, 'All values are zero', horizontalalignment='center',
                         verticalalignment='center', transform=self.ax.transAxes)
             self.ax.set_title(f'No valid data for {attribute}')
 
-        self.canvas.draw()
-
     def plot_bar_chart(self, data, attribute):
         """Creates and displays a bar chart for the specified attribute of the selected Pokémon."""
-        self.prepare_plot_area()
+        self.prepare_plot_area(clear=False)
 
+        artists = self.graph_artists
+        if not data.empty and artists and artists[0] == 'bar' and len(artists[1]) == len(data):
+            update_bars(self.ax, artists[1], data[attribute], data['Name'])
+            self.ax.set_title(f'{attribute} Distribution')
+            self.ax.set_ylabel(attribute)
+            return
+
+        self.clear_plot_area()
         # Ensure you have data to plot
         if data.empty:
             self.ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=self.ax.transAxes)
@@ -255,7 +456,8 @@ class PokeBuilderView:
             values = data[attribute]
             indices = np.arange(len(names))  # the x locations for the groups
 
-            self.ax.bar(indices, values, color='skyblue')
+            bars = self.ax.bar(indices, values, color='skyblue')
+            self.graph_artists = ('bar', bars)
             self.ax.set_title(f'{attribute} Distribution')
             self.ax.set_xlabel('Pokémon')
             self.ax.set_ylabel(attribute)
@@ -265,15 +467,16 @@ class PokeBuilderView:
             self.ax.set_xticklabels(names, rotation=45, ha="right")
 
             # Dynamically adjust the bottom margin to accommodate the rotated labels
-            plt.gcf().subplots_adjust(bottom=0.15 + len(names) * 0.005)
-
-        self.canvas.draw()
+            self.figure.subplots_adjust(bottom=0.15 + len(names) * 0.005)
 
-    def plot_hp_distribution(self, data):
-        """Plot the distribution of HP among Pokémon using a histogram."""
+    def plot_hp_distribution(self, histogram):
+        """Plot the distribution of HP among Pokémon from a precomputed histogram and KDE."""
         self.prepare_plot_area()
-        if not data.empty:
-            sns.histplot(data['HP'], kde=True, color='skyblue', bins=30, ax=self.ax)
+        counts, edges, x, density = histogram
+        if counts.sum():
+            self.ax.stairs(counts, edges, fill=True, color='skyblue', alpha=0.6)
+            self.ax.stairs(counts, edges, color='steelblue')
+            self.ax.plot(x, density, color='skyblue', linewidth=2)
             self.ax.set_title('Distribution of HP Among Pokémon')
             self.ax.set_xlabel('HP')
             self.ax.set_ylabel('Frequency')
@@ -282,92 +485,116 @@ class PokeBuilderView:
                     va='center', transform=self.ax.transAxes)
             self.ax.set_title('No data available')
 
-        self.canvas.draw()
-
-    def plot_stats_by_type(self, data, attribute):
-        """Plot bar graphs for Pokémon stats by their type using seaborn."""
+    def plot_stats_by_type(self, data_grouped, attribute):
+        """Plot bar graphs of the mean stat per type from precomputed means."""
         self.prepare_plot_area()
-        data_grouped = data.groupby('Type 1')[attribute].mean().reset_index()
 
         if not data_grouped.empty:
-            sns.barplot(x='Type 1', y=attribute, data=data_grouped, ax=self.ax, palette='tab10')
+            indices = np.arange(len(data_grouped))
+            self.ax.bar(indices, data_grouped[attribute],
+                        color=[plt.cm.tab10(i % 10) for i in indices])
             self.ax.set_title(f'{attribute.capitalize()} Distribution by Type')
+            self.ax.set_xlabel('Type 1')
             self.ax.set_ylabel(f'Mean {attribute.capitalize()}')
+            self.ax.set_xticks(indices)
             self.ax.set_xticklabels(data_grouped['Type 1'], rotation=45, ha="right")
         else:
             self.ax.text(0.5, 0.5, 'No data to display', ha='center',
                          va='center', transform=self.ax.transAxes)
             self.ax.set_title(f'No data available for {attribute.capitalize()}')
 
-        self.canvas.draw()
-
-    def plot_correlations(self, data):
-        """Displays statistical correlations as a heatmap."""
+    def plot_correlations(self, corr):
+        """Displays precomputed statistical correlations as a heatmap."""
         self.prepare_plot_area()
 
-        corr = data[['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']].corr()
-
         sns.heatmap(corr, annot=True, fmt=".2f", cmap='coolwarm', ax=self.ax, cbar=False)
 
         self.ax.set_title('Stat Correlations')
-        self.canvas.draw()
 
-    def prepare_plot_area(self):
-        """Prepare the graph area by clearing any existing graphs."""
-        if hasattr(self, 'canvas'):
-            self.ax.clear()
+    def plot_pareto_front(self, front, background, stats, matching):
+        """Plot a Pareto frontier: a staircase over a scatter for two stats,
+        parallel coordinates for more."""
+        self.prepare_plot_area()
+        if len(stats) == 2:
+            x, y = stats
+            self.ax.scatter(background[x], background[y], s=6, color='lightgray')
+            ordered = front.sort_values([x, y], ascending=[True, False])
+            self.ax.step(ordered[x], ordered[y], where='pre', color='tab:red', alpha=0.5)
+            self.ax.scatter(ordered[x], ordered[y], s=18, color='tab:red', zorder=3)
+            for _, pokemon in ordered.head(12).iterrows():
+                self.ax.annotate(pokemon['Name'], (pokemon[x], pokemon[y]), fontsize=7,
+                                 xytext=(3, 3), textcoords='offset points')
+            self.ax.set_xlabel(x)
+            self.ax.set_ylabel(y)
         else:
+            values = front[stats].to_numpy(dtype=float)
+            positions = np.arange(len(stats))
+            if len(front) <= 10:
+                for name, row in zip(front['Name'], values):
+                    self.ax.plot(positions, row, marker='o', label=name)
+                self.ax.legend(fontsize=7, loc='lower left')
+            else:
+                lines = [np.column_stack([positions, row]) for row in values]
+                self.ax.add_collection(LineCollection(lines, colors='tab:red',
+                                                      alpha=max(0.05, min(0.8, 20 / len(lines)))))
+            self.ax.set_xlim(-0.2, len(stats) - 0.8)
+            self.ax.set_ylim(0, values.max() * 1.05)
+            self.ax.set_xticks(positions)
+            self.ax.set_xticklabels(stats)
+        self.ax.set_title(f"Pareto frontier: {len(front)} of {matching} Pokémon")
+
+    def prepare_plot_area(self, clear=True):
+        """Prepare the graph area, creating the canvas once and clearing old graphs."""
+        self.ensure_plotting()
+        if not hasattr(self, 'canvas'):
             self.figure = Figure(figsize=(6, 4), dpi=100)
             self.ax = self.figure.add_subplot(111)
             self.canvas = FigureCanvasTkAgg(self.figure, self.graph_tab)
             self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-        self.canvas.draw()
+            self.graph_artists = None
+            self.graph_cache = RenderCache(self.canvas, replot=self.render_graph)
+            self.canvas.draw()
+        elif clear:
+            self.clear_plot_area()
+
+    def clear_plot_area(self):
+        """Remove every artist from the graph axes"""
+        self.ax.clear()
+        self.figure.subplots_adjust(bottom=0.11)
+        self.graph_artists = None
+        self.graph_cache.forget_plot()
 
     def plot_attribute_distribution_for_selected_pokemon(self, team_data):
         """Plot attribute distribution for the selected Pokémons' team using pie charts."""
         self.prepare_plot_area_team()
 
-        attributes = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+        attributes = TEAM_ATTRIBUTES
+        names = team_data['Name'] if 'Name' in team_data.columns else []
 
-        self.team_figure.clear()
-        axes = self.team_figure.subplots(2, 3)
-        axes = axes.flatten()
-
-        for i, attribute in enumerate(attributes):
-            if attribute in team_data.columns:
-                pokemon_max = team_data.set_index('Name')[attribute]
-                total_max = pokemon_max.sum()
-
-                if total_max > 0:
-                    axes[i].pie(pokemon_max, labels=pokemon_max.index,
-                                autopct=lambda p: f'{p:.1f}%\n{p/100 * total_max:.1f}',
-                                startangle=140)
-                    axes[i].set_title(f'{attribute.capitalize()} Distribution')
-                    axes[i].axis('equal')
-                else:
-                    axes[i].text(0.5, 0.5, 'No data available',
-                                horizontalalignment='center', verticalalignment='center')
-                    axes[i].set_title(f'{attribute.capitalize()} Distribution')
-            else:
-                axes[i].text(0.5, 0.5, 'Attribute not found', ha='center')
-                axes[i].set_title(f'{attribute.capitalize()} Distribution')
+        pies = self.team_artists
+        if pies and len(pies[0][0]) == len(names) \
+                and all(team_data[attribute].sum() > 0 for attribute in attributes):
+            for attribute, artists in zip(attributes, pies):
+                values = team_data[attribute]
+                update_pie(*artists, values, names, pie_label_format(values.sum()))
+            return
 
-        self.team_figure.tight_layout()
-        self.team_canvas.draw()
+        self.team_figure.clear()
+        self.team_artists = draw_team_pies(self.team_figure, team_data)
 
     def prepare_plot_area_team(self):
-        """Prepare the graph area for the team graph view"""
+        """Prepare the graph area for the team graph view, creating its canvas only once"""
+        self.ensure_plotting()
         if hasattr(self, 'team_canvas'):
-            self.team_canvas.get_tk_widget().destroy()
+            return
 
         self.team_figure = Figure(figsize=(6, 4), dpi=100)
         self.team_ax = self.team_figure.add_subplot(111)
-        self.team_ax.clear()
+        self.team_artists = None
 
         self.team_canvas = FigureCanvasTkAgg(self.team_figure, self.team_graph_frame)
-        self.team_canvas.draw()
         self.team_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.team_cache = RenderCache(self.team_canvas, replot=self.render_team_graph)
 
         self.team_ax.text(0.5, 0.5, 'Select a team and draw graph',
                         horizontalalignment='center', verticalalignment='center',
@@ -376,51 +603,94 @@ class PokeBuilderView:
 
     # User Interaction
 
+    @profiled()
     def add_pokemon(self):
         """Adds a selected Pokémon to the current team and updates the team listbox"""
-        selected_indices = self.pokemon_listbox.curselection()
-        for index in selected_indices:
-            pokemon = self.pokemon_listbox.get(index)
-            if pokemon not in self.current_team:
-                self.current_team.append(pokemon)
-                self.selected_team_listbox.insert(tk.END, pokemon)
+        for row_id in self.pokemon_listbox.selected_keys():
+            if row_id not in self.current_team:
+                self.current_team.append(row_id)
+                self.selected_team_listbox.append(row_id)
                 self.update_graph_listbox()
 
     def delete_selected_pokemon(self):
         """Removes the selected Pokémon from the current team and updates the team listbox"""
-        selected_indices = self.selected_team_listbox.curselection()
-        for index in reversed(selected_indices):
-            pokemon_to_remove = self.selected_team_listbox.get(index)
-            self.selected_team_listbox.delete(index)
+        for pokemon_to_remove in self.selected_team_listbox.selected_keys():
+            self.selected_team_listbox.remove(pokemon_to_remove)
             if pokemon_to_remove in self.current_team:
                 self.current_team.remove(pokemon_to_remove)
                 self.update_graph_listbox()
 
     def clear_team(self):
         """Clears the current team selection and listbox"""
-        self.selected_team_listbox.delete(0, tk.END)
+        self.selected_team_listbox.clear()
         self.current_team = []
         self.update_graph_listbox()
 
+    @profiled()
+    def show_slot_alternatives(self):
+        """Lists the Pokémon with the closest base stats to the selected team member"""
+        selected = self.selected_team_listbox.selected_keys()
+        if not selected or selected[0] not in self.current_team:
+            messagebox.showinfo("No Selection", "Select a team member to find similar Pokémon.")
+            return
+        self.similar_slot = self.current_team.index(selected[0])
+        generations, legendary = self.get_scope()
+        alternatives = self.model.get_slot_alternatives(
+            self.current_team, self.similar_slot, type_weight=SIMILAR_TYPE_WEIGHT,
+            exclude_legendary=self.exclude_legendary_var.get(),
+            generations=generations, legendary=legendary)
+        self.similar_distances = dict(alternatives)
+        self.similar_listbox.set_items([row_id for row_id, _ in alternatives])
+
+    def similar_label(self, row_id):
+        """Return the similar Pokémon list text of a Pokémon"""
+        return f"{self.model.get_pokemon_name(row_id)} ({self.similar_distances[row_id]:.2f})"
+
+    def swap_in_alternative(self):
+        """Replaces the team member the alternatives were found for with the selected one"""
+        selected = self.similar_listbox.selected_keys()
+        if not selected or self.similar_slot >= len(self.current_team):
+            messagebox.showinfo("No Selection", "Select a similar Pokémon to swap in.")
+            return
+        team = list(self.current_team)
+        team[self.similar_slot] = selected[0]
+        self.set_current_team(team)
+        self.similar_distances = {}
+        self.similar_listbox.clear()
+
+    def set_current_team(self, team):
+        """Replaces the current team and its listbox with the given Pokémon row ids"""
+        self.current_team = list(team)
+        self.selected_team_listbox.set_items(list(team))
+        self.update_graph_listbox()
+
+    def show_suggestion_progress(self, fraction, running=True):
+        """Shows the team optimizer's progress and toggles its button"""
+        self.suggest_progress['value'] = fraction * 100
+        self.suggest_team_button.config(text="Cancel Suggestion" if running
+                                        else "Suggest Best Team")
+
     def confirm_team(self):
         """Prompts the user for confirmation of the selected team"""
         if not self.current_team:
             messagebox.showerror("No Team", "No Pokémon have been added to the team.")
             return
+        self.controller.confirm_team()
         messagebox.showinfo("Team Confirmed", f"Your team with {len(self.current_team)} Pokémon has been confirmed.")
 
 
+    @profiled()
     def update_graph_listbox(self):
         """Updates the listbox in the "Graph View" tab
         to show information about the Pokémon in the current team"""
+        if not self.is_tab_built(self.graph_tab):
+            return
         self.graph_listbox.delete(0, tk.END)
-        for pokemon_name in self.current_team:
-            pokemon_data = self.pokemon_data[self.pokemon_data['Name'] == pokemon_name]
-            if not pokemon_data.empty:
-                entry = f"{pokemon_name} - Type: {pokemon_data['Type 1'].values[0]}, " \
-                        f"Stats: HP {pokemon_data['HP'].values[0]}," \
-                        f"Atk {pokemon_data['Attack'].values[0]}"
-                self.graph_listbox.insert(tk.END, entry)
+        for pokemon in self.model.get_pokemon_by_ids(self.current_team):
+            entry = f"{pokemon['Name']} - Type: {pokemon['Type 1']}, " \
+                    f"Stats: HP {pokemon['HP']}," \
+                    f"Atk {pokemon['Attack']}"
+            self.graph_listbox.insert(tk.END, entry)
 
     def save_team(self):
         """Save team with team's name"""
@@ -429,59 +699,84 @@ class PokeBuilderView:
             self.controller.save_current_team(team_name, self.current_team)
             self.update_saved_teams_tab()
 
+    @profiled()
     def update_pokemon_list(self, event=None):
         """Filter the pokemons' name list"""
-        type_filter = self.type_var.get()
-        sort_by = self.sort_var.get()
-        search_term = self.search_entry.get().strip().lower()
-
-        filtered_data = self.pokemon_data.copy()
-
-        if type_filter != "All":
-            filtered_data = filtered_data[(filtered_data['Type 1'] == type_filter)
-                | (filtered_data['Type 2'] == type_filter)]
-
-        if search_term:
-            filtered_data = filtered_data[filtered_data['Name'].str.lower() \
-                                            .str.contains(search_term)]
-
-        if sort_by == "Name":
-            filtered_data = filtered_data.sort_values(by="Name")
-        elif sort_by == "Type":
-            filtered_data = filtered_data.sort_values(by=["Type 1", "Type 2", "Name"])
-        elif sort_by == "Number":
-            filtered_data = filtered_data.sort_values(by="#")
-
-        self.pokemon_listbox.delete(0, tk.END)
-        if filtered_data.empty:
-            self.pokemon_listbox.insert(tk.END, "No results found.")
-        else:
-            for _, row in filtered_data.iterrows():
-                self.pokemon_listbox.insert(tk.END, row['Name'])
+        self.controller.apply_filters(event)
+
+    @profiled()
+    def show_pokemon_list(self, row_ids):
+        """Show the filtered pokemons' rows in the list"""
+        self.pokemon_listbox.set_items(row_ids)
+
+    def get_scope(self):
+        """Return the (generations, legendary) scope chosen in the "Select Pokémon" tab;
+        None means no restriction"""
+        if not self.is_tab_built(self.select_tab):
+            return None, None
+        legendary = LEGENDARY_SCOPES.get(self.legendary_combobox.get())
+        generations = self.model.get_generations()
+        low, high = self.generation_from_combobox.get(), self.generation_to_combobox.get()
+        if not generations or not low or not high:
+            return None, legendary
+        low, high = sorted((int(low), int(high)))
+        if low <= generations[0] and high >= generations[-1]:
+            return None, legendary
+        return tuple(range(low, high + 1)), legendary
 
     def populate_pokemon_listbox(self):
         """Make pokemons' name list into original list"""
-        pokemon_names = self.controller.model.get_pokemon_names()
-        self.pokemon_listbox.delete(0, 'end')
-        for name in pokemon_names:
-            self.pokemon_listbox.insert('end', name)
+        self.pokemon_listbox.set_items(self.controller.model.get_pokemon_ids())
+
+    @profiled()
+    def refresh_pokedex(self):
+        """Show a newly published part of a streamed Pokédex"""
+        self.pokemon_data = self.model.pokemon_df
+        types = ['All'] + sorted(self.pokemon_data['Type 1'].dropna().unique().tolist())
+        self.type_combobox['values'] = types
+        generations = self.model.get_generations()
+        for combobox in (self.generation_from_combobox, self.generation_to_combobox):
+            combobox['values'] = generations
+        if generations and not self.generation_from_combobox.get():
+            self.generation_from_combobox.current(0)
+            self.generation_to_combobox.current(len(generations) - 1)
+        if self.is_tab_built(self.graph_tab):
+            self.stats_type_combobox['values'] = types
+        if hasattr(self, 'canvas'):
+            # Dataset graphs were drawn from the previous snapshot. Team graphs
+            # only depend on their rows, which never change, so team_cache stays.
+            self.graph_cache.clear()
+        if self.model.loading:
+            self.master.title(f"Poké Builder (loading... {len(self.pokemon_data)} Pokémon)")
+        else:
+            self.master.title("Poké Builder")
+        self.update_pokemon_list()
+        self.update_saved_teams_tab()
 
+    @profiled()
     def update_saved_teams_tab(self):
         """Add saved team into saved tesm tab"""
-        self.team_listbox.delete(0, tk.END)
-        for _, row in self.model.saved_teams.iterrows():
-            team_info = f"{row['Team Name']} - {row['Members']}"
-            self.team_listbox.insert(tk.END, team_info)
+        if not self.is_tab_built(self.team_tab):
+            return
+        saved_teams = self.model.get_saved_teams()
+        self.saved_team_labels = {team_id: f"{team_name} - {','.join(members)}"
+                                  for team_id, team_name, members in saved_teams}
+        self.team_listbox.set_items([team_id for team_id, _, _ in saved_teams])
+
+    def saved_team_label(self, team_id):
+        """Return the saved team tab text of a team"""
+        return self.saved_team_labels.get(team_id, '')
 
     def on_delete_button_clicked(self):
         """Click for deletion"""
-        selected_index = self.team_listbox.curselection()
+        selected_index = self.team_listbox.selected_keys()
         if selected_index:
             self.controller.delete_team(selected_index[0])
             self.update_saved_teams_tab()
         else:
             messagebox.showerror("Error", "Please select a team to delete.")
 
+    @profiled()
     def trigger_graph_drawing(self):
         """Draw graph from provided attribute"""
         attribute = self.graph_attribute_var.get()
@@ -489,48 +784,80 @@ class PokeBuilderView:
         pokemon_type = self.stats_type_var.get()
         current_team = self.get_current_team()
 
-        self.prepare_plot_area()
-
-        if not current_team and graph_type not in ["Stats by Type",
-                                                   "Correlation Matrix", "Hp Distribution"]:
+        if not current_team and graph_type not in DATASET_GRAPHS:
             messagebox.showinfo("No Data", "No Pokémon in the current team to draw a graph.")
             return
 
-        if graph_type == "Stats by Type" or graph_type == "Correlation Matrix" \
-                                        or graph_type == "Hp Distribution":
-            team_data = self.pokemon_data if pokemon_type == "All" else \
-            self.pokemon_data[self.pokemon_data['Type 1'] == pokemon_type]
-            if team_data.empty:
-                messagebox.showinfo("No Data", "No Pokémon data available.")
+        if graph_type == "Pareto Frontier":
+            stats = tuple(stat for stat in PARETO_STATS if self.pareto_vars[stat].get())
+            if len(stats) < 2:
+                messagebox.showinfo("Pareto Frontier", "Tick at least two Pareto stats.")
                 return
+            key = (graph_type, None, pokemon_type, stats, self.get_scope())
+        elif graph_type in DATASET_GRAPHS:
+            key = (graph_type, attribute, pokemon_type, (), self.get_scope())
+        else:
+            key = (graph_type, attribute, None, tuple(current_team), None)
+
+        self.prepare_plot_area(clear=False)
+        if self.graph_cache.show(key):
+            return
+        if self.render_graph(key):
+            self.graph_cache.store(key)
+
+    def render_graph(self, key):
+        """Plot the graph described by a render cache key, without drawing the canvas"""
+        graph_type, attribute, pokemon_type, _, scope = key
+        if graph_type in DATASET_GRAPHS:
+            generations, legendary = scope
+            scope = {'generations': generations, 'legendary': legendary}
+            if not self.model.count_pokemon(pokemon_type, **scope):
+                messagebox.showinfo("No Data", "No Pokémon data available.")
+                return False
             if graph_type == "Stats by Type":
-                self.plot_stats_by_type(team_data, attribute)
+                self.plot_stats_by_type(
+                    self.model.get_stats_by_type(attribute, pokemon_type, **scope), attribute)
             elif graph_type == "Correlation Matrix":
-                self.plot_correlations(team_data)
+                self.plot_correlations(self.model.get_stat_correlations(pokemon_type, **scope))
             elif graph_type == "Hp Distribution":
-                self.plot_hp_distribution(team_data)
+                self.plot_hp_distribution(self.model.get_hp_distribution(pokemon_type, **scope))
+            elif graph_type == "Pareto Frontier":
+                stats = list(key[3])
+                front = self.model.get_pareto_front(stats, type1=pokemon_type, **scope)
+                matching = self.model.get_pokemon_ids(type1=pokemon_type, **scope)
+                background = matching[::max(1, len(matching) // PARETO_BACKGROUND)]
+                self.plot_pareto_front(self.model.get_pokemon_frame(front),
+                                       self.model.get_pokemon_frame(background), stats,
+                                       len(matching))
         else:
-            team_data = self.model.get_selected_pokemon_data(current_team)
+            team_data = self.model.get_pokemon_frame(key[3])
             if team_data.empty:
                 messagebox.showinfo("No Data", "No Pokémon data available to draw the graph.")
-                return
+                return False
             if graph_type == "Pie graph for selected pokemon":
                 self.plot_pie_chart(team_data, attribute)
             elif graph_type == "Bar graph for selected pokemon":
                 self.plot_bar_chart(team_data, attribute)
-
-        self.canvas.draw()
+        return True
 
     def get_current_team(self):
-        """Return list of current team"""
-        if isinstance(self.current_team, str):
-            return [self.current_team]
+        """Return list of current team's row ids"""
         return self.current_team
 
+    @profiled()
     def update_team_graph(self, event=None):
         """Create fraph from selected team"""
         team_name = self.team_selection_var.get()
         self.prepare_plot_area_team()
         if team_name:
             team_data = self.model.get_team_data(team_name)
-            self.plot_attribute_distribution_for_selected_pokemon(team_data)
+            key = ('team', tuple(team_data.index))
+            if not self.team_cache.show(key):
+                self.render_team_graph(key, team_data)
+                self.team_cache.store(key)
+
+    def render_team_graph(self, key, team_data=None):
+        """Plot the team pies for a render cache key, without drawing the canvas"""
+        if team_data is None:
+            team_data = self.model.pokemon_df.iloc[list(key[1])]
+        self.plot_attribute_distribution_for_selected_pokemon(team_data)
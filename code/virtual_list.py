@@ -0,0 +1,188 @@
+# virtual_list.py
+"""File for VirtualListbox class"""
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+
+class VirtualListbox(ttk.Frame):
+    """Listbox holding item keys that only renders the rows currently in view.
+
+    Items are identified by key (e.g. a Pokémon row id) and turned into text
+    by the label function only when scrolled into the viewport, so a refresh
+    costs one Tk call per visible row whatever the number of items. Selection
+    is tracked by key and survives scrolling and refreshes; selected keys a
+    refresh left out are dropped when the selection is next read, through a
+    key to position index built once per item list, so refreshing never scans
+    the items.
+    """
+
+    def __init__(self, master, label=str, height=10, empty_text='',
+                 selectmode=tk.BROWSE, **listbox_options):
+        super().__init__(master)
+        self.label = label
+        self.empty_text = empty_text
+        self.selectmode = selectmode
+        self.keys = []
+        self.positions = None
+        self.top = 0
+        self.visible_rows = height
+        self.selected = {}
+        self.anchor = None
+
+        self.listbox = tk.Listbox(self, height=height, selectmode=selectmode,
+                                  exportselection=False, **listbox_options)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.line_height = tkfont.Font(font=self.listbox.cget('font')).metrics('linespace') + 1
+
+        self.listbox.bind('<Configure>', self._on_resize)
+        self.listbox.bind('<<ListboxSelect>>', self._on_select)
+        self.listbox.bind('<MouseWheel>', self._on_wheel)
+        self.listbox.bind('<Button-4>', self._on_wheel)
+        self.listbox.bind('<Button-5>', self._on_wheel)
+        self.listbox.bind('<Up>', lambda event: self._on_arrow(-1))
+        self.listbox.bind('<Down>', lambda event: self._on_arrow(1))
+        self._render()
+
+    # Items
+
+    def set_items(self, keys):
+        """Replace all items, keeping the selection of keys that are still present"""
+        self.keys = keys
+        self.positions = None
+        self.top = 0
+        self.anchor = None
+        self._render()
+
+    def get_items(self):
+        """Return the keys of every item in display order"""
+        return self._as_list(self.keys)
+
+    def append(self, key):
+        """Add one item at the end of the list"""
+        self.keys = self._as_list(self.keys) + [key]
+        if self.positions is not None:
+            self.positions.setdefault(key, len(self.keys) - 1)
+        self._render()
+
+    def remove(self, key):
+        """Remove one item from the list"""
+        keys = self._as_list(self.keys)
+        if key in keys:
+            keys.remove(key)
+        self.keys = keys
+        self.positions = None
+        self.selected.pop(key, None)
+        self.top = min(self.top, self._max_top())
+        self._render()
+
+    def clear(self):
+        """Remove every item"""
+        self.set_items([])
+
+    def position(self, key):
+        """Return the position of an item, or None if it is not in the list"""
+        if self.positions is None:
+            self.positions = {}
+            for position, item in enumerate(self._as_list(self.keys)):
+                self.positions.setdefault(item, position)
+        return self.positions.get(key)
+
+    def selected_keys(self):
+        """Return the keys of the selected items"""
+        if self.selected:
+            self.selected = {key: None for key in self.selected
+                             if self.position(key) is not None}
+        return list(self.selected)
+
+    # Scrolling
+
+    def yview(self, *args):
+        """Scrollbar command mapping moveto/scroll requests onto the first visible row"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.keys))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self.top += step * self.visible_rows if args[2] == 'pages' else step
+        self.top = max(0, min(self.top, self._max_top()))
+        self._render()
+
+    def see(self, position):
+        """Scroll so that the item at the given position is visible"""
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + self.visible_rows:
+            self.top = position - self.visible_rows + 1
+        self.top = max(0, min(self.top, self._max_top()))
+        self._render()
+
+    # Internals
+
+    @staticmethod
+    def _as_list(keys):
+        """Return keys as a plain list of Python values"""
+        return keys.tolist() if hasattr(keys, 'tolist') else list(keys)
+
+    def _max_top(self):
+        return max(0, len(self.keys) - self.visible_rows)
+
+    def _visible_keys(self):
+        return self._as_list(self.keys[self.top:self.top + self.visible_rows])
+
+    def _render(self):
+        """Materialize the rows in the viewport and sync selection and scrollbar"""
+        self.listbox.delete(0, tk.END)
+        total = len(self.keys)
+        if not total:
+            if self.empty_text:
+                self.listbox.insert(tk.END, self.empty_text)
+            self.scrollbar.set(0, 1)
+            return
+        visible = self._visible_keys()
+        self.listbox.insert(tk.END, *[self.label(key) for key in visible])
+        for position, key in enumerate(visible):
+            if key in self.selected:
+                self.listbox.selection_set(position)
+        self.scrollbar.set(self.top / total, min(1, (self.top + len(visible)) / total))
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self.line_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.top = max(0, min(self.top, self._max_top()))
+            self._render()
+
+    def _on_select(self, event=None):
+        if not len(self.keys):
+            return
+        visible = self._visible_keys()
+        chosen = [visible[i] for i in self.listbox.curselection() if i < len(visible)]
+        if self.selectmode in (tk.BROWSE, tk.SINGLE):
+            self.selected = {key: None for key in chosen}
+        else:
+            for key in visible:
+                if key not in chosen:
+                    self.selected.pop(key, None)
+            self.selected.update((key, None) for key in chosen)
+        if chosen:
+            self.anchor = self.top + visible.index(chosen[-1])
+
+    def _on_wheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.yview('scroll', step * 3, 'units')
+        return 'break'
+
+    def _on_arrow(self, step):
+        if not len(self.keys):
+            return 'break'
+        position = 0 if self.anchor is None else self.anchor + step
+        position = max(0, min(position, len(self.keys) - 1))
+        self.anchor = position
+        key = self._as_list(self.keys[position:position + 1])[0]
+        self.selected = {key: None}
+        self.see(position)
+        return 'break'